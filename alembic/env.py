@@ -7,6 +7,8 @@ from app.models import user as _m_user
 from app.models import project as _m_project
 from app.models import issue as _m_issue
 from app.models import comment as _m_comment
+from app.models import stats as _m_stats
+from app.models import tombstone as _m_tombstone
 
 
 config = context.config
@@ -19,6 +21,22 @@ if config.config_file_name is not None:
 
 target_metadata = Base.metadata
 
+# trigram indexes need the pg_trgm extension, so they live in the migrations only;
+# expression indexes are compared in Postgres' normalized form, which autogenerate can't match
+MIGRATION_MANAGED_INDEXES = {
+    "ix_issues_title_trgm",
+    "ix_comments_content_trgm",
+    "ix_projects_name_trgm",
+    "ix_users_username_trgm",
+    "ix_issues_search",
+    "ix_comments_search",
+}
+
+def include_object(object, name, type_, reflected, compare_to):
+    if type_ == "index" and name in MIGRATION_MANAGED_INDEXES:
+        return False
+    return True
+
 def run_migrations_offline():
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
@@ -26,6 +44,7 @@ def run_migrations_offline():
         target_metadata=target_metadata,
         literal_binds=True,
         compare_type=True,
+        include_object=include_object,
     )
     with context.begin_transaction():
         context.run_migrations()
@@ -41,6 +60,7 @@ def run_migrations_online():
             connection=connection,
             target_metadata=target_metadata,
             compare_type=True,
+            include_object=include_object,
         )
         with context.begin_transaction():
             context.run_migrations()
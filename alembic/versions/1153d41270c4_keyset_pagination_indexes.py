@@ -0,0 +1,36 @@
+"""keyset pagination indexes
+
+Revision ID: 1153d41270c4
+Revises: dc4cb8ade0ff
+Create Date: 2026-10-18 09:12:41.204311
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1153d41270c4'
+down_revision: Union[str, Sequence[str], None] = 'dc4cb8ade0ff'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_issues_project_id_id', 'issues', ['project_id', 'id'], unique=False)
+    op.create_index('ix_issues_project_id_created_at_id', 'issues', ['project_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_issues_project_id_updated_at_id', 'issues', ['project_id', 'updated_at', 'id'], unique=False)
+    op.create_index('ix_comments_issue_id_id', 'comments', ['issue_id', 'id'], unique=False)
+    op.create_index('ix_comments_issue_id_created_at_id', 'comments', ['issue_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_comments_issue_id_created_at_id', table_name='comments')
+    op.drop_index('ix_comments_issue_id_id', table_name='comments')
+    op.drop_index('ix_issues_project_id_updated_at_id', table_name='issues')
+    op.drop_index('ix_issues_project_id_created_at_id', table_name='issues')
+    op.drop_index('ix_issues_project_id_id', table_name='issues')
@@ -0,0 +1,43 @@
+"""change stamps
+
+Revision ID: 3f9d6b2e8a14
+Revises: e47b9d3c15a8
+Create Date: 2026-10-19 01:42:18.207361
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9d6b2e8a14'
+down_revision: Union[str, Sequence[str], None] = 'e47b9d3c15a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CHANGE_STAMP_FUNCTION = """
+CREATE OR REPLACE FUNCTION change_stamp() RETURNS timestamptz LANGUAGE plpgsql VOLATILE AS $$
+BEGIN
+    PERFORM pg_current_xact_id();
+    RETURN clock_timestamp();
+END
+$$
+"""
+
+STAMPED_COLUMNS = [("issues", "updated_at"), ("comments", "updated_at"), ("tombstones", "deleted_at")]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(CHANGE_STAMP_FUNCTION)
+    for table, column in STAMPED_COLUMNS:
+        op.alter_column(table, column, server_default=sa.text('change_stamp()'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, column in STAMPED_COLUMNS:
+        op.alter_column(table, column, server_default=sa.text('now()'))
+    op.execute("DROP FUNCTION IF EXISTS change_stamp()")
@@ -0,0 +1,40 @@
+"""issue filter indexes
+
+Revision ID: 4d8e0c7a19f3
+Revises: b3f18d6a92c7
+Create Date: 2026-10-18 15:22:48.902115
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4d8e0c7a19f3'
+down_revision: Union[str, Sequence[str], None] = 'b3f18d6a92c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_issues_project_id_status_priority_id', 'issues', ['project_id', 'status', 'priority', 'id'],
+                        unique=False, postgresql_concurrently=True)
+        op.create_index('ix_issues_project_id_assignee_id_updated_at', 'issues', ['project_id', 'assignee_id', 'updated_at'],
+                        unique=False, postgresql_concurrently=True)
+        op.create_index('ix_issues_project_id_reporter_id_id', 'issues', ['project_id', 'reporter_id', 'id'],
+                        unique=False, postgresql_concurrently=True)
+        op.create_index('ix_issues_open_project_id_updated_at_id', 'issues', ['project_id', 'updated_at', 'id'],
+                        unique=False, postgresql_where=sa.text("status = 'open'"), postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_issues_open_project_id_updated_at_id', table_name='issues', postgresql_concurrently=True)
+        op.drop_index('ix_issues_project_id_reporter_id_id', table_name='issues', postgresql_concurrently=True)
+        op.drop_index('ix_issues_project_id_assignee_id_updated_at', table_name='issues', postgresql_concurrently=True)
+        op.drop_index('ix_issues_project_id_status_priority_id', table_name='issues', postgresql_concurrently=True)
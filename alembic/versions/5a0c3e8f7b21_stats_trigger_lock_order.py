@@ -0,0 +1,102 @@
+"""stats trigger lock order
+
+Revision ID: 5a0c3e8f7b21
+Revises: 4d8e0c7a19f3
+Create Date: 2026-10-18 20:31:12.604118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a0c3e8f7b21'
+down_revision: Union[str, Sequence[str], None] = '4d8e0c7a19f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STATS_FUNCTION = """
+CREATE OR REPLACE FUNCTION project_issue_stats_apply() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO project_issue_stats (project_id, status, priority, assignee_id, issue_count)
+        SELECT project_id, status, priority, coalesce(assignee_id, 0), count(*)
+        FROM new_rows GROUP BY 1, 2, 3, 4 ORDER BY 1, 2, 3, 4
+        ON CONFLICT (project_id, status, priority, assignee_id)
+        DO UPDATE SET issue_count = project_issue_stats.issue_count + EXCLUDED.issue_count;
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM 1 FROM project_issue_stats s
+        WHERE (s.project_id, s.status, s.priority, s.assignee_id) IN (
+            SELECT project_id, status, priority, coalesce(assignee_id, 0) FROM old_rows)
+        ORDER BY s.project_id, s.status, s.priority, s.assignee_id
+        FOR UPDATE;
+        UPDATE project_issue_stats s SET issue_count = s.issue_count - d.n
+        FROM (SELECT project_id, status, priority, coalesce(assignee_id, 0) AS assignee_id, count(*) AS n
+              FROM old_rows GROUP BY 1, 2, 3, 4) d
+        WHERE s.project_id = d.project_id AND s.status = d.status
+          AND s.priority = d.priority AND s.assignee_id = d.assignee_id;
+    ELSE
+        -- one ordered upsert for increments and decrements; the old bucket of a moved issue exists
+        INSERT INTO project_issue_stats (project_id, status, priority, assignee_id, issue_count)
+        SELECT project_id, status, priority, assignee_id, sum(n) FROM (
+            SELECT project_id, status, priority, coalesce(assignee_id, 0) AS assignee_id, -1 AS n FROM old_rows
+            UNION ALL
+            SELECT project_id, status, priority, coalesce(assignee_id, 0), 1 FROM new_rows
+        ) x GROUP BY 1, 2, 3, 4 HAVING sum(n) <> 0 ORDER BY 1, 2, 3, 4
+        ON CONFLICT (project_id, status, priority, assignee_id)
+        DO UPDATE SET issue_count = project_issue_stats.issue_count + EXCLUDED.issue_count;
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+PREVIOUS_STATS_FUNCTION = """
+CREATE OR REPLACE FUNCTION project_issue_stats_apply() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO project_issue_stats (project_id, status, priority, assignee_id, issue_count)
+        SELECT project_id, status, priority, coalesce(assignee_id, 0), count(*)
+        FROM new_rows GROUP BY 1, 2, 3, 4
+        ON CONFLICT (project_id, status, priority, assignee_id)
+        DO UPDATE SET issue_count = project_issue_stats.issue_count + EXCLUDED.issue_count;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE project_issue_stats s SET issue_count = s.issue_count - d.n
+        FROM (SELECT project_id, status, priority, coalesce(assignee_id, 0) AS assignee_id, count(*) AS n
+              FROM old_rows GROUP BY 1, 2, 3, 4) d
+        WHERE s.project_id = d.project_id AND s.status = d.status
+          AND s.priority = d.priority AND s.assignee_id = d.assignee_id;
+    ELSE
+        WITH delta AS (
+            SELECT project_id, status, priority, assignee_id, sum(n) AS n FROM (
+                SELECT project_id, status, priority, coalesce(assignee_id, 0) AS assignee_id, -1 AS n FROM old_rows
+                UNION ALL
+                SELECT project_id, status, priority, coalesce(assignee_id, 0), 1 FROM new_rows
+            ) x GROUP BY 1, 2, 3, 4 HAVING sum(n) <> 0
+        ), dec AS (
+            UPDATE project_issue_stats s SET issue_count = s.issue_count + d.n
+            FROM delta d
+            WHERE d.n < 0 AND s.project_id = d.project_id AND s.status = d.status
+              AND s.priority = d.priority AND s.assignee_id = d.assignee_id
+        )
+        INSERT INTO project_issue_stats (project_id, status, priority, assignee_id, issue_count)
+        SELECT project_id, status, priority, assignee_id, n FROM delta WHERE n > 0
+        ON CONFLICT (project_id, status, priority, assignee_id)
+        DO UPDATE SET issue_count = project_issue_stats.issue_count + EXCLUDED.issue_count;
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(STATS_FUNCTION)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(PREVIOUS_STATS_FUNCTION)
@@ -0,0 +1,50 @@
+"""search indexes
+
+Revision ID: 7e2a9c4b1d05
+Revises: 1153d41270c4
+Create Date: 2026-10-18 10:03:17.558920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e2a9c4b1d05'
+down_revision: Union[str, Sequence[str], None] = '1153d41270c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGRAM_INDEXES = [
+    ('ix_issues_title_trgm', 'issues', 'title'),
+    ('ix_comments_content_trgm', 'comments', 'content'),
+    ('ix_projects_name_trgm', 'projects', 'name'),
+    ('ix_users_username_trgm', 'users', 'username'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.drop_index(op.f('ix_comments_content'), table_name='comments')
+    # GIN builds on large tables take a while; build them without blocking writes
+    with op.get_context().autocommit_block():
+        for name, table, column in TRIGRAM_INDEXES:
+            op.create_index(name, table, [column], unique=False, postgresql_using='gin',
+                            postgresql_ops={column: 'gin_trgm_ops'}, postgresql_concurrently=True)
+        op.create_index('ix_issues_search', 'issues',
+                        [sa.text("to_tsvector('english', title || ' ' || coalesce(\"desc\", ''))")],
+                        unique=False, postgresql_using='gin', postgresql_concurrently=True)
+        op.create_index('ix_comments_search', 'comments', [sa.text("to_tsvector('english', content)")],
+                        unique=False, postgresql_using='gin', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_comments_search', table_name='comments')
+    op.drop_index('ix_issues_search', table_name='issues')
+    for name, table, _ in reversed(TRIGRAM_INDEXES):
+        op.drop_index(name, table_name=table)
+    op.create_index(op.f('ix_comments_content'), 'comments', ['content'], unique=False)
@@ -0,0 +1,34 @@
+"""my issues indexes
+
+Revision ID: 8c61f2d0a4e9
+Revises: 5a0c3e8f7b21
+Create Date: 2026-10-18 22:07:41.318526
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c61f2d0a4e9'
+down_revision: Union[str, Sequence[str], None] = '5a0c3e8f7b21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_issues_assignee_id_status_updated_at', 'issues', ['assignee_id', 'status', 'updated_at'],
+                        unique=False, postgresql_concurrently=True)
+        op.create_index('ix_issues_reporter_id_updated_at', 'issues', ['reporter_id', 'updated_at'],
+                        unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_issues_reporter_id_updated_at', table_name='issues', postgresql_concurrently=True)
+        op.drop_index('ix_issues_assignee_id_status_updated_at', table_name='issues', postgresql_concurrently=True)
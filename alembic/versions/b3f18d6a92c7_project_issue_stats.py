@@ -0,0 +1,95 @@
+"""project issue stats
+
+Revision ID: b3f18d6a92c7
+Revises: 7e2a9c4b1d05
+Create Date: 2026-10-18 13:41:05.317246
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f18d6a92c7'
+down_revision: Union[str, Sequence[str], None] = '7e2a9c4b1d05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STATS_FUNCTION = """
+CREATE OR REPLACE FUNCTION project_issue_stats_apply() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO project_issue_stats (project_id, status, priority, assignee_id, issue_count)
+        SELECT project_id, status, priority, coalesce(assignee_id, 0), count(*)
+        FROM new_rows GROUP BY 1, 2, 3, 4
+        ON CONFLICT (project_id, status, priority, assignee_id)
+        DO UPDATE SET issue_count = project_issue_stats.issue_count + EXCLUDED.issue_count;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE project_issue_stats s SET issue_count = s.issue_count - d.n
+        FROM (SELECT project_id, status, priority, coalesce(assignee_id, 0) AS assignee_id, count(*) AS n
+              FROM old_rows GROUP BY 1, 2, 3, 4) d
+        WHERE s.project_id = d.project_id AND s.status = d.status
+          AND s.priority = d.priority AND s.assignee_id = d.assignee_id;
+    ELSE
+        WITH delta AS (
+            SELECT project_id, status, priority, assignee_id, sum(n) AS n FROM (
+                SELECT project_id, status, priority, coalesce(assignee_id, 0) AS assignee_id, -1 AS n FROM old_rows
+                UNION ALL
+                SELECT project_id, status, priority, coalesce(assignee_id, 0), 1 FROM new_rows
+            ) x GROUP BY 1, 2, 3, 4 HAVING sum(n) <> 0
+        ), dec AS (
+            UPDATE project_issue_stats s SET issue_count = s.issue_count + d.n
+            FROM delta d
+            WHERE d.n < 0 AND s.project_id = d.project_id AND s.status = d.status
+              AND s.priority = d.priority AND s.assignee_id = d.assignee_id
+        )
+        INSERT INTO project_issue_stats (project_id, status, priority, assignee_id, issue_count)
+        SELECT project_id, status, priority, assignee_id, n FROM delta WHERE n > 0
+        ON CONFLICT (project_id, status, priority, assignee_id)
+        DO UPDATE SET issue_count = project_issue_stats.issue_count + EXCLUDED.issue_count;
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+STATS_TRIGGERS = [
+    "CREATE TRIGGER issues_stats_insert AFTER INSERT ON issues REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION project_issue_stats_apply()",
+    "CREATE TRIGGER issues_stats_update AFTER UPDATE ON issues REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION project_issue_stats_apply()",
+    "CREATE TRIGGER issues_stats_delete AFTER DELETE ON issues REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION project_issue_stats_apply()",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('project_issue_stats',
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('status', postgresql.ENUM('open', 'closed', name='status', create_type=False), nullable=False),
+    sa.Column('priority', postgresql.ENUM('low', 'medium', 'high', name='priority', create_type=False), nullable=False),
+    sa.Column('assignee_id', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('issue_count', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('project_id', 'status', 'priority', 'assignee_id')
+    )
+    # backfill and install the triggers in one go, so no issue write can slip in between
+    op.execute("LOCK TABLE issues IN SHARE MODE")
+    op.execute("""
+        INSERT INTO project_issue_stats (project_id, status, priority, assignee_id, issue_count)
+        SELECT project_id, status, priority, coalesce(assignee_id, 0), count(*)
+        FROM issues GROUP BY 1, 2, 3, 4
+    """)
+    op.execute(STATS_FUNCTION)
+    for trigger in STATS_TRIGGERS:
+        op.execute(trigger)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS issues_stats_delete ON issues")
+    op.execute("DROP TRIGGER IF EXISTS issues_stats_update ON issues")
+    op.execute("DROP TRIGGER IF EXISTS issues_stats_insert ON issues")
+    op.execute("DROP FUNCTION IF EXISTS project_issue_stats_apply()")
+    op.drop_table('project_issue_stats')
@@ -0,0 +1,80 @@
+"""changes feed
+
+Revision ID: e47b9d3c15a8
+Revises: 8c61f2d0a4e9
+Create Date: 2026-10-18 23:14:05.472913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e47b9d3c15a8'
+down_revision: Union[str, Sequence[str], None] = '8c61f2d0a4e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TOMBSTONE_FUNCTION = """
+CREATE OR REPLACE FUNCTION tombstones_record() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_TABLE_NAME = 'issues' THEN
+        INSERT INTO tombstones (project_id, kind, entity_id)
+        SELECT o.project_id, 'issue', o.id FROM old_rows o
+        JOIN projects p ON p.id = o.project_id;
+    ELSE
+        INSERT INTO tombstones (project_id, kind, entity_id, issue_id)
+        SELECT i.project_id, 'comment', o.id, o.issue_id FROM old_rows o
+        JOIN issues i ON i.id = o.issue_id
+        JOIN projects p ON p.id = i.project_id;
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+TOMBSTONE_TRIGGERS = [
+    "CREATE TRIGGER issues_tombstones AFTER DELETE ON issues REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION tombstones_record()",
+    "CREATE TRIGGER comments_tombstones AFTER DELETE ON comments REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION tombstones_record()",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('tombstones',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=16), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('issue_id', sa.Integer(), nullable=True),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_tombstones_project_id_deleted_at_id', 'tombstones', ['project_id', 'deleted_at', 'id'], unique=False)
+    op.execute(TOMBSTONE_FUNCTION)
+    for trigger in TOMBSTONE_TRIGGERS:
+        op.execute(trigger)
+    # issues never move between projects, so the copy on comments cannot go stale
+    op.add_column('comments', sa.Column('project_id', sa.Integer(), nullable=True))
+    op.execute("UPDATE comments c SET project_id = i.project_id FROM issues i WHERE i.id = c.issue_id")
+    op.alter_column('comments', 'project_id', nullable=False)
+    op.create_foreign_key('comments_project_id_fkey', 'comments', 'projects', ['project_id'], ['id'], ondelete='CASCADE')
+    with op.get_context().autocommit_block():
+        op.create_index('ix_comments_project_id_updated_at_id', 'comments', ['project_id', 'updated_at', 'id'],
+                        unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_comments_project_id_updated_at_id', table_name='comments', postgresql_concurrently=True)
+    op.drop_constraint('comments_project_id_fkey', 'comments', type_='foreignkey')
+    op.drop_column('comments', 'project_id')
+    op.execute("DROP TRIGGER IF EXISTS comments_tombstones ON comments")
+    op.execute("DROP TRIGGER IF EXISTS issues_tombstones ON issues")
+    op.execute("DROP FUNCTION IF EXISTS tombstones_record()")
+    op.drop_index('ix_tombstones_project_id_deleted_at_id', table_name='tombstones')
+    op.drop_table('tombstones')
@@ -0,0 +1,82 @@
+import argparse
+import sys
+
+from app.db.session import engine
+
+
+def _progress(stage: str, done: int, total: int | None) -> None:
+    print(f"\r{stage}: {done}" + (f"/{total}" if total else ""), end="", file=sys.stderr, flush=True)
+    if total is not None and done >= total:
+        print(file=sys.stderr)
+
+
+def _import(args: argparse.Namespace) -> None:
+    from app.services.importer import import_issues, ProjectNotFound
+
+    with open(args.file, encoding="utf-8", newline="") if args.file != "-" else sys.stdin as lines:
+        try:
+            report = import_issues(engine, args.project_id, args.user_id, lines, args.format, args.on_conflict,
+                                   chunk_size=args.chunk_size, progress=_progress)
+        except ProjectNotFound:
+            sys.exit(f"project {args.project_id} not found")
+    print(report.model_dump_json(indent=2))
+
+
+def _rebuild_stats(args: argparse.Namespace) -> None:
+    from app.services.stats import rebuild_project_stats
+
+    drifted = rebuild_project_stats(engine, args.project_id)
+    print(f"rebuilt issue stats, {drifted} drifted buckets fixed")
+
+
+def _prune_tombstones(args: argparse.Namespace) -> None:
+    from app.services.changes import prune_tombstones
+
+    print(f"pruned {prune_tombstones(engine)} tombstones")
+
+
+def _seed(args: argparse.Namespace) -> None:
+    from app.services.synthetic import generate
+
+    report = generate(engine, users=args.users, projects=args.projects, issues=args.issues, comments=args.comments,
+                      seed=args.seed, batch_size=args.batch_size, progress=_progress)
+    for name in ("users", "projects", "issues", "comments"):
+        ids = getattr(report, name)
+        print(f"{name}: {len(ids)}" + (f" (ids {ids.start}-{ids.stop - 1})" if ids else ""))
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("import", help="bulk-load issues and comments into a project with COPY")
+    p.add_argument("file", help="NDJSON or CSV in the export format, '-' for stdin")
+    p.add_argument("--project-id", type=int, required=True)
+    p.add_argument("--user-id", type=int, required=True, help="reporter/author for records without one")
+    p.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    p.add_argument("--on-conflict", choices=["skip", "update"], default="skip")
+    p.add_argument("--chunk-size", type=int, default=10_000)
+    p.set_defaults(func=_import)
+
+    p = commands.add_parser("rebuild-stats", help="recompute per-project issue counters and repair drift")
+    p.add_argument("--project-id", type=int, help="only this project (default: all)")
+    p.set_defaults(func=_rebuild_stats)
+
+    p = commands.add_parser("prune-tombstones", help="delete tombstones older than CHANGES_RETENTION_DAYS")
+    p.set_defaults(func=_prune_tombstones)
+
+    p = commands.add_parser("seed", help="generate a deterministic, production-shaped synthetic dataset")
+    p.add_argument("--users", type=int, default=1_000)
+    p.add_argument("--projects", type=int, default=100)
+    p.add_argument("--issues", type=int, default=200_000)
+    p.add_argument("--comments", type=int, default=1_000_000)
+    p.add_argument("--seed", type=int, default=0, help="same seed, same data")
+    p.add_argument("--batch-size", type=int, default=50_000)
+    p.set_defaults(func=_seed)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
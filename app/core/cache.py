@@ -0,0 +1,147 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any, Protocol
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """Thread-safe LRU map whose entries also expire ``ttl`` seconds after being set."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def setdefault(self, key: Hashable, value: Any) -> Any:
+        """Set ``key`` to ``value`` unless it holds an unexpired one; either way it lives another ``ttl``."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and item[0] > time.monotonic():
+                value = item[1]
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+            return value
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CacheBackend(Protocol):
+    # True when calls wait on the network, so async handlers must not make them on the event loop
+    blocking: bool
+
+    def get(self, key: str) -> bytes | None: ...
+    def set(self, key: str, value: bytes) -> None: ...
+    # atomically sets ``key`` to ``value`` unless it is set, renews its TTL and returns what it holds
+    def setdefault(self, key: str, value: bytes) -> bytes: ...
+    def delete(self, *keys: str) -> None: ...
+    def clear(self) -> None: ...
+
+
+class MemoryBackend:
+    blocking = False
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def get(self, key: str) -> bytes | None:
+        return self._cache.get(key)
+
+    def set(self, key: str, value: bytes) -> None:
+        self._cache.set(key, value)
+
+    def setdefault(self, key: str, value: bytes) -> bytes:
+        return self._cache.setdefault(key, value)
+
+    def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._cache.pop(key)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+class RedisBackend:
+    """Redis (or any RESP-compatible server) backend; errors degrade to cache misses."""
+
+    blocking = True
+
+    def __init__(self, url: str, ttl: float, prefix: str = "mit:"):
+        import redis  # optional dependency, only needed with RESPONSE_CACHE_URL
+
+        self._error = redis.RedisError
+        self._client = redis.Redis.from_url(url, socket_timeout=0.1, socket_connect_timeout=0.1)
+        self._ttl_ms = int(ttl * 1000)
+        self._prefix = prefix
+
+    def get(self, key: str) -> bytes | None:
+        try:
+            return self._client.get(self._prefix + key)
+        except self._error:
+            logger.warning("cache get failed", exc_info=True)
+            return None
+
+    def set(self, key: str, value: bytes) -> None:
+        try:
+            self._client.set(self._prefix + key, value, px=self._ttl_ms)
+        except self._error:
+            logger.warning("cache set failed", exc_info=True)
+
+    def setdefault(self, key: str, value: bytes) -> bytes:
+        try:
+            key = self._prefix + key
+            with self._client.pipeline() as pipe:
+                pipe.set(key, value, nx=True, px=self._ttl_ms).pexpire(key, self._ttl_ms).get(key)
+                return pipe.execute()[-1]
+        except self._error:
+            logger.warning("cache set failed", exc_info=True)
+            return value
+
+    def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+        try:
+            self._client.delete(*(self._prefix + k for k in keys))
+        except self._error:
+            logger.warning("cache invalidation failed", exc_info=True)
+
+    def clear(self) -> None:
+        try:
+            for key in self._client.scan_iter(match=self._prefix + "*", count=1000):
+                self._client.delete(key)
+        except self._error:
+            logger.warning("cache clear failed", exc_info=True)
@@ -1,3 +1,4 @@
+from typing import Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -6,6 +7,38 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
+    ASYNC_DB: bool = False
+    ASYNC_DATABASE_URL: str | None = None
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_LIVENESS: Literal["pre_ping", "idle_ping", "none"] = "pre_ping"
+    DB_POOL_PING_IDLE_SECONDS: float = 30
+    # comma-separated; GET routes read from these when set
+    DATABASE_REPLICA_URLS: str = ""
+    DB_REPLICA_ROUTING: Literal["round_robin", "least_connections"] = "round_robin"
+    # after a write, the user's reads stay on the primary this long (0 disables)
+    READ_YOUR_WRITES_SECONDS: float = 5
+    PRINCIPAL_CACHE_SIZE: int = 10_000
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 32
+    COUNT_CACHE_SIZE: int = 10_000
+    COUNT_CACHE_TTL_SECONDS: float = 30
+    RESPONSE_CACHE_SIZE: int = 10_000
+    RESPONSE_CACHE_TTL_SECONDS: float = 30
+    RESPONSE_CACHE_URL: str | None = None
+    # events buffered per stream subscriber before its backlog is replaced by a resync event
+    EVENTS_QUEUE_SIZE: int = 256
+    EVENTS_HEARTBEAT_SECONDS: float = 15
+    # where to LISTEN; defaults to the database the configured stack writes to
+    EVENTS_DATABASE_URL: str | None = None
+    # tombstones older than this are pruned; older cursors get 410
+    CHANGES_RETENTION_DAYS: float = 30
+    EVENTS_CONNECT_TIMEOUT_SECONDS: float = 5
+    # adds X-Response-Time, X-DB-Queries and X-DB-Time headers to every response
+    DEBUG: bool = False
 
     model_config = SettingsConfigDict(
         env_file=".env",
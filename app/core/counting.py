@@ -0,0 +1,90 @@
+import json
+from typing import Literal
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import Dialect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+CountMode = Literal["none", "exact", "cached", "estimate"]
+COUNT_DESCRIPTION = "Total rows matching the filter in X-Total-Count: exact, cached (for a few seconds) or estimate (query planner)"
+# planner estimates below this are replaced by a count capped at this many rows
+ESTIMATE_EXACT_BELOW = 1000
+
+count_cache = TTLCache(maxsize=settings.COUNT_CACHE_SIZE, ttl=settings.COUNT_CACHE_TTL_SECONDS)
+
+
+class explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def _count(stmt, cap: int | None = None):
+    stmt = stmt.order_by(None)
+    if cap is not None:
+        stmt = stmt.limit(cap)
+    return select(func.count()).select_from(stmt.subquery())
+
+
+def _planned_rows(plan) -> int:
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _cache_key(stmt, dialect: Dialect):
+    compiled = stmt.compile(dialect=dialect)
+    return compiled.string, tuple(sorted((k, repr(v)) for k, v in compiled.params.items()))
+
+
+def count_queries(stmt, mode: CountMode, dialect: Dialect) -> tuple[explain | None, Executable]:
+    """The planner query for ``mode`` (None without one) and the count to run when there is no estimate or
+    it is under ``ESTIMATE_EXACT_BELOW``; that count stops there, so a capped result means at least that many."""
+    if mode == "estimate" and dialect.name == "postgresql":
+        return explain(stmt.order_by(None)), _count(stmt, ESTIMATE_EXACT_BELOW)
+    return None, _count(stmt)
+
+
+def total_count(db: Session, stmt, mode: CountMode) -> int | None:
+    """Count the rows of ``stmt`` (a filtered, unpaginated select) the way ``mode`` asks for."""
+    if mode == "none":
+        return None
+    dialect = db.get_bind().dialect
+    key = _cache_key(stmt, dialect) if mode == "cached" else None
+    if key is not None and (total := count_cache.get(key)) is not None:
+        return total
+    planner, counter = count_queries(stmt, mode, dialect)
+    total = _planned_rows(db.execute(planner).scalar()) if planner is not None else None
+    if total is None or total < ESTIMATE_EXACT_BELOW:
+        total = db.execute(counter).scalar()
+    if key is not None:
+        count_cache.set(key, total)
+    return total
+
+
+async def total_count_async(db: AsyncSession, stmt, mode: CountMode) -> int | None:
+    if mode == "none":
+        return None
+    dialect = db.get_bind().dialect
+    key = _cache_key(stmt, dialect) if mode == "cached" else None
+    if key is not None and (total := count_cache.get(key)) is not None:
+        return total
+    planner, counter = count_queries(stmt, mode, dialect)
+    total = _planned_rows((await db.execute(planner)).scalar()) if planner is not None else None
+    if total is None or total < ESTIMATE_EXACT_BELOW:
+        total = (await db.execute(counter)).scalar()
+    if key is not None:
+        count_cache.set(key, total)
+    return total
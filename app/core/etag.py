@@ -0,0 +1,34 @@
+import hashlib
+from datetime import datetime
+from typing import Any, Sequence
+
+from fastapi import Request, Response, status
+
+
+def _part(value: Any) -> Any:
+    if isinstance(value, datetime):
+        # drivers disagree on the tzinfo they attach, so compare instants
+        return int(value.timestamp()) * 1_000_000 + value.microsecond
+    return value
+
+
+def make_etag(*parts: Any) -> str:
+    digest = hashlib.blake2b(repr([_part(p) for p in parts]).encode(), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+
+def list_etag(request: Request, rows: Sequence, next_cursor: str | None, total: int | None) -> str:
+    """Validator for a list page: the query string, the version of every row on it and the paging headers."""
+    return make_etag(request.url.path, sorted(request.query_params.multi_items()),
+                     [(r.id, r.updated_at) for r in rows], next_cursor, total)
+
+
+def not_modified(request: Request, etag: str) -> Response | None:
+    """A 304 response when ``If-None-Match`` matches ``etag`` (weak comparison, per RFC 9110)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    tags = {t.strip().removeprefix("W/") for t in header.split(",")}
+    if "*" in tags or etag in tags:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return None
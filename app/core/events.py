@@ -0,0 +1,191 @@
+"""Project activity events: published with NOTIFY by the write paths, fanned out to stream subscribers.
+
+Writers queue ``pg_notify`` in the transaction of the change, so an event is delivered only once the
+change has committed, and to every process listening, whichever worker made it. Each process keeps
+one LISTEN connection and hands events to its subscribers through bounded queues: a subscriber that
+falls behind loses its backlog and gets a single ``resync`` event, instead of holding memory or
+slowing the others down. Clients recover from ``resync`` through the project's changes feed.
+"""
+import asyncio
+import logging
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Iterable, Literal
+
+import asyncpg
+import orjson
+from sqlalchemy import func, make_url, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import Counter
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "project_events"
+# NOTIFY payloads are capped at 8000 bytes
+MAX_IDS_PER_EVENT = 500
+RECONNECT_SECONDS = 1.0
+
+EventType = Literal["issue.created", "issue.updated", "issue.deleted",
+                    "comment.created", "comment.updated", "comment.deleted",
+                    "project.deleted", "resync"]
+
+events_delivered_total = Counter("events_delivered_total", "Events queued for stream subscribers")
+events_overflows_total = Counter("events_overflows_total", "Subscribers whose backlog was dropped for a resync")
+
+
+def event_notify(project_id: int, type: EventType, ids: Iterable[int] = (), **extra):
+    """One statement announcing ``type`` for ``ids``; execute it in the transaction of the change."""
+    ids = sorted(ids)
+    chunks = [ids[n:n + MAX_IDS_PER_EVENT] for n in range(0, len(ids), MAX_IDS_PER_EVENT)] or [[]]
+    return select(*(func.pg_notify(CHANNEL, orjson.dumps({"type": type, "project_id": project_id, "ids": chunk,
+                                                          **extra}).decode())
+                    for chunk in chunks))
+
+
+def publish(db: Session, project_id: int, type: EventType, ids: Iterable[int] = (), **extra) -> None:
+    """Queue the event in ``db``'s transaction; a no-op off PostgreSQL, which has no NOTIFY."""
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(event_notify(project_id, type, ids, **extra))
+
+
+async def publish_async(db: AsyncSession, project_id: int, type: EventType, ids: Iterable[int] = (), **extra) -> None:
+    if db.get_bind().dialect.name == "postgresql":
+        await db.execute(event_notify(project_id, type, ids, **extra))
+
+
+def sse_frame(type: str, data: str) -> bytes:
+    return f"event: {type}\ndata: {data}\n\n".encode()
+
+
+def listen_url(url: str) -> str:
+    """``url`` without the SQLAlchemy driver, as asyncpg expects it."""
+    return make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+def events_url() -> str:
+    """NOTIFY only reaches listeners on the same server, so listen where the write paths commit."""
+    if settings.EVENTS_DATABASE_URL:
+        return settings.EVENTS_DATABASE_URL
+    if settings.ASYNC_DB and settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    return settings.DATABASE_URL
+
+
+class Subscription:
+    def __init__(self, queue_size: int):
+        self.queue: asyncio.Queue[bytes] = asyncio.Queue(queue_size)
+
+    def push(self, frame: bytes) -> None:
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(sse_frame("resync", "{}"))
+            events_overflows_total.inc()
+            return
+        events_delivered_total.inc()
+
+    async def get(self) -> bytes:
+        return await self.queue.get()
+
+
+class EventBroker:
+    """One LISTEN connection per process, started by the first subscriber and re-established when lost."""
+
+    def __init__(self, url: str, queue_size: int, connect_timeout: float = settings.EVENTS_CONNECT_TIMEOUT_SECONDS):
+        self.url = url
+        self.queue_size = queue_size
+        self.connect_timeout = connect_timeout
+        self.subscribers: dict[int, set[Subscription]] = defaultdict(set)
+        self._task: asyncio.Task | None = None
+        self._ready: asyncio.Event | None = None
+
+    @asynccontextmanager
+    async def subscribe(self, project_id: int) -> AsyncIterator[Subscription]:
+        await self.ensure_listening()
+        sub = Subscription(self.queue_size)
+        self.subscribers[project_id].add(sub)
+        try:
+            yield sub
+        finally:
+            self.subscribers[project_id].discard(sub)
+            if not self.subscribers[project_id]:
+                del self.subscribers[project_id]
+
+    def dispatch(self, payload: str) -> None:
+        event = orjson.loads(payload)
+        frame = sse_frame(event["type"], payload)
+        for sub in self.subscribers.get(event["project_id"], ()):
+            sub.push(frame)
+
+    def _broadcast(self, frame: bytes) -> None:
+        for subs in self.subscribers.values():
+            for sub in subs:
+                sub.push(frame)
+
+    async def ensure_listening(self) -> None:
+        """Start the listener if needed; TimeoutError when it is not connected within ``connect_timeout``."""
+        # a task left on another event loop (e.g. a previous test client) cannot be reused
+        if self._task is None or self._task.done() or self._task.get_loop() is not asyncio.get_running_loop():
+            self._ready = asyncio.Event()
+            self._task = asyncio.create_task(self._listen())
+        await asyncio.wait_for(self._ready.wait(), self.connect_timeout)
+
+    async def _listen(self) -> None:
+        reconnect = False
+        while True:
+            conn = None
+            try:
+                conn = await asyncpg.connect(self.url)
+                lost = asyncio.Event()
+                conn.add_termination_listener(lambda _: lost.set())
+                await conn.add_listener(CHANNEL, lambda _conn, _pid, _channel, payload: self.dispatch(payload))
+                if reconnect:
+                    # anything published while disconnected was missed
+                    self._broadcast(sse_frame("resync", "{}"))
+                self._ready.set()
+                await lost.wait()
+                # new subscribers wait for the reconnect rather than miss events
+                self._ready.clear()
+                logger.warning("event listener connection lost, reconnecting")
+            except (OSError, asyncpg.PostgresError) as e:
+                logger.warning("event listener failed to connect: %s", e)
+            except Exception:
+                logger.exception("event listener failed")
+            finally:
+                if conn is not None and not conn.is_closed():
+                    conn.terminate()
+            reconnect = True
+            await asyncio.sleep(RECONNECT_SECONDS)
+
+    async def close(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+
+async def event_stream(broker: EventBroker, project_id: int,
+                       heartbeat: float = settings.EVENTS_HEARTBEAT_SECONDS) -> AsyncIterator[bytes]:
+    """SSE frames for ``project_id``, with a comment line every ``heartbeat`` seconds to keep proxies open."""
+    async with broker.subscribe(project_id) as sub:
+        yield b": connected\n\n"
+        while True:
+            try:
+                yield await asyncio.wait_for(sub.get(), heartbeat)
+            except TimeoutError:
+                yield b": keepalive\n\n"
+
+
+event_broker = EventBroker(listen_url(events_url()), settings.EVENTS_QUEUE_SIZE)
+
+
+def get_event_broker() -> EventBroker:
+    return event_broker
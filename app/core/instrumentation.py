@@ -0,0 +1,92 @@
+"""Per-route latency and per-request SQL accounting.
+
+``RequestMetricsMiddleware`` opens a ``RequestStats`` for every HTTP request; cursor events on
+all engines add each statement to it. Async handlers reach the same object through the
+greenlet that SQLAlchemy runs them in, sync handlers through the threadpool's copied context.
+"""
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import Histogram
+
+http_request_duration_seconds = Histogram("http_request_duration_seconds", "Request latency by route")
+db_statements_per_request = Histogram("db_statements_per_request", "SQL statements executed per request",
+                                      (0, 1, 2, 3, 5, 10, 20, 50, 100))
+db_seconds_per_request = Histogram("db_seconds_per_request", "Time spent executing SQL per request")
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    db_seconds: float = 0.0
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
+
+
+def _route_label(scope: Scope) -> str:
+    route = scope.get("route")
+    # unmatched paths share one label so scanners can't blow up the series count
+    return getattr(route, "path", None) or "unmatched"
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, app: ASGIApp, debug_headers: bool = False):
+        self.app = app
+        self.debug_headers = debug_headers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.debug_headers:
+                    message["headers"] = [*message.get("headers", []),
+                                          (b"x-response-time", f"{(time.perf_counter() - start) * 1000:.2f}ms".encode()),
+                                          (b"x-db-queries", str(stats.queries).encode()),
+                                          (b"x-db-time", f"{stats.db_seconds * 1000:.2f}ms".encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_stats.reset(token)
+            route = _route_label(scope)
+            http_request_duration_seconds.observe(time.perf_counter() - start, method=scope["method"],
+                                                  route=route, status=str(status))
+            db_statements_per_request.observe(stats.queries, route=route)
+            db_seconds_per_request.observe(stats.db_seconds, route=route)
@@ -0,0 +1,87 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_, tuple_, literal, asc, desc
+
+invalid_cursor_exception = HTTPException(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail="Invalid cursor",
+)
+
+
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if hasattr(value, "value"):
+        return value.value
+    return value
+
+
+def _load_value(col, raw: Any) -> Any:
+    if raw is None:
+        return None
+    pytype = col.type.python_type
+    if pytype is datetime:
+        return datetime.fromisoformat(raw)
+    return pytype(raw)
+
+
+def encode_cursor(sort_by: str, sort_dir: str, value: Any, last_id: int) -> str:
+    raw = json.dumps([sort_by, sort_dir, _dump_value(value), last_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, col, sort_by: str, sort_dir: str) -> tuple[Any, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        c_sort_by, c_sort_dir, value, last_id = json.loads(raw)
+        if c_sort_by != sort_by or c_sort_dir != sort_dir or not isinstance(last_id, int):
+            raise ValueError("cursor does not match the requested ordering")
+        return _load_value(col, value), last_id
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError, KeyError):
+        raise invalid_cursor_exception
+
+
+def _after(col, id_col, sort_dir: str, value: Any, last_id: int):
+    if col is id_col:
+        return id_col > last_id if sort_dir == "asc" else id_col < last_id
+    if not col.nullable:
+        bound = tuple_(literal(value, col.type), last_id)
+        return tuple_(col, id_col) > bound if sort_dir == "asc" else tuple_(col, id_col) < bound
+    # nullable columns sort NULLS LAST ascending and NULLS FIRST descending
+    if sort_dir == "asc":
+        if value is None:
+            return and_(col.is_(None), id_col > last_id)
+        return or_(col > value, and_(col == value, id_col > last_id), col.is_(None))
+    if value is None:
+        return or_(and_(col.is_(None), id_col < last_id), col.is_not(None))
+    return or_(col < value, and_(col == value, id_col < last_id))
+
+
+def keyset(query, model, sort_by: str, sort_dir: str, cursor: str | None = None):
+    """Order ``query`` by ``sort_by`` with ``id`` as tiebreaker and seek past ``cursor``."""
+    col = model.__table__.c[sort_by]
+    id_col = model.__table__.c.id
+    direction = asc if sort_dir == "asc" else desc
+    order = direction(col)
+    if col.nullable:
+        order = order.nulls_last() if sort_dir == "asc" else order.nulls_first()
+    if cursor:
+        value, last_id = decode_cursor(cursor, col, sort_by, sort_dir)
+        query = query.filter(_after(col, id_col, sort_dir, value, last_id))
+    if col is id_col:
+        return query.order_by(order)
+    return query.order_by(order, direction(id_col))
+
+
+def split_page(rows: list, limit: int, sort_by: str, sort_dir: str) -> tuple[list, str | None]:
+    """Trim a ``limit + 1`` fetch to ``limit`` rows and build the cursor for the next page."""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(sort_by, sort_dir, getattr(last, sort_by), last.id)
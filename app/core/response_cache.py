@@ -0,0 +1,105 @@
+"""Read-through cache of encoded single-resource responses (issues, comments, projects, users).
+
+Entries hold the JSON body and its ETag, so a hit is answered without touching the database
+or re-serializing. The default backend is an in-process LRU with a TTL; set
+``RESPONSE_CACHE_URL=redis://...`` to share entries between workers. Write handlers
+invalidate after commit; the TTL bounds how long a read racing a write (or served by a lagging
+replica) can keep a stale entry. Users who have just written skip the lookup, and their
+primary read stores a fresh entry in its place.
+
+Issue and comment entries also record their project's generation. Writes that touch many
+entries of a project (deleting it or one of its issues, importing into it) drop the generation, which turns every entry of the
+project into a miss at once, without knowing their ids; the next store starts a new one.
+Generations live as long as the entries stored under them: each store renews its TTL, and an
+evicted one only turns its entries into misses.
+"""
+import secrets
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+
+from app.core.cache import CacheBackend, MemoryBackend, RedisBackend
+from app.core.config import settings
+from app.core.etag import not_modified
+from app.core.metrics import Counter
+from app.db.replicas import reads_own_writes
+
+response_cache_requests_total = Counter("response_cache_requests_total", "Response cache lookups by kind and result")
+
+
+class ResponseCache:
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+
+    def respond(self, request: Request, kind: str, id: int) -> Response | None:
+        """The cached response for ``kind``/``id`` (or a 304 for it), None on a miss."""
+        if reads_own_writes(request):
+            response_cache_requests_total.inc(kind=kind, result="bypass")
+            return None
+        entry = self.backend.get(f"{kind}:{id}")
+        if entry is not None:
+            etag, scope, body = entry.split(b"\n", 2)
+            if scope and self.backend.get(_generation_key(scope.split(b":")[0].decode())) != scope:
+                entry = None
+        response_cache_requests_total.inc(kind=kind, result="miss" if entry is None else "hit")
+        if entry is None:
+            return None
+        etag = etag.decode()
+        return not_modified(request, etag) or Response(body, media_type="application/json", headers={"ETag": etag})
+
+    def store(self, kind: str, id: int, etag: str, model: BaseModel, project_id: int | None = None) -> Response:
+        body = model.model_dump_json().encode()
+        scope = b""
+        if project_id is not None:
+            scope = self.backend.setdefault(_generation_key(project_id), f"{project_id}:{secrets.token_hex(8)}".encode())
+        self.backend.set(f"{kind}:{id}", etag.encode() + b"\n" + scope + b"\n" + body)
+        return Response(body, media_type="application/json", headers={"ETag": etag})
+
+    def invalidate(self, kind: str, *ids: int) -> None:
+        self.backend.delete(*(f"{kind}:{id}" for id in ids))
+
+    def invalidate_generation(self, project_id: int) -> None:
+        """Drop every issue and comment entry stored under the project's current generation."""
+        self.backend.delete(_generation_key(project_id))
+
+    def invalidate_project(self, project_id: int) -> None:
+        """Drop the project and every issue and comment entry stored under its current generation."""
+        self.backend.delete(f"project:{project_id}", _generation_key(project_id))
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    async def _call(self, method, *args):
+        if self.backend.blocking:
+            return await run_in_threadpool(method, *args)
+        return method(*args)
+
+    async def respond_async(self, request: Request, kind: str, id: int) -> Response | None:
+        return await self._call(self.respond, request, kind, id)
+
+    async def store_async(self, kind: str, id: int, etag: str, model: BaseModel,
+                          project_id: int | None = None) -> Response:
+        return await self._call(self.store, kind, id, etag, model, project_id)
+
+    async def invalidate_async(self, kind: str, *ids: int) -> None:
+        await self._call(self.invalidate, kind, *ids)
+
+    async def invalidate_generation_async(self, project_id: int) -> None:
+        await self._call(self.invalidate_generation, project_id)
+
+    async def invalidate_project_async(self, project_id: int) -> None:
+        await self._call(self.invalidate_project, project_id)
+
+
+def _generation_key(project_id: int | str) -> str:
+    return f"generation:project:{project_id}"
+
+
+def _backend() -> CacheBackend:
+    if settings.RESPONSE_CACHE_URL:
+        return RedisBackend(settings.RESPONSE_CACHE_URL, settings.RESPONSE_CACHE_TTL_SECONDS)
+    return MemoryBackend(settings.RESPONSE_CACHE_SIZE, settings.RESPONSE_CACHE_TTL_SECONDS)
+
+
+response_cache = ResponseCache(_backend())
@@ -1,5 +1,9 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
-from typing import Any
+from typing import Any, Callable
 
 from jose import jwt, JWTError, ExpiredSignatureError
 from passlib.context import CryptContext
@@ -7,6 +11,7 @@ from fastapi.security import OAuth2PasswordBearer
 from fastapi import HTTPException, status
 
 from .config import settings
+from .metrics import Counter, Histogram
 
 SECRET_KEY = settings.SECRET_KEY
 ALGORITHM = settings.ALGORITHM
@@ -19,11 +24,53 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt releases the GIL, so a small dedicated pool keeps hashing off the request threads and event loop
+_hash_executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+_hash_slots = threading.BoundedSemaphore(settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_MAX_PENDING)
+
+password_hash_seconds = Histogram("password_hash_seconds", "Time spent in bcrypt", (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0))
+password_hash_wait_seconds = Histogram("password_hash_wait_seconds", "Time spent queued for a bcrypt worker")
+password_hash_rejected_total = Counter("password_hash_rejected_total", "Hashing requests rejected because the queue was full")
+
+hasher_busy_exception = HTTPException(
+    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+    detail="Too many concurrent authentication requests, retry shortly",
+    headers={"Retry-After": "1"},
+)
+
+def _submit(op: str, fn: Callable[..., Any], *args: Any) -> Future:
+    if not _hash_slots.acquire(blocking=False):
+        password_hash_rejected_total.inc(op=op)
+        raise hasher_busy_exception
+    queued = time.perf_counter()
+
+    def run():
+        started = time.perf_counter()
+        password_hash_wait_seconds.observe(started - queued, op=op)
+        try:
+            return fn(*args)
+        finally:
+            password_hash_seconds.observe(time.perf_counter() - started, op=op)
+
+    try:
+        future = _hash_executor.submit(run)
+    except BaseException:
+        _hash_slots.release()
+        raise
+    future.add_done_callback(lambda _: _hash_slots.release())
+    return future
+
 def hash_pw(password: str) -> str:
-    return pwd_context.hash(password)
+    return _submit("hash", pwd_context.hash, password).result()
 
 def verify_pw(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return _submit("verify", pwd_context.verify, plain_password, hashed_password).result()
+
+async def hash_pw_async(password: str) -> str:
+    return await asyncio.wrap_future(_submit("hash", pwd_context.hash, password))
+
+async def verify_pw_async(plain_password: str, hashed_password: str) -> bool:
+    return await asyncio.wrap_future(_submit("verify", pwd_context.verify, plain_password, hashed_password))
 
 def create_token(user_id: int) -> str:
     now = datetime.now(timezone.utc)
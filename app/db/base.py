@@ -1,3 +1,36 @@
+from sqlalchemy import DDL, DateTime, event, func
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.sql.functions import FunctionElement
 
-Base = declarative_base()
\ No newline at end of file
+Base = declarative_base()
+
+# Rows the changes feed reads are stamped when written, after their transaction has taken an xid, so
+# a transaction is counted by the feed's horizon (app.services.changes) before any row it stamps.
+CHANGE_STAMP_FUNCTION = DDL("""
+CREATE OR REPLACE FUNCTION change_stamp() RETURNS timestamptz LANGUAGE plpgsql VOLATILE AS $$
+BEGIN
+    PERFORM pg_current_xact_id();
+    RETURN clock_timestamp();
+END
+$$
+""")
+
+# column defaults call it, so it exists before any table
+event.listen(Base.metadata, "before_create", CHANGE_STAMP_FUNCTION.execute_if(dialect="postgresql"))
+
+
+class change_stamp(FunctionElement):
+    """``change_stamp()`` on PostgreSQL, the current timestamp elsewhere."""
+    type = DateTime(timezone=True)
+    inherit_cache = True
+
+
+@compiles(change_stamp)
+def _compile_change_stamp(element, compiler, **kw):
+    return compiler.process(func.now(), **kw)
+
+
+@compiles(change_stamp, "postgresql")
+def _compile_change_stamp_postgresql(element, compiler, **kw):
+    return "change_stamp()"
@@ -0,0 +1,17 @@
+from sqlalchemy.exc import DBAPIError
+
+UNIQUE_VIOLATION = "23505"
+FOREIGN_KEY_VIOLATION = "23503"
+
+
+def sqlstate(exc: DBAPIError) -> str | None:
+    """The Postgres SQLSTATE behind ``exc``; psycopg2 and the asyncpg adapter both expose it as ``pgcode``."""
+    return getattr(exc.orig, "pgcode", None)
+
+
+def constraint_name(exc: DBAPIError) -> str | None:
+    """The constraint ``exc`` violated: psycopg2 reports it in ``diag``, asyncpg on the error SQLAlchemy wraps."""
+    diag = getattr(exc.orig, "diag", None)
+    if diag is not None:
+        return diag.constraint_name
+    return getattr(exc.orig.__cause__, "constraint_name", None)
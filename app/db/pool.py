@@ -0,0 +1,94 @@
+import time
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.exc import DisconnectionError, TimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from app.core.metrics import Counter, Gauge, Histogram
+
+db_pool_wait_seconds = Histogram("db_pool_wait_seconds", "Time to check out a connection (queueing, connecting, liveness checks)",
+                                 (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0))
+db_pool_timeouts_total = Counter("db_pool_timeouts_total", "Checkouts that gave up after DB_POOL_TIMEOUT")
+db_pool_stale_total = Counter("db_pool_stale_total", "Idle connections found dead by the liveness ping and replaced")
+db_pool_connections = Gauge("db_pool_connections", "Pooled connections by state, sampled at scrape time")
+
+
+class _InstrumentedPool:
+    label = "sync"
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except TimeoutError:
+            db_pool_timeouts_total.inc(pool=self.label)
+            raise
+        finally:
+            db_pool_wait_seconds.observe(time.perf_counter() - start, pool=self.label)
+
+
+class InstrumentedQueuePool(_InstrumentedPool, QueuePool):
+    label = "sync"
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPool, AsyncAdaptedQueuePool):
+    label = "async"
+
+
+def labelled(poolclass: type[Pool], label: str) -> type[Pool]:
+    """``poolclass`` reporting under ``label``; a class attribute, so it survives ``Pool.recreate()``."""
+    return type(poolclass.__name__, (poolclass,), {"label": label})
+
+
+def ping_when_idle(pool: Pool, idle_seconds: float) -> None:
+    """Cheaper alternative to ``pool_pre_ping``: only connections idle for ``idle_seconds`` are pinged on checkout."""
+
+    @event.listens_for(pool, "checkin")
+    def _checkin(dbapi_connection, record):
+        record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(pool, "checkout")
+    def _checkout(dbapi_connection, record, proxy):
+        checked_in_at = record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        try:
+            cursor = dbapi_connection.cursor()
+            try:
+                cursor.execute("SELECT 1")
+            finally:
+                cursor.close()
+        except Exception as e:
+            db_pool_stale_total.inc(pool=getattr(pool, "label", "sync"))
+            # the pool discards the connection and retries the checkout with a fresh one
+            raise DisconnectionError() from e
+
+
+def pool_stats(pool: Pool) -> dict[str, Any]:
+    label = getattr(pool, "label", "sync")
+    stats: dict[str, Any] = {"pool": label}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            # overflow() counts down from -size while the core pool fills up
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+        )
+    stats.update(
+        checkouts=db_pool_wait_seconds.count(pool=label),
+        wait_seconds_total=round(db_pool_wait_seconds.sum(pool=label), 6),
+        timeouts=db_pool_timeouts_total.value(pool=label),
+        stale=db_pool_stale_total.value(pool=label),
+    )
+    return stats
+
+
+def update_pool_gauges(*pools: Pool) -> None:
+    for pool in pools:
+        stats = pool_stats(pool)
+        for state in ("size", "checked_out", "checked_in", "overflow"):
+            if state in stats:
+                db_pool_connections.set(stats[state], pool=stats["pool"], state=state)
@@ -0,0 +1,129 @@
+"""Read routing: GET routes read from a replica, except for a user who has just written.
+
+A successful write by an authenticated user marks that user for ``READ_YOUR_WRITES_SECONDS``;
+their reads stay on the primary meanwhile, so they see their own change even while the replicas
+still lag behind. Marks live in Redis when ``RESPONSE_CACHE_URL`` is set, so every worker sees
+them, and in process memory otherwise.
+"""
+import itertools
+import threading
+from typing import Generic, Literal, Mapping, TypeVar
+
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.cache import CacheBackend, MemoryBackend, RedisBackend
+from app.core.config import settings
+from app.core.security import decode_token
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+RECENT_WRITERS_SIZE = 100_000
+
+Bind = TypeVar("Bind")
+
+
+class ReplicaSet(Generic[Bind]):
+    """Picks the engine for the next read, in turn or the one with the fewest connections in use."""
+
+    def __init__(self, engines: list[Bind], routing: Literal["round_robin", "least_connections"] = "round_robin"):
+        self.engines = engines
+        self.routing = routing
+        self._turn = itertools.cycle(engines)
+        self._lock = threading.Lock()
+
+    def __bool__(self) -> bool:
+        return bool(self.engines)
+
+    def pick(self) -> Bind:
+        if self.routing == "least_connections":
+            # AsyncEngine keeps its pool on the wrapped sync engine
+            return min(self.engines, key=lambda e: getattr(e, "sync_engine", e).pool.checkedout())
+        with self._lock:
+            return next(self._turn)
+
+
+def bearer_user_id(headers: Mapping[str, str]) -> int | None:
+    """The user of a valid bearer token in ``headers``, None without one."""
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return int(decode_token(token).get("sub", "0")) or None
+    except (ValueError, HTTPException):
+        return None
+
+
+class RecentWriters:
+    """Users who wrote within the backend's TTL. Disabled, nobody is ever marked or looked up."""
+
+    def __init__(self, backend: CacheBackend, enabled: bool):
+        self.backend = backend
+        self.enabled = enabled
+
+    def mark(self, user_id: int) -> None:
+        self.backend.set(f"user:{user_id}", b"1")
+
+    def __contains__(self, user_id: int) -> bool:
+        return self.backend.get(f"user:{user_id}") is not None
+
+    async def _call(self, method, *args):
+        if self.backend.blocking:
+            return await run_in_threadpool(method, *args)
+        return method(*args)
+
+    async def mark_async(self, user_id: int) -> None:
+        await self._call(self.mark, user_id)
+
+    async def contains_async(self, user_id: int) -> bool:
+        return await self._call(self.__contains__, user_id)
+
+
+def _recent_writers() -> RecentWriters:
+    window = settings.READ_YOUR_WRITES_SECONDS
+    enabled = bool(settings.DATABASE_REPLICA_URLS.strip()) and window > 0
+    if enabled and settings.RESPONSE_CACHE_URL:
+        return RecentWriters(RedisBackend(settings.RESPONSE_CACHE_URL, window, prefix="mit:wrote:"), enabled)
+    return RecentWriters(MemoryBackend(RECENT_WRITERS_SIZE, window), enabled)
+
+
+recent_writers = _recent_writers()
+
+
+def reads_own_writes(request: Request) -> bool:
+    if not recent_writers.enabled:
+        return False
+    user_id = bearer_user_id(request.headers)
+    return user_id is not None and user_id in recent_writers
+
+
+async def reads_own_writes_async(request: Request) -> bool:
+    if not recent_writers.enabled:
+        return False
+    user_id = bearer_user_id(request.headers)
+    return user_id is not None and await recent_writers.contains_async(user_id)
+
+
+class ReadYourWritesMiddleware:
+    """Marks the user behind every successful write in ``recent_writers``."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        user_id = None
+        if scope["type"] == "http" and scope["method"] not in SAFE_METHODS and recent_writers.enabled:
+            user_id = bearer_user_id(Headers(scope=scope))
+        if user_id is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_marking_writer(message: Message) -> None:
+            # before the response goes out, so the client's next request already sees the mark
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                await recent_writers.mark_async(user_id)
+            await send(message)
+
+        await self.app(scope, receive, send_marking_writer)
@@ -1,8 +1,29 @@
-from sqlalchemy import create_engine
+from fastapi import Request
+from sqlalchemy import create_engine, make_url
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from app.core.config import settings
+from app.db.pool import InstrumentedQueuePool, InstrumentedAsyncQueuePool, labelled, ping_when_idle
+from app.db.replicas import ReplicaSet, reads_own_writes, reads_own_writes_async
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+def async_url(url: str) -> str:
+    u = make_url(url)
+    return u.set(drivername=f"{u.get_backend_name()}+{ASYNC_DRIVERS[u.get_backend_name()]}").render_as_string(hide_password=False)
+
+def pool_options(async_engine: bool = False, label: str | None = None) -> dict:
+    poolclass = InstrumentedAsyncQueuePool if async_engine else InstrumentedQueuePool
+    return dict(
+        poolclass=labelled(poolclass, label) if label else poolclass,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_LIVENESS == "pre_ping",
+    )
+
+engine = create_engine(settings.DATABASE_URL, **pool_options())
 
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -11,9 +32,48 @@ SessionLocal = sessionmaker(
     bind=engine,
 )
 
+async_engine = create_async_engine(settings.ASYNC_DATABASE_URL or async_url(settings.DATABASE_URL), **pool_options(True))
+
+replica_urls = [url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+replicas = ReplicaSet([create_engine(url, **pool_options(label=f"replica{n}"))
+                       for n, url in enumerate(replica_urls)], settings.DB_REPLICA_ROUTING)
+async_replicas = ReplicaSet([create_async_engine(async_url(url), **pool_options(True, label=f"replica{n}-async"))
+                             for n, url in enumerate(replica_urls)], settings.DB_REPLICA_ROUTING)
+
+def all_pools() -> list:
+    return [engine.pool, async_engine.sync_engine.pool, *(e.pool for e in replicas.engines),
+            *(e.sync_engine.pool for e in async_replicas.engines)]
+
+if settings.DB_POOL_LIVENESS == "idle_ping":
+    for pool in all_pools():
+        ping_when_idle(pool, settings.DB_POOL_PING_IDLE_SECONDS)
+
+AsyncSessionLocal = async_sessionmaker(
+    autoflush=False,
+    expire_on_commit=False,
+    bind=async_engine,
+)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def get_read_db(request: Request):
+    """A session for reads only: on a replica when there are any, unless the user has just written."""
+    db = SessionLocal(bind=replicas.pick()) if replicas and not reads_own_writes(request) else SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_read_db(request: Request):
+    bind = async_replicas.pick() if async_replicas and not await reads_own_writes_async(request) else async_engine
+    async with AsyncSessionLocal(bind=bind) as db:
+        yield db
\ No newline at end of file
@@ -1,9 +1,14 @@
+from dataclasses import dataclass
+from datetime import datetime
 from typing import Annotated
 from fastapi import HTTPException, status, Depends
 from app.core.security import oauth2_scheme, decode_token
+from app.core.cache import TTLCache
+from app.core.config import settings
 from jose import JWTError, ExpiredSignatureError
 from sqlalchemy.orm import Session
-from app.db.session import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_db, get_async_db
 from app.models.user import User
 
 credentials_exception = HTTPException(
@@ -13,26 +18,83 @@ credentials_exception = HTTPException(
 )
 
 
-def get_current_user(
-    db: Annotated[Session, Depends(get_db)],
-    token: Annotated[str, Depends(oauth2_scheme)],
-) -> User:
+@dataclass(frozen=True)
+class Principal:
+    id: int
+    username: str
+    created_at: datetime
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(id=user.id, username=user.username, created_at=user.created_at)
+
+
+# verified users by id; entries are per process, so other workers see changes after the TTL at the latest
+principal_cache = TTLCache(settings.PRINCIPAL_CACHE_SIZE, settings.PRINCIPAL_CACHE_TTL_SECONDS)
+
+
+async def get_token_user_id(token: Annotated[str, Depends(oauth2_scheme)]) -> int:
+    """Authorize from the signed token claims alone, without touching the database."""
     try:
         data = decode_token(token)
-        uid = int(data.get("sub", "0"))
+        return int(data.get("sub", "0"))
     except (ValueError, JWTError, ExpiredSignatureError, HTTPException):
         raise credentials_exception
+
+
+def get_current_user(
+    db: Annotated[Session, Depends(get_db)],
+    uid: Annotated[int, Depends(get_token_user_id)],
+) -> User:
     user = db.get(User, uid)
     if not user:
         raise credentials_exception
     return user
+
+
+async def get_current_user_async(
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+    uid: Annotated[int, Depends(get_token_user_id)],
+) -> User:
+    user = await db.get(User, uid)
+    if not user:
+        raise credentials_exception
+    return user
+
+
+def get_current_principal(
+    db: Annotated[Session, Depends(get_db)],
+    uid: Annotated[int, Depends(get_token_user_id)],
+) -> Principal:
+    principal = principal_cache.get(uid)
+    if principal is None:
+        user = db.get(User, uid)
+        if not user:
+            raise credentials_exception
+        principal = Principal.from_user(user)
+        principal_cache.set(uid, principal)
+    return principal
+
+
+async def get_current_principal_async(
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+    uid: Annotated[int, Depends(get_token_user_id)],
+) -> Principal:
+    principal = principal_cache.get(uid)
+    if principal is None:
+        user = await db.get(User, uid)
+        if not user:
+            raise credentials_exception
+        principal = Principal.from_user(user)
+        principal_cache.set(uid, principal)
+    return principal
     
 def get_current_user_id(
-    user: Annotated[User, Depends(get_current_user)]
+    principal: Annotated[Principal, Depends(get_current_principal)]
 ) -> int:
-    return user.id
+    return principal.id
 
 def get_current_user_username(
-    user: Annotated[User, Depends(get_current_user)]
+    principal: Annotated[Principal, Depends(get_current_principal)]
 ) -> str:
-    return user.username
\ No newline at end of file
+    return principal.username
\ No newline at end of file
@@ -1,7 +1,16 @@
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
-from app.routers import auth, users, projects, issues, comments
-from app.db.session import engine
+from app.core.config import settings
+from app.core.instrumentation import RequestMetricsMiddleware
+from app.core.metrics import render
+from app.core.events import event_broker
+from app.routers import auth, users, projects, issues, comments, search, export, imports, events
+from app.routers.aio import auth as aio_auth, users as aio_users, projects as aio_projects
+from app.routers.aio import issues as aio_issues, comments as aio_comments
+from app.db.session import all_pools
+from app.db.pool import pool_stats, update_pool_gauges
+from app.db.replicas import ReadYourWritesMiddleware
 from app.db.base import Base
 
 
@@ -9,24 +18,53 @@ from app.models import user as _m_user
 from app.models import project as _m_project
 from app.models import issue as _m_issue
 from app.models import comment as _m_comment
+from app.models import stats as _m_stats
+from app.models import tombstone as _m_tombstone
 
-#@asynccontextmanager
-#async def lifespan(app: FastAPI):
-#    Base.metadata.create_all(bind=engine)
-#    yield
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await event_broker.close()
 
-app = FastAPI(title="Mini issue-tracker") #lifespan=lifespan)
+def create_app(async_db: bool = settings.ASYNC_DB) -> FastAPI:
+    app = FastAPI(title="Mini issue-tracker", lifespan=lifespan)
+    app.add_middleware(RequestMetricsMiddleware, debug_headers=settings.DEBUG)
+    app.add_middleware(ReadYourWritesMiddleware)
 
-app.include_router(auth.router)
-app.include_router(users.router)
-app.include_router(projects.router)
-app.include_router(issues.routerprojectissue)
-app.include_router(issues.router)
-app.include_router(comments.routerissuecomment)
-app.include_router(comments.router)
+    if async_db:
+        app.include_router(aio_auth.router)
+        app.include_router(aio_users.router)
+        app.include_router(aio_projects.router)
+        app.include_router(aio_issues.routerprojectissue)
+        app.include_router(aio_issues.router)
+        app.include_router(aio_comments.routerissuecomment)
+        app.include_router(aio_comments.router)
+    else:
+        app.include_router(auth.router)
+        app.include_router(users.router)
+        app.include_router(projects.router)
+        app.include_router(issues.routerprojectissue)
+        app.include_router(issues.router)
+        app.include_router(comments.routerissuecomment)
+        app.include_router(comments.router)
+    app.include_router(search.router)
+    app.include_router(export.router)
+    app.include_router(imports.router)
+    app.include_router(events.router)
 
+    @app.get("/health")
+    def health():
+        return {"status": "ok"}
 
+    @app.get("/health/pool")
+    def health_pool():
+        return {"pools": [pool_stats(pool) for pool in all_pools()]}
 
-@app.get("/health")
-def health():
-    return {"status": "ok"}
\ No newline at end of file
+    @app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+    def metrics():
+        update_pool_gauges(*all_pools())
+        return PlainTextResponse(render(), media_type="text/plain; version=0.0.4")
+
+    return app
+
+app = create_app()
\ No newline at end of file
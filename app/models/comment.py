@@ -1,16 +1,27 @@
 from datetime import datetime
 
-from sqlalchemy import String, DateTime, func, Text, ForeignKey
+from sqlalchemy import String, DateTime, func, Text, ForeignKey, Index, text
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.db.base import Base
+from app.db.base import Base, change_stamp
+
+COMMENT_SEARCH_DOCUMENT = "to_tsvector('english', content)"
 
 class Comment(Base):
     __tablename__ = "comments"
+    __table_args__ = (
+        Index("ix_comments_issue_id_id", "issue_id", "id"),
+        Index("ix_comments_issue_id_created_at_id", "issue_id", "created_at", "id"),
+        # changes feed of a project
+        Index("ix_comments_project_id_updated_at_id", "project_id", "updated_at", "id"),
+        Index("ix_comments_search", text(COMMENT_SEARCH_DOCUMENT), postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    content: Mapped[str] = mapped_column(Text, nullable=False, index= True)
+    content: Mapped[str] = mapped_column(Text, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
-    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate= func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=change_stamp(), onupdate=change_stamp())
     issue_id: Mapped[int] = mapped_column(ForeignKey("issues.id", ondelete="CASCADE"), index=True, nullable=False)
     author_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True, nullable=False)
+    # the issue's, copied so a project's comments can be read without going through its issues
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
@@ -1,9 +1,9 @@
 from datetime import datetime
 from enum import Enum
-from sqlalchemy import String, DateTime, func, Text, ForeignKey, UniqueConstraint,Enum as MyEnum
+from sqlalchemy import String, DateTime, func, Text, ForeignKey, UniqueConstraint, Index, text, Enum as MyEnum
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.db.base import Base
+from app.db.base import Base, change_stamp
 
 class IssueStatus(str, Enum):
     open = "open"
@@ -14,10 +14,25 @@ class IssuePriority(str, Enum):
     medium = "medium"
     high = "high"
 
+ISSUE_SEARCH_DOCUMENT = "to_tsvector('english', title || ' ' || coalesce(\"desc\", ''))"
+
 class Issue(Base):
     __tablename__ = "issues"
     __table_args__ = (
         UniqueConstraint("title", "project_id", name="uq_title_name_project_id"),
+        Index("ix_issues_project_id_id", "project_id", "id"),
+        Index("ix_issues_project_id_created_at_id", "project_id", "created_at", "id"),
+        Index("ix_issues_project_id_updated_at_id", "project_id", "updated_at", "id"),
+        Index("ix_issues_project_id_status_priority_id", "project_id", "status", "priority", "id"),
+        Index("ix_issues_project_id_assignee_id_updated_at", "project_id", "assignee_id", "updated_at"),
+        Index("ix_issues_project_id_reporter_id_id", "project_id", "reporter_id", "id"),
+        # cross-project "my issues" inbox, newest activity first
+        Index("ix_issues_assignee_id_status_updated_at", "assignee_id", "status", "updated_at"),
+        Index("ix_issues_reporter_id_updated_at", "reporter_id", "updated_at"),
+        # triage views list open issues by recency; closed issues dominate old projects
+        Index("ix_issues_open_project_id_updated_at_id", "project_id", "updated_at", "id",
+              postgresql_where=text("status = 'open'")),
+        Index("ix_issues_search", text(ISSUE_SEARCH_DOCUMENT), postgresql_using="gin").ddl_if(dialect="postgresql"),
     )
 
 
@@ -27,7 +42,7 @@ class Issue(Base):
     status: Mapped[IssueStatus] = mapped_column(MyEnum(IssueStatus, name = "status", validate_strings = True), nullable=False, default=IssueStatus.open)
     priority: Mapped[IssuePriority] = mapped_column(MyEnum(IssuePriority, name = "priority", validate_strings = True), nullable=False, default=IssuePriority.medium)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
-    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate= func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=change_stamp(), onupdate=change_stamp())
     project_id : Mapped[int] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"), index=True, nullable=False)
     reporter_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True, nullable=False)
     assignee_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True, nullable=True)
\ No newline at end of file
@@ -0,0 +1,72 @@
+from sqlalchemy import ForeignKey, DDL, Integer, event, Enum as MyEnum
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.models.issue import Issue, IssueStatus, IssuePriority
+
+
+class ProjectIssueStats(Base):
+    """Issue counts per (project, status, priority, assignee), kept current by triggers on ``issues``."""
+    __tablename__ = "project_issue_stats"
+
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    status: Mapped[IssueStatus] = mapped_column(MyEnum(IssueStatus, name = "status", validate_strings = True), primary_key=True)
+    priority: Mapped[IssuePriority] = mapped_column(MyEnum(IssuePriority, name = "priority", validate_strings = True), primary_key=True)
+    # 0 stands for unassigned so the bucket can be part of the primary key
+    assignee_id: Mapped[int] = mapped_column(Integer, primary_key=True, server_default="0")
+    issue_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+
+
+# Statement-level triggers aggregate the transition tables, so a multi-row INSERT/UPDATE/DELETE
+# (batch create, bulk update, import, cascades) costs one upsert per touched bucket, not per row.
+# Buckets are locked in key order, otherwise two concurrent updates moving issues between the
+# same buckets in opposite directions deadlock.
+# Decrements only UPDATE existing buckets: during a project cascade the buckets may already be gone.
+STATS_FUNCTION = DDL("""
+CREATE OR REPLACE FUNCTION project_issue_stats_apply() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO project_issue_stats (project_id, status, priority, assignee_id, issue_count)
+        SELECT project_id, status, priority, coalesce(assignee_id, 0), count(*)
+        FROM new_rows GROUP BY 1, 2, 3, 4 ORDER BY 1, 2, 3, 4
+        ON CONFLICT (project_id, status, priority, assignee_id)
+        DO UPDATE SET issue_count = project_issue_stats.issue_count + EXCLUDED.issue_count;
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM 1 FROM project_issue_stats s
+        WHERE (s.project_id, s.status, s.priority, s.assignee_id) IN (
+            SELECT project_id, status, priority, coalesce(assignee_id, 0) FROM old_rows)
+        ORDER BY s.project_id, s.status, s.priority, s.assignee_id
+        FOR UPDATE;
+        UPDATE project_issue_stats s SET issue_count = s.issue_count - d.n
+        FROM (SELECT project_id, status, priority, coalesce(assignee_id, 0) AS assignee_id, count(*) AS n
+              FROM old_rows GROUP BY 1, 2, 3, 4) d
+        WHERE s.project_id = d.project_id AND s.status = d.status
+          AND s.priority = d.priority AND s.assignee_id = d.assignee_id;
+    ELSE
+        -- one ordered upsert for increments and decrements; the old bucket of a moved issue exists
+        INSERT INTO project_issue_stats (project_id, status, priority, assignee_id, issue_count)
+        SELECT project_id, status, priority, assignee_id, sum(n) FROM (
+            SELECT project_id, status, priority, coalesce(assignee_id, 0) AS assignee_id, -1 AS n FROM old_rows
+            UNION ALL
+            SELECT project_id, status, priority, coalesce(assignee_id, 0), 1 FROM new_rows
+        ) x GROUP BY 1, 2, 3, 4 HAVING sum(n) <> 0 ORDER BY 1, 2, 3, 4
+        ON CONFLICT (project_id, status, priority, assignee_id)
+        DO UPDATE SET issue_count = project_issue_stats.issue_count + EXCLUDED.issue_count;
+    END IF;
+    RETURN NULL;
+END
+$$
+""")
+
+STATS_TRIGGERS = [
+    DDL("CREATE TRIGGER issues_stats_insert AFTER INSERT ON issues REFERENCING NEW TABLE AS new_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION project_issue_stats_apply()"),
+    DDL("CREATE TRIGGER issues_stats_update AFTER UPDATE ON issues REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION project_issue_stats_apply()"),
+    DDL("CREATE TRIGGER issues_stats_delete AFTER DELETE ON issues REFERENCING OLD TABLE AS old_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION project_issue_stats_apply()"),
+]
+
+event.listen(Issue.__table__, "after_create", STATS_FUNCTION.execute_if(dialect="postgresql"))
+for trigger in STATS_TRIGGERS:
+    event.listen(Issue.__table__, "after_create", trigger.execute_if(dialect="postgresql"))
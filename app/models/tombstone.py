@@ -0,0 +1,60 @@
+from datetime import datetime
+
+from sqlalchemy import String, DateTime, ForeignKey, Index, DDL, event
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base, change_stamp
+from app.models.issue import Issue
+from app.models.comment import Comment
+
+
+class Tombstone(Base):
+    """A deleted issue or comment, kept so the changes feed can report deletes."""
+    __tablename__ = "tombstones"
+    __table_args__ = (
+        Index("ix_tombstones_project_id_deleted_at_id", "project_id", "deleted_at", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    kind: Mapped[str] = mapped_column(String(16), nullable=False)
+    entity_id: Mapped[int] = mapped_column(nullable=False)
+    # the issue a deleted comment belonged to
+    issue_id: Mapped[int] = mapped_column(nullable=True)
+    deleted_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=change_stamp())
+
+
+# Statement-level triggers, so cascades (issue -> comments, user -> issues and comments) are recorded too.
+# Comments of a deleted issue are implied by the issue's tombstone, and nothing is recorded for a
+# project that is being deleted: its feed goes away with it.
+TOMBSTONE_FUNCTION = DDL("""
+CREATE OR REPLACE FUNCTION tombstones_record() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_TABLE_NAME = 'issues' THEN
+        INSERT INTO tombstones (project_id, kind, entity_id)
+        SELECT o.project_id, 'issue', o.id FROM old_rows o
+        JOIN projects p ON p.id = o.project_id;
+    ELSE
+        INSERT INTO tombstones (project_id, kind, entity_id, issue_id)
+        SELECT i.project_id, 'comment', o.id, o.issue_id FROM old_rows o
+        JOIN issues i ON i.id = o.issue_id
+        JOIN projects p ON p.id = i.project_id;
+    END IF;
+    RETURN NULL;
+END
+$$
+""")
+
+TOMBSTONE_TRIGGERS = [
+    DDL("CREATE TRIGGER issues_tombstones AFTER DELETE ON issues REFERENCING OLD TABLE AS old_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION tombstones_record()"),
+    DDL("CREATE TRIGGER comments_tombstones AFTER DELETE ON comments REFERENCING OLD TABLE AS old_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION tombstones_record()"),
+]
+
+# the triggers are created with the table they write to, which therefore comes after issues and comments
+Tombstone.__table__.add_is_dependent_on(Issue.__table__)
+Tombstone.__table__.add_is_dependent_on(Comment.__table__)
+event.listen(Tombstone.__table__, "after_create", TOMBSTONE_FUNCTION.execute_if(dialect="postgresql"))
+for trigger in TOMBSTONE_TRIGGERS:
+    event.listen(Tombstone.__table__, "after_create", trigger.execute_if(dialect="postgresql"))
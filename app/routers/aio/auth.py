@@ -0,0 +1,37 @@
+from typing import Annotated
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_async_db
+from app.models.user import User
+from app.schemas.user import UserCreate, UserRead
+from app.schemas.auth import TokenResponse, LoginIn
+from app.core.security import verify_pw_async, hash_pw_async, create_token
+
+router = APIRouter(prefix="/auth", tags=["auth"])
+
+@router.post("/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
+async def register(payload: UserCreate, db: Annotated[AsyncSession, Depends(get_async_db)]):
+    password_hash = await hash_pw_async(payload.password)
+    user = (await db.scalars(insert(User).values(username=payload.username, password_hash=password_hash)
+                             .on_conflict_do_nothing(index_elements=[User.username])
+                             .returning(User))).first()
+    if user is None:
+        raise HTTPException(status_code=409, detail="Username already registered")
+    await db.commit()
+    return user
+
+@router.post("/login", response_model=TokenResponse)
+async def login(
+    form: LoginIn,
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+):
+    user = await db.scalar(select(User).where(User.username == form.username))
+    if not user or not await verify_pw_async(form.password, user.password_hash):
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+
+
+    token = create_token(user_id=user.id)
+    return TokenResponse(access_token=token)
@@ -0,0 +1,104 @@
+from typing import Annotated, Literal
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_async_db, get_async_read_db
+from app.models.comment import Comment
+from app.models.issue import Issue
+
+from app.schemas.comment import CommentCreate, CommentRead
+from app.deps import Principal, get_current_principal_async, get_token_user_id
+from app.core.pagination import keyset, split_page
+from app.core.counting import CountMode, COUNT_DESCRIPTION, total_count_async
+from app.core.etag import make_etag, list_etag, not_modified
+from app.core.response_cache import response_cache
+from app.core.events import publish_async
+from app.core.responses import schema_columns, rows_response
+
+router = APIRouter(prefix="/comments", tags=["comments"])
+routerissuecomment = APIRouter(prefix="/issues", tags=["issue_comments"])
+
+@routerissuecomment.post("/{issue_id}/comments", response_model=CommentRead, status_code= status.HTTP_201_CREATED)
+async def create_comment(issue_id: int, payload: CommentCreate, db: Annotated[AsyncSession, Depends(get_async_db)],
+                         me: Annotated[Principal, Depends(get_current_principal_async)]):
+    issue = await db.get(Issue, issue_id)
+    if not issue:
+        raise HTTPException(status_code=404, detail="Issue not found")
+    comment = Comment(content = payload.content, issue_id = issue_id, author_id = me.id, project_id = issue.project_id)
+    db.add(comment); await db.flush()
+    await publish_async(db, issue.project_id, "comment.created", [comment.id], issue_id=issue_id)
+    await db.commit(); await db.refresh(comment)
+    return comment
+
+@routerissuecomment.get("/{issue_id}/comments", response_model = list[CommentRead],dependencies=[Depends(get_token_user_id)])
+async def list_comments(issue_id: int, db: Annotated[AsyncSession, Depends(get_async_read_db),],
+                        request: Request,
+                        response: Response,
+                        skip: int = Query(0, ge=0),
+                        limit: int = Query(50, ge=1, le=200),
+                        cursor: str | None = Query(None, description="Opaque cursor from X-Next-Cursor"),
+                        count: CountMode = Query("none", description=COUNT_DESCRIPTION),
+                        q: str | None = Query(None, description="Filter by comment content (icontains)"),
+                        sort_by: Literal["id", "content", "issue_id", "author_id", "created_at", "updated_at"] = "id",
+                        sort_dir: Literal["asc", "desc"] = "asc"
+) -> list[CommentRead]:
+    if not await db.get(Issue, issue_id):
+        raise HTTPException(status_code=404, detail="Issue not found")
+    stmt = select(*schema_columns(Comment, CommentRead)).where(Comment.issue_id == issue_id)
+    if q:
+        stmt = stmt.where(Comment.content.ilike(f"%{q}%"))
+    total = await total_count_async(db, stmt, count)
+    stmt = keyset(stmt, Comment, sort_by, sort_dir, cursor)
+    rows = (await db.execute(stmt.offset(skip).limit(limit + 1))).all()
+    comments, next_cursor = split_page(rows, limit, sort_by, sort_dir)
+    etag = list_etag(request, comments, next_cursor, total)
+    if unchanged := not_modified(request, etag):
+        return unchanged
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if total is not None:
+        response.headers["X-Total-Count"] = str(total)
+    response.headers["ETag"] = etag
+    return rows_response(comments, response.headers)
+
+@router.get("/{comment_id}", response_model = CommentRead)
+async def get_one_comment(comment_id: int, db: Annotated[AsyncSession, Depends(get_async_read_db)], request: Request):
+    if cached := await response_cache.respond_async(request, "comment", comment_id):
+        return cached
+    if request.headers.get("if-none-match"):
+        version = (await db.execute(select(Comment.id, Comment.updated_at).where(Comment.id == comment_id))).first()
+        if version and (unchanged := not_modified(request, make_etag(*version))):
+            return unchanged
+    c = await db.get(Comment, comment_id)
+    if not c:
+        raise HTTPException(status_code=404, detail="Comment not found")
+    return await response_cache.store_async("comment", c.id, make_etag(c.id, c.updated_at),
+                                             CommentRead.model_validate(c), c.project_id)
+
+@router.patch("/{comment_id}", response_model=CommentRead)
+async def patch_comment(comment_id: int, payload: CommentCreate, db: Annotated[AsyncSession, Depends(get_async_db)],
+                        me: Annotated[Principal, Depends(get_current_principal_async)]):
+    c = (await db.scalars(update(Comment).where(Comment.id == comment_id, Comment.author_id == me.id)
+                          .values(content=payload.content).returning(Comment))).first()
+    if c is None:
+        if not await db.get(Comment, comment_id):
+            raise HTTPException(status_code=404, detail="Comment not found")
+        raise HTTPException(status_code=403, detail="Not allowed")
+    await publish_async(db, c.project_id, "comment.updated", [c.id], issue_id=c.issue_id)
+    await db.commit()
+    await response_cache.invalidate_async("comment", c.id)
+    return c
+
+@router.delete("/{comment_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_comment(comment_id: int, db: Annotated[AsyncSession, Depends(get_async_db)],
+                         me: Annotated[Principal, Depends(get_current_principal_async)]):
+    c = await db.get(Comment, comment_id)
+    if not c:
+        raise HTTPException(status_code=404, detail="Comment not found")
+    if c.author_id != me.id:
+        raise HTTPException(status_code=403, detail="Now allowed")
+    await db.delete(c)
+    await publish_async(db, c.project_id, "comment.deleted", [c.id], issue_id=c.issue_id)
+    await db.commit()
+    await response_cache.invalidate_async("comment", comment_id)
+    return
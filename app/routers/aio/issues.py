@@ -0,0 +1,187 @@
+from typing import Annotated, Literal
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response, Body
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
+from app.db.session import get_async_db, get_async_read_db
+from app.db.errors import constraint_name, sqlstate, UNIQUE_VIOLATION
+from app.models.user import User
+from app.models.project import Project
+from app.models.issue import Issue, IssueStatus, IssuePriority
+from app.schemas.issue import IssueCreate, IssueRead, IssueUpdate, IssueBatchResult, IssueBulkUpdate, IssueBulkResult
+from app.schemas.issue import IssueExpanded, IssueInclude
+from app.deps import Principal, get_current_principal_async, get_token_user_id
+from app.core.pagination import keyset, split_page
+from app.services.stats import project_issue_total
+from app.core.counting import CountMode, COUNT_DESCRIPTION, total_count_async
+from app.core.etag import make_etag, list_etag, not_modified
+from app.core.response_cache import response_cache
+from app.core.events import publish_async
+from app.core.responses import schema_columns, rows_response
+from app.routers.issues import MAX_BATCH_ISSUES, plan_issue_batch, issue_batch_insert, issue_batch_results
+from app.routers.issues import ASSIGNEE_FKEY, issue_insert, issue_patch
+from app.routers.issues import issue_bulk_update, issue_bulk_results, issue_list_filters, issue_ids_by_project
+from app.routers.issues import INCLUDE_DESCRIPTION, issue_include_queries, embed_includes, expanded_response
+
+routerprojectissue = APIRouter(prefix="/projects", tags=["project_issues"])
+router = APIRouter(prefix="/issues", tags=["issues"])
+
+@routerprojectissue.post("/{project_id}/issues",response_model=IssueRead, status_code=status.HTTP_201_CREATED)
+async def create_issue(project_id: int, payload: IssueCreate, db: Annotated[AsyncSession, Depends(get_async_db)],
+                       me: Annotated[Principal, Depends(get_current_principal_async)]):
+    try:
+        issue = (await db.scalars(issue_insert(project_id, me.id, payload))).first()
+    except IntegrityError:
+        await db.rollback()
+        if not await db.get(Project, project_id):
+            raise HTTPException(status_code=404, detail="Project not found")
+        raise HTTPException(status_code=422, detail="Assignee not found")
+    if issue is None:
+        raise HTTPException(status_code=409, detail="The issue title is already taken")
+    await publish_async(db, project_id, "issue.created", [issue.id])
+    await db.commit()
+    return issue
+
+@routerprojectissue.post("/{project_id}/issues:batch", response_model=list[IssueBatchResult])
+async def create_issues_batch(project_id: int,
+                              payload: Annotated[list[IssueCreate], Body(min_length=1, max_length=MAX_BATCH_ISSUES)],
+                              db: Annotated[AsyncSession, Depends(get_async_db)],
+                              me: Annotated[Principal, Depends(get_current_principal_async)]):
+    if not await db.get(Project, project_id):
+        raise HTTPException(status_code=404, detail="Project not found")
+    assignees = {i.assignee_id for i in payload if i.assignee_id is not None}
+    known = set(await db.scalars(select(User.id).where(User.id.in_(assignees)))) if assignees else set()
+    pending, results = plan_issue_batch(payload, known)
+    created = (await db.scalars(issue_batch_insert(project_id, me.id, payload, pending))).all() if pending else []
+    if created:
+        await publish_async(db, project_id, "issue.created", [i.id for i in created])
+    await db.commit()
+    return issue_batch_results(len(payload), pending, results, created)
+@routerprojectissue.get("/{project_id}/issues",response_model=list[IssueExpanded],dependencies=[Depends(get_token_user_id)])
+async def list_project_issues(
+    project_id: int,
+    db: Annotated[AsyncSession, Depends(get_async_read_db)],
+    request: Request,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = Query(None, description="Opaque cursor from X-Next-Cursor"),
+    count: CountMode = Query("none", description=COUNT_DESCRIPTION),
+    q: str | None = Query(None, description="Filter by issue title (icontains)"),
+    status: list[IssueStatus] | None = Query(None, description="Filter by status (repeatable)"),
+    priority: list[IssuePriority] | None = Query(None, description="Filter by priority (repeatable)"),
+    assignee_id: int | None = Query(None, description="Filter by assignee"),
+    reporter_id: int | None = Query(None, description="Filter by reporter"),
+    sort_by: Literal["id", "title", "status", "priority", "created_at", "updated_at", "assignee_id", "reporter_id"] = "id",
+    sort_dir: Literal["asc", "desc"] = "asc",
+    include: list[IssueInclude] | None = Query(None, description=INCLUDE_DESCRIPTION),
+) -> list[IssueExpanded]:
+    if not await db.get(Project, project_id):
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    stmt = select(*schema_columns(Issue, IssueRead)).where(Issue.project_id == project_id,
+                                                           *issue_list_filters(q, status, priority, assignee_id, reporter_id))
+    if count != "none" and not q and reporter_id is None and db.get_bind().dialect.name == "postgresql":
+        total = await db.scalar(project_issue_total(project_id, status, priority, assignee_id))
+    else:
+        total = await total_count_async(db, stmt, count)
+    stmt = keyset(stmt, Issue, sort_by, sort_dir, cursor)
+    rows = (await db.execute(stmt.offset(skip).limit(limit + 1))).all()
+    issues, next_cursor = split_page(rows, limit, sort_by, sort_dir)
+    etag = list_etag(request, issues, next_cursor, total)
+    if not include and (unchanged := not_modified(request, etag)):
+        return unchanged
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if total is not None:
+        response.headers["X-Total-Count"] = str(total)
+    if include:
+        items = [row._asdict() for row in issues]
+        results = {name: (await db.execute(include_stmt)).all()
+                   for name, include_stmt in issue_include_queries(set(include), items).items()}
+        embed_includes(set(include), items, results)
+        return expanded_response(request, items, etag, response.headers)
+    response.headers["ETag"] = etag
+    return rows_response(issues, response.headers)
+
+@router.patch(":bulk", response_model=list[IssueBulkResult])
+async def bulk_update_issues(payload: IssueBulkUpdate, db: Annotated[AsyncSession, Depends(get_async_db)],
+                             me: Annotated[Principal, Depends(get_current_principal_async)]):
+    if payload.changes.assignee_id is not None and not await db.get(User, payload.changes.assignee_id):
+        raise HTTPException(status_code=422, detail="Assignee not found")
+    rows = (await db.execute(issue_bulk_update(payload, me.id))).all()
+    updated = {r.id for r in rows}
+    existing = set()
+    if payload.ids is not None and len(updated) < len(payload.ids):
+        missing = set(payload.ids) - updated
+        existing = set(await db.scalars(select(Issue.id).where(Issue.id.in_(missing))))
+    for project_id, ids in issue_ids_by_project(rows).items():
+        await publish_async(db, project_id, "issue.updated", ids)
+    await db.commit()
+    await response_cache.invalidate_async("issue", *updated)
+    return issue_bulk_results(payload, updated, existing)
+
+@router.get("/{issue_id}", response_model=IssueExpanded)
+async def get_issue(issue_id: int, db: Annotated[AsyncSession, Depends(get_async_read_db)], request: Request,
+                    include: list[IssueInclude] | None = Query(None, description=INCLUDE_DESCRIPTION)):
+    if include:
+        row = (await db.execute(select(*schema_columns(Issue, IssueRead)).where(Issue.id == issue_id))).first()
+        if not row:
+            raise HTTPException(status_code=404, detail="Issue not found")
+        item = row._asdict()
+        results = {name: (await db.execute(include_stmt)).all()
+                   for name, include_stmt in issue_include_queries(set(include), [item]).items()}
+        embed_includes(set(include), [item], results)
+        return expanded_response(request, item, make_etag(row.id, row.updated_at))
+    if cached := await response_cache.respond_async(request, "issue", issue_id):
+        return cached
+    if request.headers.get("if-none-match"):
+        version = (await db.execute(select(Issue.id, Issue.updated_at).where(Issue.id == issue_id))).first()
+        if version and (unchanged := not_modified(request, make_etag(*version))):
+            return unchanged
+    i = await db.get(Issue, issue_id)
+    if not i:
+        raise HTTPException(status_code=404, detail="Issue not found")
+    return await response_cache.store_async("issue", i.id, make_etag(i.id, i.updated_at), IssueRead.model_validate(i),
+                                            i.project_id)
+
+@router.patch("/{issue_id}", response_model=IssueRead)
+async def patch_issue(issue_id: int, payload: IssueUpdate, db: Annotated[AsyncSession, Depends(get_async_db)],
+                      me: Annotated[Principal, Depends(get_current_principal_async)]):
+    changes = payload.model_dump(exclude_none=True)
+    try:
+        i = (await db.scalars(issue_patch(issue_id, me.id, changes))).first() if changes else None
+    except IntegrityError as e:
+        await db.rollback()
+        if sqlstate(e) == UNIQUE_VIOLATION:
+            raise HTTPException(status_code=409, detail="Issue title already exists in this project")
+        if constraint_name(e) == ASSIGNEE_FKEY:
+            raise HTTPException(status_code=422, detail="Assignee not found")
+        raise
+    if i is None:
+        i = await db.get(Issue, issue_id)
+        if not i:
+            raise HTTPException(status_code=404, detail="Issue not found")
+        if i.reporter_id != me.id or changes:
+            raise HTTPException(status_code=403, detail="Now allowed")
+        return i
+    await publish_async(db, i.project_id, "issue.updated", [i.id])
+    await db.commit()
+    await response_cache.invalidate_async("issue", i.id)
+    return i
+
+@router.delete("/{issue_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_issue(issue_id: int, db: Annotated[AsyncSession, Depends(get_async_db)],
+                       me: Annotated[Principal, Depends(get_current_principal_async)]):
+    i = await db.get(Issue, issue_id)
+    if not i:
+        raise HTTPException(status_code=404, detail="Issue not found")
+    if i.reporter_id != me.id:
+        raise HTTPException(status_code=403, detail="Now allowed")
+    project_id = i.project_id
+    await db.delete(i)
+    await publish_async(db, project_id, "issue.deleted", [issue_id])
+    await db.commit()
+    # the issue's comments went with it
+    await response_cache.invalidate_generation_async(project_id)
+    return
@@ -0,0 +1,104 @@
+from typing import Annotated, Literal
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_async_db, get_async_read_db
+from app.models.project import Project
+from app.schemas.project import ProjectRead, ProjectCreate
+from app.deps import Principal, get_current_principal_async, get_token_user_id
+from app.core.pagination import keyset, split_page
+from app.core.counting import CountMode, COUNT_DESCRIPTION, total_count_async
+from app.core.etag import make_etag, not_modified
+from app.core.response_cache import response_cache
+from app.core.events import publish_async
+from app.schemas.stats import ProjectStats
+from app.services.stats import STATS_ROWS, summarize_stats
+from app.schemas.changes import ChangeFeed
+from app.services.changes import SETTLED_BEFORE, decode_changes_cursor, change_queries, merge_changes
+from app.core.responses import encode
+
+router = APIRouter(prefix="/projects", tags=["projects"])
+
+@router.post("",response_model=ProjectRead, status_code=status.HTTP_201_CREATED)
+async def create_project(payload: ProjectCreate, db: Annotated[AsyncSession, Depends(get_async_db)],
+                         me: Annotated[Principal, Depends(get_current_principal_async)]):
+    project = (await db.scalars(insert(Project).values(name=payload.name, desc=payload.desc, owner_id=me.id)
+                                .on_conflict_do_nothing(constraint="uq_projects_owner_name")
+                                .returning(Project))).first()
+    if project is None:
+        raise HTTPException(status_code=409, detail="The project name is already taken")
+    await db.commit()
+    return project
+
+@router.get("", response_model=list[ProjectRead], dependencies=[Depends(get_token_user_id)])
+async def list_projects(db: Annotated[AsyncSession, Depends(get_async_read_db)],
+                        response: Response,
+                        skip: int = Query(0, ge=0),
+                        limit: int = Query(50, ge=1, le=100),
+                        cursor: str | None = Query(None, description="Opaque cursor from X-Next-Cursor"),
+                        count: CountMode = Query("none", description=COUNT_DESCRIPTION),
+                        q: str | None = Query(None, description="Filter by name (icontains)"),
+                        sort_by: Literal["id", "name", "owner_id"] = "id",
+                        sort_dir: Literal["asc", "desc"] = "asc") -> list[ProjectRead]:
+    stmt = select(Project)
+    if q:
+        stmt = stmt.where(Project.name.ilike(f"%{q}%"))
+    total = await total_count_async(db, stmt, count)
+    stmt = keyset(stmt, Project, sort_by, sort_dir, cursor)
+    rows = (await db.scalars(stmt.offset(skip).limit(limit + 1))).all()
+    projects, next_cursor = split_page(rows, limit, sort_by, sort_dir)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if total is not None:
+        response.headers["X-Total-Count"] = str(total)
+    return projects
+
+@router.get("/{project_id}", response_model=ProjectRead)
+async def get_one_project(project_id: int, db: Annotated[AsyncSession, Depends(get_async_read_db)], request: Request):
+    if cached := await response_cache.respond_async(request, "project", project_id):
+        return cached
+    if request.headers.get("if-none-match"):
+        version = (await db.execute(select(Project.id, Project.created_at).where(Project.id == project_id))).first()
+        if version and (unchanged := not_modified(request, make_etag(*version))):
+            return unchanged
+    p = await db.get(Project, project_id)
+    if not p:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return await response_cache.store_async("project", p.id,
+                                             make_etag(p.id, p.created_at), ProjectRead.model_validate(p))
+
+@router.get("/{project_id}/stats", response_model=ProjectStats)
+async def get_project_stats(project_id: int, db: Annotated[AsyncSession, Depends(get_async_read_db)]):
+    if not await db.get(Project, project_id):
+        raise HTTPException(status_code=404, detail="Project not found")
+    return summarize_stats(project_id, (await db.execute(STATS_ROWS, {"project_id": project_id})).all())
+
+@router.get("/{project_id}/changes", response_model=ChangeFeed, dependencies=[Depends(get_token_user_id)])
+async def list_project_changes(project_id: int, db: Annotated[AsyncSession, Depends(get_async_db)],
+                               since: str | None = Query(None, description="Cursor from a previous response; omit for a full sync"),
+                               limit: int = Query(500, ge=1, le=1000)):
+    positions, as_of = decode_changes_cursor(since)
+    if not await db.get(Project, project_id):
+        raise HTTPException(status_code=404, detail="Project not found")
+    settled_before = None
+    if db.get_bind().dialect.name == "postgresql":
+        settled_before = await db.scalar(SETTLED_BEFORE)
+    results = {source: (await db.execute(stmt)).all()
+               for source, stmt in change_queries(project_id, positions, settled_before, limit).items()}
+    page = merge_changes(positions, results, limit, settled_before, as_of)
+    return Response(encode(page), media_type="application/json")
+
+@router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_project(project_id: int, db: Annotated[AsyncSession, Depends(get_async_db)],
+                         user: Annotated[Principal, Depends(get_current_principal_async)]):
+    p = await db.get(Project, project_id)
+    if not p:
+        raise HTTPException(status_code=404, detail="Project not found")
+    if p.owner_id != user.id:
+        raise HTTPException(status_code=403, detail="Only project owner can delete a project")
+    await db.delete(p)
+    await publish_async(db, project_id, "project.deleted")
+    await db.commit()
+    await response_cache.invalidate_project_async(project_id)
+    return
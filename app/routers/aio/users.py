@@ -0,0 +1,91 @@
+from typing import Annotated, Literal
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_async_db, get_async_read_db
+from app.models.user import User
+from app.models.issue import IssueStatus, IssuePriority
+from app.schemas.user import UserRead
+from app.schemas.issue import IssueRead
+from app.deps import Principal, get_current_user_async, get_current_principal_async, get_token_user_id, principal_cache
+from app.core.security import verify_pw_async, hash_pw_async
+from app.core.pagination import keyset, split_page
+from app.core.counting import CountMode, COUNT_DESCRIPTION, total_count_async
+from app.core.etag import make_etag
+from app.core.response_cache import response_cache
+from app.core.responses import rows_response
+from app.routers.users import PasswordChange, IssueRole, my_issues_query
+
+router = APIRouter(prefix="/users", tags=["users"])
+
+@router.get("/me", response_model=UserRead)
+async def get_me(current: Annotated[Principal, Depends(get_current_principal_async)]) -> UserRead:
+    return current
+
+@router.post("/me/change-password", status_code=status.HTTP_204_NO_CONTENT)
+async def change_password(
+    payload: PasswordChange,
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+    current: Annotated[User, Depends(get_current_user_async)],
+) -> None:
+    if not await verify_pw_async(payload.old_password, current.password_hash):
+        raise HTTPException(status_code=400, detail="Old password is incorrect")
+    current.password_hash = await hash_pw_async(payload.new_password)
+    db.add(current)
+    await db.commit()
+    principal_cache.pop(current.id)
+    return
+
+@router.get("/me/issues", response_model=list[IssueRead])
+async def list_my_issues(db: Annotated[AsyncSession, Depends(get_async_read_db)],
+                         uid: Annotated[int, Depends(get_token_user_id)],
+                         response: Response,
+                         limit: int = Query(50, ge=1, le=200),
+                         cursor: str | None = Query(None, description="Opaque cursor from X-Next-Cursor"),
+                         role: IssueRole | None = Query(None, description="Only issues assigned to or reported by me (default: both)"),
+                         status: list[IssueStatus] | None = Query(None, description="Filter by status (repeatable)"),
+                         priority: list[IssuePriority] | None = Query(None, description="Filter by priority (repeatable)"),
+                         sort_dir: Literal["asc", "desc"] = "desc") -> list[IssueRead]:
+    rows = (await db.execute(my_issues_query(uid, role, status, priority, sort_dir, cursor, limit))).all()
+    issues, next_cursor = split_page(rows, limit, "updated_at", sort_dir)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return rows_response(issues, response.headers)
+
+@router.get("/", response_model=list[UserRead], dependencies=[Depends(get_token_user_id)])
+async def list_users(db: Annotated[AsyncSession, Depends(get_async_read_db)],
+                     response: Response,
+                     skip: int = Query(0, ge=0),
+                     limit: int = Query(50, ge=1, le=200),
+                     cursor: str | None = Query(None, description="Opaque cursor from X-Next-Cursor"),
+                     count: CountMode = Query("none", description=COUNT_DESCRIPTION),
+                     q: str | None = Query(None, description="Filter by username (icontains)"),
+                     sort_by: Literal["id", "username", "created_at"] = "id",
+                     sort_dir: Literal["asc", "desc"] = "asc") -> list[UserRead]:
+    stmt = select(User)
+    if q:
+        stmt = stmt.where(User.username.ilike(f"%{q}%"))
+    total = await total_count_async(db, stmt, count)
+    stmt = keyset(stmt, User, sort_by, sort_dir, cursor)
+    rows = (await db.scalars(stmt.offset(skip).limit(limit + 1))).all()
+    users, next_cursor = split_page(rows, limit, sort_by, sort_dir)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if total is not None:
+        response.headers["X-Total-Count"] = str(total)
+    return users
+
+
+@router.get("/{user_id}", response_model=UserRead, dependencies=[Depends(get_token_user_id)])
+async def get_user(
+    user_id: int,
+    db: Annotated[AsyncSession, Depends(get_async_read_db)],
+    request: Request,
+):
+    if cached := await response_cache.respond_async(request, "user", user_id):
+        return cached
+    user = await db.get(User, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return await response_cache.store_async("user", user.id,
+                                             make_etag(user.id, user.created_at), UserRead.model_validate(user))
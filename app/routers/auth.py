@@ -1,5 +1,6 @@
 from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
@@ -12,17 +13,12 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 
 @router.post("/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
 def register(payload: UserCreate, db: Annotated[Session, Depends(get_db)]):
-    exists = db.query(User).filter(User.username == payload.username).first()
-    if exists:
+    user = db.scalars(insert(User).values(username=payload.username, password_hash=hash_pw(payload.password))
+                      .on_conflict_do_nothing(index_elements=[User.username])
+                      .returning(User)).first()
+    if user is None:
         raise HTTPException(status_code=409, detail="Username already registered")
-
-    user = User(
-        username=payload.username,
-        password_hash=hash_pw(payload.password),
-    )
-    db.add(user)
     db.commit()
-    db.refresh(user)
     return user
 
 @router.post("/login", response_model=TokenResponse)
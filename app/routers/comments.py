@@ -1,73 +1,103 @@
 from typing import Annotated, Literal
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
-from sqlalchemy import asc, desc
-from app.db.session import get_db
-from app.models.user import User
+from app.db.session import get_db, get_read_db
 from app.models.comment import Comment
 from app.models.issue import Issue
 
 from app.schemas.comment import CommentCreate, CommentRead
-from app.deps import get_current_user
+from app.deps import Principal, get_current_principal, get_token_user_id
+from app.core.pagination import keyset, split_page
+from app.core.counting import CountMode, COUNT_DESCRIPTION, total_count
+from app.core.etag import make_etag, list_etag, not_modified
+from app.core.response_cache import response_cache
+from app.core.events import publish
+from app.core.responses import schema_columns, rows_response
 
 router = APIRouter(prefix="/comments", tags=["comments"])
 routerissuecomment = APIRouter(prefix="/issues", tags=["issue_comments"])
 
 @routerissuecomment.post("/{issue_id}/comments", response_model=CommentRead, status_code= status.HTTP_201_CREATED)
 def create_comment(issue_id: int, payload: CommentCreate, db: Annotated[Session, Depends(get_db)],
-                 me: Annotated[User, Depends(get_current_user)]):
-    if not db.get(Issue, issue_id):
+                 me: Annotated[Principal, Depends(get_current_principal)]):
+    issue = db.get(Issue, issue_id)
+    if not issue:
         raise HTTPException(status_code=404, detail="Issue not found")
-    comment = Comment(content = payload.content, issue_id = issue_id, author_id = me.id)
-    db.add(comment); db.commit(); db.refresh(comment)
+    comment = Comment(content = payload.content, issue_id = issue_id, author_id = me.id, project_id = issue.project_id)
+    db.add(comment); db.flush()
+    publish(db, issue.project_id, "comment.created", [comment.id], issue_id=issue_id)
+    db.commit(); db.refresh(comment)
     return comment
 
-@routerissuecomment.get("/{issue_id}/comments", response_model = list[CommentRead],dependencies=[Depends(get_current_user)])
-def list_comments(issue_id: int, db: Annotated[Session, Depends(get_db),],
+@routerissuecomment.get("/{issue_id}/comments", response_model = list[CommentRead],dependencies=[Depends(get_token_user_id)])
+def list_comments(issue_id: int, db: Annotated[Session, Depends(get_read_db),],
+                  request: Request,
+                  response: Response,
                   skip: int = Query(0, ge=0),
                   limit: int = Query(50, ge=1, le=200),
+                  cursor: str | None = Query(None, description="Opaque cursor from X-Next-Cursor"),
+                  count: CountMode = Query("none", description=COUNT_DESCRIPTION),
                   q: str | None = Query(None, description="Filter by comment content (icontains)"),
                   sort_by: Literal["id", "content", "issue_id", "author_id", "created_at", "updated_at"] = "id",
                   sort_dir: Literal["asc", "desc"] = "asc"
 ) -> list[CommentRead]:
     if not db.get(Issue, issue_id):
         raise HTTPException(status_code=404, detail="Issue not found")
-    query = db.query(Comment).filter(Comment.issue_id == issue_id)
+    query = db.query(*schema_columns(Comment, CommentRead)).filter(Comment.issue_id == issue_id)
     if q:
         query = query.filter(Comment.content.ilike(f"%{q}%"))
-    col = getattr(Comment, sort_by)
-    order = asc(col) if sort_dir == "asc" else desc(col)
-    query = query.order_by(order)
-    comments = query.offset(skip).limit(limit).all()
-    return comments
+    total = total_count(db, query.statement, count)
+    query = keyset(query, Comment, sort_by, sort_dir, cursor)
+    comments, next_cursor = split_page(query.offset(skip).limit(limit + 1).all(), limit, sort_by, sort_dir)
+    etag = list_etag(request, comments, next_cursor, total)
+    if unchanged := not_modified(request, etag):
+        return unchanged
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if total is not None:
+        response.headers["X-Total-Count"] = str(total)
+    response.headers["ETag"] = etag
+    return rows_response(comments, response.headers)
 
 @router.get("/{comment_id}", response_model = CommentRead)
-def get_one_comment(comment_id: int, db: Annotated[Session, Depends(get_db)]):
+def get_one_comment(comment_id: int, db: Annotated[Session, Depends(get_read_db)], request: Request):
+    if cached := response_cache.respond(request, "comment", comment_id):
+        return cached
+    if request.headers.get("if-none-match"):
+        version = db.execute(select(Comment.id, Comment.updated_at).where(Comment.id == comment_id)).first()
+        if version and (unchanged := not_modified(request, make_etag(*version))):
+            return unchanged
     c = db.get(Comment, comment_id)
     if not c:
         raise HTTPException(status_code=404, detail="Comment not found")
-    return c
+    return response_cache.store("comment", c.id, make_etag(c.id, c.updated_at), CommentRead.model_validate(c),
+                                c.project_id)
 
 @router.patch("/{comment_id}", response_model=CommentRead)
 def patch_comment(comment_id: int, payload: CommentCreate, db: Annotated[Session, Depends(get_db)],
-                me: Annotated[User, Depends(get_current_user)]):
-    c = db.get(Comment, comment_id)
-    if not c:
-        raise HTTPException(status_code=404, detail="Comment not found")
-    if c.author_id != me.id:
+                me: Annotated[Principal, Depends(get_current_principal)]):
+    c = db.scalars(update(Comment).where(Comment.id == comment_id, Comment.author_id == me.id)
+                   .values(content=payload.content).returning(Comment)).first()
+    if c is None:
+        if not db.get(Comment, comment_id):
+            raise HTTPException(status_code=404, detail="Comment not found")
         raise HTTPException(status_code=403, detail="Not allowed")
-    c.content = payload.content
-    db.add(c); db.commit(); db.refresh(c)
+    publish(db, c.project_id, "comment.updated", [c.id], issue_id=c.issue_id)
+    db.commit()
+    response_cache.invalidate("comment", c.id)
     return c
 
 @router.delete("/{comment_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_comment(comment_id: int, db: Annotated[Session, Depends(get_db)],
-                 me: Annotated[User, Depends(get_current_user)]):
+                 me: Annotated[Principal, Depends(get_current_principal)]):
     c = db.get(Comment, comment_id)
     if not c:
         raise HTTPException(status_code=404, detail="Comment not found")
     if c.author_id != me.id:
         raise HTTPException(status_code=403, detail="Now allowed")
     db.delete(c)
+    publish(db, c.project_id, "comment.deleted", [c.id], issue_id=c.issue_id)
     db.commit()
+    response_cache.invalidate("comment", comment_id)
     return
\ No newline at end of file
@@ -0,0 +1,25 @@
+from typing import Annotated
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_async_db
+from app.models.project import Project
+from app.deps import get_token_user_id
+from app.core.events import EventBroker, event_stream, get_event_broker
+
+router = APIRouter(prefix="/projects", tags=["events"])
+
+@router.get("/{project_id}/events", dependencies=[Depends(get_token_user_id)],
+            response_class=StreamingResponse, responses={200: {"content": {"text/event-stream": {}}}})
+async def project_events(project_id: int, db: Annotated[AsyncSession, Depends(get_async_db)],
+                         broker: Annotated[EventBroker, Depends(get_event_broker)]):
+    if not await db.get(Project, project_id):
+        raise HTTPException(status_code=404, detail="Project not found")
+    # the stream lasts as long as the client stays, so it must not keep a pooled connection
+    await db.close()
+    try:
+        await broker.ensure_listening()
+    except TimeoutError:
+        raise HTTPException(status_code=503, detail="Event stream unavailable")
+    return StreamingResponse(event_stream(broker, project_id), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
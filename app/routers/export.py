@@ -0,0 +1,79 @@
+import csv
+import io
+import json
+from typing import Annotated, Iterator, Literal
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app.db.session import get_read_db
+from app.models.project import Project
+from app.models.issue import Issue
+from app.models.comment import Comment
+from app.schemas.issue import IssueRead
+from app.schemas.comment import CommentRead
+from app.deps import get_token_user_id
+
+router = APIRouter(prefix="/projects", tags=["export"])
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_COLUMNS = ["type", "id", "issue_id", "project_id", "title", "desc", "status", "priority",
+                  "reporter_id", "assignee_id", "author_id", "content", "created_at", "updated_at"]
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+def _records(bind: Engine, project_id: int, include_comments: bool) -> Iterator[list[dict]]:
+    """Yield batches of export records, read through server-side cursors in one snapshot."""
+    issue_cols = [Issue.__table__.c[f] for f in IssueRead.model_fields]
+    comment_cols = [Comment.__table__.c[f] for f in CommentRead.model_fields]
+    with bind.connect() as conn:
+        conn = conn.execution_options(isolation_level="REPEATABLE READ", stream_results=True,
+                                      yield_per=EXPORT_BATCH_SIZE)
+        issues = conn.execute(select(*issue_cols).where(Issue.project_id == project_id).order_by(Issue.id))
+        for rows in issues.partitions():
+            yield [{"type": "issue", **IssueRead.model_validate(r, from_attributes=True).model_dump(mode="json")}
+                   for r in rows]
+        if include_comments:
+            comments = conn.execute(
+                select(*comment_cols)
+                .join(Issue, Issue.id == Comment.issue_id)
+                .where(Issue.project_id == project_id)
+                .order_by(Comment.issue_id, Comment.id)
+            )
+            for rows in comments.partitions():
+                yield [{"type": "comment", "project_id": project_id,
+                        **CommentRead.model_validate(r, from_attributes=True).model_dump(mode="json")}
+                       for r in rows]
+
+def _ndjson(batches: Iterator[list[dict]]) -> Iterator[str]:
+    for batch in batches:
+        yield "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in batch)
+
+def _csv(batches: Iterator[list[dict]]) -> Iterator[str]:
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=EXPORT_COLUMNS, extrasaction="ignore")
+    writer.writeheader()
+    for batch in batches:
+        writer.writerows(batch)
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue()
+
+@router.get("/{project_id}/export", dependencies=[Depends(get_token_user_id)],
+            response_class=StreamingResponse,
+            responses={200: {"content": {media: {} for media in MEDIA_TYPES.values()}}})
+def export_project(project_id: int, db: Annotated[Session, Depends(get_read_db)],
+                   format: Literal["ndjson", "csv"] = "ndjson",
+                   include_comments: bool = Query(False)):
+    if not db.get(Project, project_id):
+        raise HTTPException(status_code=404, detail="Project not found")
+    # the stream outlives the request's session, so it reads on its own connection
+    batches = _records(db.get_bind(), project_id, include_comments)
+    body = _ndjson(batches) if format == "ndjson" else _csv(batches)
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="project-{project_id}.{format}"'},
+    )
@@ -0,0 +1,46 @@
+import io
+import tempfile
+from typing import Annotated, Literal
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from app.db.session import get_db
+from app.models.project import Project
+from app.schemas.imports import ImportReport
+from app.services.importer import import_issues
+from app.deps import Principal, get_current_principal
+from app.core.response_cache import response_cache
+from app.core.events import publish
+
+router = APIRouter(prefix="/projects", tags=["import"])
+
+SPOOL_MAX_MEMORY = 8 * 1024 * 1024
+
+@router.post("/{project_id}/import", response_model=ImportReport,
+             openapi_extra={"requestBody": {"content": {"application/x-ndjson": {}, "text/csv": {}}, "required": True}})
+async def import_project(project_id: int, request: Request,
+                         db: Annotated[Session, Depends(get_db)],
+                         me: Annotated[Principal, Depends(get_current_principal)],
+                         format: Literal["ndjson", "csv"] = "ndjson",
+                         on_conflict: Literal["skip", "update"] = "skip") -> ImportReport:
+    p = await run_in_threadpool(db.get, Project, project_id)
+    if not p:
+        raise HTTPException(status_code=404, detail="Project not found")
+    if p.owner_id != me.id:
+        raise HTTPException(status_code=403, detail="Only project owner can import into a project")
+    # spool the upload so the COPY can read it from a worker thread at its own pace
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY) as spool:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+        lines = io.TextIOWrapper(spool, encoding="utf-8", newline="")
+        report = await run_in_threadpool(import_issues, db.get_bind(), project_id, me.id, lines, format, on_conflict)
+    if report.issues_updated:
+        await response_cache.invalidate_project_async(project_id)
+    if report.issues_created or report.issues_updated or report.comments_created:
+        # too many rows for individual events; subscribers catch up from the changes feed
+        def announce():
+            publish(db, project_id, "resync")
+            db.commit()
+        await run_in_threadpool(announce)
+    return report
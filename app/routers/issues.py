@@ -1,98 +1,317 @@
 from typing import Annotated, Literal
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response, Body
 from sqlalchemy.orm import Session
-from sqlalchemy import asc, desc
-from app.db.session import get_db
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import select, update, func
+from sqlalchemy.dialects.postgresql import insert
+from app.db.session import get_db, get_read_db
+from app.db.errors import constraint_name, sqlstate, UNIQUE_VIOLATION
 from app.models.user import User
 from app.models.project import Project
-from app.models.issue import Issue
-from app.schemas.issue import IssueCreate, IssueRead, IssueUpdate
-from app.deps import get_current_user
+from app.models.issue import Issue, IssueStatus, IssuePriority
+from app.models.comment import Comment
+from app.schemas.issue import IssueCreate, IssueRead, IssueUpdate, IssueBatchResult, IssueBulkUpdate, IssueBulkResult
+from app.schemas.issue import IssueExpanded, IssueInclude
+from app.schemas.user import UserRead
+from app.schemas.comment import CommentRead
+from app.deps import Principal, get_current_principal, get_token_user_id
+from app.core.pagination import keyset, split_page
+from app.services.stats import project_issue_total
+from app.core.counting import CountMode, COUNT_DESCRIPTION, total_count
+from app.core.etag import make_etag, list_etag, not_modified
+from app.core.response_cache import response_cache
+from app.core.events import publish
+from app.core.responses import schema_columns, rows_response, encode
 
 routerprojectissue = APIRouter(prefix="/projects", tags=["project_issues"])
 router = APIRouter(prefix="/issues", tags=["issues"])
 
+MAX_BATCH_ISSUES = 1000
+ASSIGNEE_FKEY = "issues_assignee_id_fkey"
+INCLUDE_DESCRIPTION = "Embed related data (repeatable): reporter, assignee, comment_count, latest_comment"
+
+def issue_insert(project_id: int, reporter_id: int, payload: IssueCreate):
+    """Create in one statement; no row comes back when the title is taken in the project."""
+    return (insert(Issue).values(project_id=project_id, reporter_id=reporter_id, **payload.model_dump())
+            .on_conflict_do_nothing(constraint="uq_title_name_project_id")
+            .returning(Issue))
+
+def issue_patch(issue_id: int, reporter_id: int, changes: dict):
+    """Update in one statement; no row comes back unless the issue exists and the caller reported it."""
+    return (update(Issue).where(Issue.id == issue_id, Issue.reporter_id == reporter_id)
+            .values(**changes)
+            .returning(Issue))
+
+def plan_issue_batch(items: list[IssueCreate], known_assignees: set[int]) -> tuple[dict[str, int], dict[int, IssueBatchResult]]:
+    """Pick the items to insert (first occurrence of each title, by index) and settle the rest up front."""
+    pending, results = {}, {}
+    for n, item in enumerate(items):
+        if item.assignee_id is not None and item.assignee_id not in known_assignees:
+            results[n] = IssueBatchResult(index=n, status="invalid_assignee", detail="Assignee not found")
+        elif item.title in pending:
+            results[n] = IssueBatchResult(index=n, status="conflict", detail="Duplicate title in this batch")
+        else:
+            pending[item.title] = n
+    return pending, results
+
+def issue_batch_insert(project_id: int, reporter_id: int, items: list[IssueCreate], pending: dict[str, int]):
+    rows = [dict(title=items[n].title, desc=items[n].desc, status=items[n].status, priority=items[n].priority,
+                 project_id=project_id, reporter_id=reporter_id, assignee_id=items[n].assignee_id)
+            for n in pending.values()]
+    return (insert(Issue).values(rows)
+            .on_conflict_do_nothing(constraint="uq_title_name_project_id")
+            .returning(Issue))
+
+def issue_batch_results(count: int, pending: dict[str, int], results: dict[int, IssueBatchResult],
+                        created: list[Issue]) -> list[IssueBatchResult]:
+    by_title = {i.title: i for i in created}
+    for title, n in pending.items():
+        if title in by_title:
+            results[n] = IssueBatchResult(index=n, status="created", issue=IssueRead.model_validate(by_title[title]))
+        else:
+            results[n] = IssueBatchResult(index=n, status="conflict", detail="The issue title is already taken")
+    return [results[n] for n in range(count)]
+
+def issue_list_filters(q: str | None, status: list[IssueStatus] | None, priority: list[IssuePriority] | None,
+                       assignee_id: int | None, reporter_id: int | None) -> list:
+    clauses = []
+    if q:
+        clauses.append(Issue.title.ilike(f"%{q}%"))
+    if status:
+        clauses.append(Issue.status.in_(status))
+    if priority:
+        clauses.append(Issue.priority.in_(priority))
+    if assignee_id is not None:
+        clauses.append(Issue.assignee_id == assignee_id)
+    if reporter_id is not None:
+        clauses.append(Issue.reporter_id == reporter_id)
+    return clauses
+
+def issue_include_queries(include: set[str], issues: list[dict]) -> dict:
+    """One set-based query per kind of included data, however many issues there are."""
+    ids = [i["id"] for i in issues]
+    user_ids = set()
+    if "reporter" in include:
+        user_ids |= {i["reporter_id"] for i in issues}
+    if "assignee" in include:
+        user_ids |= {i["assignee_id"] for i in issues if i["assignee_id"] is not None}
+    queries = {}
+    if user_ids:
+        queries["users"] = select(*schema_columns(User, UserRead)).where(User.id.in_(user_ids))
+    if ids and "comment_count" in include:
+        queries["comment_count"] = (select(Comment.issue_id, func.count()).where(Comment.issue_id.in_(ids))
+                                    .group_by(Comment.issue_id))
+    if ids and "latest_comment" in include:
+        # one probe of ix_comments_issue_id_created_at_id per issue instead of ranking whole threads
+        latest = (select(Comment.id).where(Comment.issue_id == Issue.id)
+                  .order_by(Comment.created_at.desc(), Comment.id.desc()).limit(1)
+                  .correlate(Issue).scalar_subquery())
+        queries["latest_comment"] = (select(*schema_columns(Comment, CommentRead))
+                                     .where(Comment.id.in_(select(latest).where(Issue.id.in_(ids)))))
+    return queries
+
+def embed_includes(include: set[str], issues: list[dict], results: dict[str, list]) -> None:
+    users = {u.id: u._asdict() for u in results.get("users", [])}
+    counts = dict(results.get("comment_count", []))
+    latest = {c.issue_id: c._asdict() for c in results.get("latest_comment", [])}
+    for i in issues:
+        if "reporter" in include:
+            i["reporter"] = users.get(i["reporter_id"])
+        if "assignee" in include:
+            i["assignee"] = users.get(i["assignee_id"])
+        if "comment_count" in include:
+            i["comment_count"] = counts.get(i["id"], 0)
+        if "latest_comment" in include:
+            i["latest_comment"] = latest.get(i["id"])
+
+def expanded_response(request: Request, content, etag: str, headers=None) -> Response:
+    """Encode issues with their includes; the ETag also covers the included data, which the issue versions don't."""
+    body = encode(content)
+    etag = make_etag(etag, body)
+    if unchanged := not_modified(request, etag):
+        return unchanged
+    response = Response(body, media_type="application/json", headers=headers)
+    response.headers["ETag"] = etag
+    return response
+
+def issue_bulk_update(payload: IssueBulkUpdate, reporter_id: int):
+    """One set-based UPDATE over the targeted issues the caller reported, returning the ids (and projects) it touched."""
+    stmt = update(Issue).where(Issue.reporter_id == reporter_id)
+    if payload.ids is not None:
+        stmt = stmt.where(Issue.id.in_(payload.ids))
+    else:
+        for field, value in payload.filter.model_dump(exclude_none=True).items():
+            stmt = stmt.where(getattr(Issue, field) == value)
+    return (stmt.values(**payload.changes.model_dump(exclude_none=True))
+            .returning(Issue.id, Issue.project_id)
+            .execution_options(synchronize_session=False))
+
+def issue_ids_by_project(rows) -> dict[int, list[int]]:
+    by_project: dict[int, list[int]] = {}
+    for row in rows:
+        by_project.setdefault(row.project_id, []).append(row.id)
+    return by_project
+
+def issue_bulk_results(payload: IssueBulkUpdate, updated: set[int], existing: set[int]) -> list[IssueBulkResult]:
+    if payload.ids is None:
+        return [IssueBulkResult(id=i, status="updated") for i in sorted(updated)]
+    return [IssueBulkResult(id=i, status="updated" if i in updated else "forbidden" if i in existing else "not_found")
+            for i in dict.fromkeys(payload.ids)]
+
 @routerprojectissue.post("/{project_id}/issues",response_model=IssueRead, status_code=status.HTTP_201_CREATED)
 def create_issue(project_id: int, payload: IssueCreate, db: Annotated[Session, Depends(get_db)],
-                 me: Annotated[User, Depends(get_current_user)]):
-    if not db.get(Project, project_id):
-        raise HTTPException(status_code=404, detail="Project not found")
-    exists = (db.query(Issue).filter(Issue.title == payload.title, Issue.project_id == project_id).first())
-    if exists:
+                 me: Annotated[Principal, Depends(get_current_principal)]):
+    try:
+        issue = db.scalars(issue_insert(project_id, me.id, payload)).first()
+    except IntegrityError:
+        # the title conflict is absorbed by ON CONFLICT, so this is a dangling project or assignee
+        db.rollback()
+        if not db.get(Project, project_id):
+            raise HTTPException(status_code=404, detail="Project not found")
+        raise HTTPException(status_code=422, detail="Assignee not found")
+    if issue is None:
         raise HTTPException(status_code=409, detail="The issue title is already taken")
-    issue = Issue(title = payload.title, desc = payload.desc, status = payload.status, priority = payload.priority,
-                  project_id = project_id, reporter_id = me.id, assignee_id = payload.assignee_id)
-    db.add(issue);db.commit();db.refresh(issue)
+    publish(db, project_id, "issue.created", [issue.id])
+    db.commit()
     return issue
-@routerprojectissue.get("/{project_id}/issues",response_model=list[IssueRead],dependencies=[Depends(get_current_user)])
+
+@routerprojectissue.post("/{project_id}/issues:batch", response_model=list[IssueBatchResult])
+def create_issues_batch(project_id: int,
+                        payload: Annotated[list[IssueCreate], Body(min_length=1, max_length=MAX_BATCH_ISSUES)],
+                        db: Annotated[Session, Depends(get_db)],
+                        me: Annotated[Principal, Depends(get_current_principal)]):
+    if not db.get(Project, project_id):
+        raise HTTPException(status_code=404, detail="Project not found")
+    assignees = {i.assignee_id for i in payload if i.assignee_id is not None}
+    known = set(db.scalars(select(User.id).where(User.id.in_(assignees)))) if assignees else set()
+    pending, results = plan_issue_batch(payload, known)
+    created = db.scalars(issue_batch_insert(project_id, me.id, payload, pending)).all() if pending else []
+    if created:
+        publish(db, project_id, "issue.created", [i.id for i in created])
+    db.commit()
+    return issue_batch_results(len(payload), pending, results, created)
+@routerprojectissue.get("/{project_id}/issues",response_model=list[IssueExpanded],dependencies=[Depends(get_token_user_id)])
 def list_project_issues(
     project_id: int,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[Session, Depends(get_read_db)],
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = Query(None, description="Opaque cursor from X-Next-Cursor"),
+    count: CountMode = Query("none", description=COUNT_DESCRIPTION),
     q: str | None = Query(None, description="Filter by issue title (icontains)"),
+    status: list[IssueStatus] | None = Query(None, description="Filter by status (repeatable)"),
+    priority: list[IssuePriority] | None = Query(None, description="Filter by priority (repeatable)"),
+    assignee_id: int | None = Query(None, description="Filter by assignee"),
+    reporter_id: int | None = Query(None, description="Filter by reporter"),
     sort_by: Literal["id", "title", "status", "priority", "created_at", "updated_at", "assignee_id", "reporter_id"] = "id",
     sort_dir: Literal["asc", "desc"] = "asc",
-) -> list[IssueRead]:
+    include: list[IssueInclude] | None = Query(None, description=INCLUDE_DESCRIPTION),
+) -> list[IssueExpanded]:
     if not db.get(Project, project_id):
         raise HTTPException(status_code=404, detail="Project not found")
 
-    query = db.query(Issue).filter(Issue.project_id == project_id)
-    if q:
-        query = query.filter(Issue.title.ilike(f"%{q}%"))
-    col = getattr(Issue, sort_by)
-    order = asc(col) if sort_dir == "asc" else desc(col)
-    query = query.order_by(order)
-    issues = query.offset(skip).limit(limit).all()
-    return issues
-
-@router.get("/{issue_id}", response_model=IssueRead)
-def get_issue(issue_id: int, db: Annotated[Session, Depends(get_db)]):
+    query = db.query(*schema_columns(Issue, IssueRead)).filter(Issue.project_id == project_id,
+                                                               *issue_list_filters(q, status, priority, assignee_id, reporter_id))
+    if count != "none" and not q and reporter_id is None and db.get_bind().dialect.name == "postgresql":
+        total = db.scalar(project_issue_total(project_id, status, priority, assignee_id))
+    else:
+        total = total_count(db, query.statement, count)
+    query = keyset(query, Issue, sort_by, sort_dir, cursor)
+    issues, next_cursor = split_page(query.offset(skip).limit(limit + 1).all(), limit, sort_by, sort_dir)
+    etag = list_etag(request, issues, next_cursor, total)
+    if not include and (unchanged := not_modified(request, etag)):
+        return unchanged
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if total is not None:
+        response.headers["X-Total-Count"] = str(total)
+    if include:
+        items = [row._asdict() for row in issues]
+        results = {name: db.execute(include_stmt).all() for name, include_stmt in issue_include_queries(set(include), items).items()}
+        embed_includes(set(include), items, results)
+        return expanded_response(request, items, etag, response.headers)
+    response.headers["ETag"] = etag
+    return rows_response(issues, response.headers)
+
+@router.patch(":bulk", response_model=list[IssueBulkResult])
+def bulk_update_issues(payload: IssueBulkUpdate, db: Annotated[Session, Depends(get_db)],
+                       me: Annotated[Principal, Depends(get_current_principal)]):
+    if payload.changes.assignee_id is not None and not db.get(User, payload.changes.assignee_id):
+        raise HTTPException(status_code=422, detail="Assignee not found")
+    rows = db.execute(issue_bulk_update(payload, me.id)).all()
+    updated = {r.id for r in rows}
+    existing = set()
+    if payload.ids is not None and len(updated) < len(payload.ids):
+        missing = set(payload.ids) - updated
+        existing = set(db.scalars(select(Issue.id).where(Issue.id.in_(missing))))
+    for project_id, ids in issue_ids_by_project(rows).items():
+        publish(db, project_id, "issue.updated", ids)
+    db.commit()
+    response_cache.invalidate("issue", *updated)
+    return issue_bulk_results(payload, updated, existing)
+
+@router.get("/{issue_id}", response_model=IssueExpanded)
+def get_issue(issue_id: int, db: Annotated[Session, Depends(get_read_db)], request: Request,
+              include: list[IssueInclude] | None = Query(None, description=INCLUDE_DESCRIPTION)):
+    if include:
+        row = db.execute(select(*schema_columns(Issue, IssueRead)).where(Issue.id == issue_id)).first()
+        if not row:
+            raise HTTPException(status_code=404, detail="Issue not found")
+        item = row._asdict()
+        results = {name: db.execute(include_stmt).all() for name, include_stmt in issue_include_queries(set(include), [item]).items()}
+        embed_includes(set(include), [item], results)
+        return expanded_response(request, item, make_etag(row.id, row.updated_at))
+    if cached := response_cache.respond(request, "issue", issue_id):
+        return cached
+    if request.headers.get("if-none-match"):
+        version = db.execute(select(Issue.id, Issue.updated_at).where(Issue.id == issue_id)).first()
+        if version and (unchanged := not_modified(request, make_etag(*version))):
+            return unchanged
     i = db.get(Issue, issue_id)
     if not i:
         raise HTTPException(status_code=404, detail="Issue not found")
-    return i
+    return response_cache.store("issue", i.id, make_etag(i.id, i.updated_at), IssueRead.model_validate(i),
+                                i.project_id)
 
 @router.patch("/{issue_id}", response_model=IssueRead)
 def patch_issue(issue_id: int, payload: IssueUpdate, db: Annotated[Session, Depends(get_db)],
-                me: Annotated[User, Depends(get_current_user)]):
-    i = db.get(Issue, issue_id)
-    if not i:
-        raise HTTPException(status_code=404, detail="Issue not found")
-    if i.reporter_id != me.id:
-        raise HTTPException(status_code=403, detail="Now allowed")
-    if payload.title is not None and payload.title != i.title:
-        exists = (
-            db.query(Issue)
-            .filter(
-                Issue.project_id == i.project_id,
-                Issue.title == payload.title,
-                Issue.id != i.id,
-            )
-            .first()
-        )
-        if exists:
+                me: Annotated[Principal, Depends(get_current_principal)]):
+    changes = payload.model_dump(exclude_none=True)
+    try:
+        i = db.scalars(issue_patch(issue_id, me.id, changes)).first() if changes else None
+    except IntegrityError as e:
+        db.rollback()
+        if sqlstate(e) == UNIQUE_VIOLATION:
             raise HTTPException(status_code=409, detail="Issue title already exists in this project")
-        i.title = payload.title
-    if payload.desc is not None:
-        i.desc = payload.desc
-    if payload.status is not None:
-        i.status = payload.status
-    if payload.priority is not None:
-        i.priority = payload.priority
-    if payload.assignee_id is not None:
-        i.assignee_id = payload.assignee_id
-    db.add(i); db.commit(); db.refresh(i)
+        if constraint_name(e) == ASSIGNEE_FKEY:
+            raise HTTPException(status_code=422, detail="Assignee not found")
+        raise
+    if i is None:
+        i = db.get(Issue, issue_id)
+        if not i:
+            raise HTTPException(status_code=404, detail="Issue not found")
+        if i.reporter_id != me.id or changes:
+            raise HTTPException(status_code=403, detail="Now allowed")
+        return i
+    publish(db, i.project_id, "issue.updated", [i.id])
+    db.commit()
+    response_cache.invalidate("issue", i.id)
     return i
 
 @router.delete("/{issue_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_issue(issue_id: int, db: Annotated[Session, Depends(get_db)],
-                 me: Annotated[User, Depends(get_current_user)]):
+                 me: Annotated[Principal, Depends(get_current_principal)]):
     i = db.get(Issue, issue_id)
     if not i:
         raise HTTPException(status_code=404, detail="Issue not found")
     if i.reporter_id != me.id:
         raise HTTPException(status_code=403, detail="Now allowed")
+    project_id = i.project_id
     db.delete(i)
+    publish(db, project_id, "issue.deleted", [issue_id])
     db.commit()
+    # the issue's comments went with it
+    response_cache.invalidate_generation(project_id)
     return
\ No newline at end of file
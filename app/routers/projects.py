@@ -1,58 +1,103 @@
 from typing import Annotated, Literal
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
-from sqlalchemy import asc, desc
-from app.db.session import get_db
-from app.models.user import User
+from app.db.session import get_db, get_read_db
 from app.models.project import Project
 from app.schemas.project import ProjectRead, ProjectCreate
-from app.deps import get_current_user
+from app.deps import Principal, get_current_principal, get_token_user_id
+from app.core.pagination import keyset, split_page
+from app.core.counting import CountMode, COUNT_DESCRIPTION, total_count
+from app.core.etag import make_etag, not_modified
+from app.core.response_cache import response_cache
+from app.core.events import publish
+from app.schemas.stats import ProjectStats
+from app.services.stats import STATS_ROWS, summarize_stats
+from app.schemas.changes import ChangeFeed
+from app.services.changes import SETTLED_BEFORE, decode_changes_cursor, change_queries, merge_changes
+from app.core.responses import encode
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
 @router.post("",response_model=ProjectRead, status_code=status.HTTP_201_CREATED)
 def create_project(payload: ProjectCreate, db: Annotated[Session, Depends(get_db)],
-                   me: Annotated[User, Depends(get_current_user)]):
-    exists = (db.query(Project).filter(Project.name == payload.name, Project.owner_id == me.id).first())
-    if exists:
+                   me: Annotated[Principal, Depends(get_current_principal)]):
+    project = db.scalars(insert(Project).values(name=payload.name, desc=payload.desc, owner_id=me.id)
+                         .on_conflict_do_nothing(constraint="uq_projects_owner_name")
+                         .returning(Project)).first()
+    if project is None:
         raise HTTPException(status_code=409, detail="The project name is already taken")
-    project = Project(name = payload.name, desc = payload.desc, owner_id = me.id)
-    db.add(project)
     db.commit()
-    db.refresh(project)
     return project
 
-@router.get("", response_model=list[ProjectRead], dependencies=[Depends(get_current_user)])
-def list_projects(db: Annotated[Session, Depends(get_db)],
+@router.get("", response_model=list[ProjectRead], dependencies=[Depends(get_token_user_id)])
+def list_projects(db: Annotated[Session, Depends(get_read_db)],
+                  response: Response,
                   skip: int = Query(0, ge=0),
                   limit: int = Query(50, ge=1, le=100),
+                  cursor: str | None = Query(None, description="Opaque cursor from X-Next-Cursor"),
+                  count: CountMode = Query("none", description=COUNT_DESCRIPTION),
                   q: str | None = Query(None, description="Filter by name (icontains)"),
                   sort_by: Literal["id", "name", "owner_id"] = "id",
                   sort_dir: Literal["asc", "desc"] = "asc") -> list[ProjectRead]:
     query = db.query(Project)
     if q:
         query = query.filter(Project.name.ilike(f"%{q}%"))
-    col = getattr(Project, sort_by)
-    order = asc(col) if sort_dir == "asc" else desc(col)
-    query = query.order_by(order)
-    projects = query.offset(skip).limit(limit).all()
+    total = total_count(db, query.statement, count)
+    query = keyset(query, Project, sort_by, sort_dir, cursor)
+    projects, next_cursor = split_page(query.offset(skip).limit(limit + 1).all(), limit, sort_by, sort_dir)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if total is not None:
+        response.headers["X-Total-Count"] = str(total)
     return projects
 
 @router.get("/{project_id}", response_model=ProjectRead)
-def get_one_project(project_id: int, db: Annotated[Session, Depends(get_db)]):
+def get_one_project(project_id: int, db: Annotated[Session, Depends(get_read_db)], request: Request):
+    if cached := response_cache.respond(request, "project", project_id):
+        return cached
+    # projects can't be edited, so id and creation time identify a representation
+    if request.headers.get("if-none-match"):
+        version = db.execute(select(Project.id, Project.created_at).where(Project.id == project_id)).first()
+        if version and (unchanged := not_modified(request, make_etag(*version))):
+            return unchanged
     p = db.get(Project, project_id)
     if not p:
         raise HTTPException(status_code=404, detail="Project not found")
-    return p
+    return response_cache.store("project", p.id, make_etag(p.id, p.created_at), ProjectRead.model_validate(p))
+
+@router.get("/{project_id}/stats", response_model=ProjectStats)
+def get_project_stats(project_id: int, db: Annotated[Session, Depends(get_read_db)]):
+    if not db.get(Project, project_id):
+        raise HTTPException(status_code=404, detail="Project not found")
+    return summarize_stats(project_id, db.execute(STATS_ROWS, {"project_id": project_id}).all())
+
+@router.get("/{project_id}/changes", response_model=ChangeFeed, dependencies=[Depends(get_token_user_id)])
+def list_project_changes(project_id: int, db: Annotated[Session, Depends(get_db)],
+                         since: str | None = Query(None, description="Cursor from a previous response; omit for a full sync"),
+                         limit: int = Query(500, ge=1, le=1000)):
+    positions, as_of = decode_changes_cursor(since)
+    if not db.get(Project, project_id):
+        raise HTTPException(status_code=404, detail="Project not found")
+    settled_before = None
+    if db.get_bind().dialect.name == "postgresql":
+        settled_before = db.scalar(SETTLED_BEFORE)
+    results = {source: (db.execute(stmt)).all()
+               for source, stmt in change_queries(project_id, positions, settled_before, limit).items()}
+    page = merge_changes(positions, results, limit, settled_before, as_of)
+    return Response(encode(page), media_type="application/json")
 
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_project(project_id: int, db: Annotated[Session, Depends(get_db)],
-                   user: Annotated[User, Depends(get_current_user)]):
+                   user: Annotated[Principal, Depends(get_current_principal)]):
     p = db.get(Project, project_id)
     if not p:
         raise HTTPException(status_code=404, detail="Project not found")
     if p.owner_id != user.id:
         raise HTTPException(status_code=403, detail="Only project owner can delete a project")
     db.delete(p)
+    publish(db, project_id, "project.deleted")
     db.commit()
+    response_cache.invalidate_project(project_id)
     return
\ No newline at end of file
@@ -0,0 +1,52 @@
+from typing import Annotated, Literal
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from sqlalchemy import select, func, literal, literal_column, union_all
+from app.db.session import get_read_db
+from app.models.issue import Issue, ISSUE_SEARCH_DOCUMENT
+from app.models.comment import Comment, COMMENT_SEARCH_DOCUMENT
+from app.schemas.search import SearchHit
+from app.deps import get_token_user_id
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+SEARCH_CONFIG = literal_column("'english'")
+HEADLINE_OPTIONS = "MaxFragments=1, MaxWords=20, MinWords=5"
+
+@router.get("", response_model=list[SearchHit], dependencies=[Depends(get_token_user_id)])
+def search(db: Annotated[Session, Depends(get_read_db)],
+           q: str = Query(..., min_length=1, description="Web-search style query, e.g. `login -oauth \"500 error\"`"),
+           types: list[Literal["issue", "comment"]] = Query(["issue", "comment"]),
+           project_id: int | None = Query(None),
+           limit: int = Query(20, ge=1, le=100)) -> list[SearchHit]:
+    tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    parts = []
+    if "issue" in types:
+        doc = literal_column(ISSUE_SEARCH_DOCUMENT)
+        stmt = (select(literal("issue").label("type"), Issue.id, Issue.project_id, Issue.id.label("issue_id"),
+                       Issue.title, func.coalesce(Issue.desc, "").label("body"),
+                       func.ts_rank_cd(doc, tsquery).label("rank"))
+                .where(doc.bool_op("@@")(tsquery)))
+        if project_id is not None:
+            stmt = stmt.where(Issue.project_id == project_id)
+        parts.append(stmt)
+    if "comment" in types:
+        doc = literal_column(COMMENT_SEARCH_DOCUMENT)
+        stmt = (select(literal("comment").label("type"), Comment.id, Issue.project_id, Comment.issue_id,
+                       Issue.title, Comment.content.label("body"),
+                       func.ts_rank_cd(doc, tsquery).label("rank"))
+                .join(Issue, Issue.id == Comment.issue_id)
+                .where(doc.bool_op("@@")(tsquery)))
+        if project_id is not None:
+            stmt = stmt.where(Issue.project_id == project_id)
+        parts.append(stmt)
+
+    hits = union_all(*parts).subquery() if len(parts) > 1 else parts[0].subquery()
+    top = select(hits).order_by(hits.c.rank.desc(), hits.c.type, hits.c.id).limit(limit).subquery()
+    rows = db.execute(
+        select(top.c.type, top.c.id, top.c.project_id, top.c.issue_id, top.c.title,
+               func.ts_headline(SEARCH_CONFIG, top.c.body, tsquery, HEADLINE_OPTIONS).label("snippet"),
+               top.c.rank)
+        .order_by(top.c.rank.desc(), top.c.type, top.c.id)
+    ).all()
+    return [SearchHit.model_validate(r, from_attributes=True) for r in rows]
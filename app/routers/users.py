@@ -1,13 +1,20 @@
 from typing import Annotated, Literal
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from pydantic import BaseModel
+from sqlalchemy import or_, select, union_all
 from sqlalchemy.orm import Session
-from sqlalchemy import asc, desc
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.models.user import User
+from app.models.issue import Issue, IssueStatus, IssuePriority
 from app.schemas.user import UserRead
-from app.deps import get_current_user
+from app.schemas.issue import IssueRead
+from app.deps import Principal, get_current_user, get_current_principal, get_token_user_id, principal_cache
 from app.core.security import verify_pw, hash_pw
+from app.core.pagination import keyset, split_page
+from app.core.counting import CountMode, COUNT_DESCRIPTION, total_count
+from app.core.etag import make_etag
+from app.core.response_cache import response_cache
+from app.core.responses import schema_columns, rows_response
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -15,8 +22,35 @@ class PasswordChange(BaseModel):
     old_password: str
     new_password: str
 
+IssueRole = Literal["assignee", "reporter"]
+
+def my_issues_query(user_id: int, role: IssueRole | None, status: list[IssueStatus] | None,
+                    priority: list[IssuePriority] | None, sort_dir: str, cursor: str | None, limit: int):
+    """Page through the issues assigned to or reported by ``user_id``, newest activity first.
+
+    Every branch is a single ordered range of ``ix_issues_assignee_id_status_updated_at`` (one per status)
+    or ``ix_issues_reporter_id_updated_at``, cut at ``limit + 1``; only those rows are merged and sorted.
+    """
+    branches = []
+    if role != "reporter":
+        branches += [[Issue.assignee_id == user_id, Issue.status == s] for s in status or IssueStatus]
+    if role != "assignee":
+        reported = [Issue.reporter_id == user_id]
+        if status:
+            reported.append(Issue.status.in_(status))
+        if role is None:
+            reported.append(or_(Issue.assignee_id.is_(None), Issue.assignee_id != user_id))
+        branches.append(reported)
+    if priority:
+        branches = [[*clauses, Issue.priority.in_(priority)] for clauses in branches]
+    ids = union_all(*(select(keyset(select(Issue.id, Issue.updated_at).where(*clauses), Issue, "updated_at",
+                                    sort_dir, cursor).limit(limit + 1).subquery().c.id)
+                      for clauses in branches))
+    stmt = select(*schema_columns(Issue, IssueRead)).where(Issue.id.in_(ids))
+    return keyset(stmt, Issue, "updated_at", sort_dir).limit(limit + 1)
+
 @router.get("/me", response_model=UserRead)
-def get_me(current: Annotated[User, Depends(get_current_user)]) -> UserRead:
+def get_me(current: Annotated[Principal, Depends(get_current_principal)]) -> UserRead:
     return current
 
 @router.post("/me/change-password", status_code=status.HTTP_204_NO_CONTENT)
@@ -30,31 +64,57 @@ def change_password(
     current.password_hash = hash_pw(payload.new_password)
     db.add(current)
     db.commit()
+    principal_cache.pop(current.id)
     return
 
-@router.get("/", response_model=list[UserRead], dependencies=[Depends(get_current_user)])
-def list_users(db: Annotated[Session, Depends(get_db)],
+@router.get("/me/issues", response_model=list[IssueRead])
+def list_my_issues(db: Annotated[Session, Depends(get_read_db)],
+                   uid: Annotated[int, Depends(get_token_user_id)],
+                   response: Response,
+                   limit: int = Query(50, ge=1, le=200),
+                   cursor: str | None = Query(None, description="Opaque cursor from X-Next-Cursor"),
+                   role: IssueRole | None = Query(None, description="Only issues assigned to or reported by me (default: both)"),
+                   status: list[IssueStatus] | None = Query(None, description="Filter by status (repeatable)"),
+                   priority: list[IssuePriority] | None = Query(None, description="Filter by priority (repeatable)"),
+                   sort_dir: Literal["asc", "desc"] = "desc") -> list[IssueRead]:
+    rows = db.execute(my_issues_query(uid, role, status, priority, sort_dir, cursor, limit)).all()
+    issues, next_cursor = split_page(rows, limit, "updated_at", sort_dir)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return rows_response(issues, response.headers)
+
+@router.get("/", response_model=list[UserRead], dependencies=[Depends(get_token_user_id)])
+def list_users(db: Annotated[Session, Depends(get_read_db)],
+               response: Response,
                skip: int = Query(0, ge=0),
                limit: int = Query(50, ge=1, le=200),
+               cursor: str | None = Query(None, description="Opaque cursor from X-Next-Cursor"),
+               count: CountMode = Query("none", description=COUNT_DESCRIPTION),
                q: str | None = Query(None, description="Filter by username (icontains)"),
                sort_by: Literal["id", "username", "created_at"] = "id",
                sort_dir: Literal["asc", "desc"] = "asc") -> list[UserRead]:
     query = db.query(User)
     if q:
         query = query.filter(User.username.ilike(f"%{q}%"))
-    col = getattr(User, sort_by)
-    order = asc(col) if sort_dir == "asc" else desc(col)
-    query = query.order_by(order)
-    users = query.offset(skip).limit(limit).all()
+    total = total_count(db, query.statement, count)
+    query = keyset(query, User, sort_by, sort_dir, cursor)
+    users, next_cursor = split_page(query.offset(skip).limit(limit + 1).all(), limit, sort_by, sort_dir)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if total is not None:
+        response.headers["X-Total-Count"] = str(total)
     return users
 
 
-@router.get("/{user_id}", response_model=UserRead, dependencies=[Depends(get_current_user)])
+@router.get("/{user_id}", response_model=UserRead, dependencies=[Depends(get_token_user_id)])
 def get_user(
     user_id: int,
-    db: Annotated[Session, Depends(get_db)],
-) -> UserRead:
+    db: Annotated[Session, Depends(get_read_db)],
+    request: Request,
+):
+    if cached := response_cache.respond(request, "user", user_id):
+        return cached
     user = db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    return user
\ No newline at end of file
+    return response_cache.store("user", user.id, make_etag(user.id, user.created_at), UserRead.model_validate(user))
\ No newline at end of file
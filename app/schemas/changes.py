@@ -0,0 +1,20 @@
+from typing import Literal
+from pydantic import BaseModel
+from datetime import datetime
+from app.schemas.issue import IssueRead
+from app.schemas.comment import CommentRead
+
+class ChangeRead(BaseModel):
+    kind: Literal["issue", "comment"]
+    id: int
+    deleted: bool
+    changed_at: datetime
+    issue: IssueRead | None = None
+    comment: CommentRead | None = None
+    # set for deleted comments
+    issue_id: int | None = None
+
+class ChangeFeed(BaseModel):
+    changes: list[ChangeRead]
+    cursor: str
+    has_more: bool
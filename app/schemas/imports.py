@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+
+class ImportRowError(BaseModel):
+    line: int
+    error: str
+
+class ImportReport(BaseModel):
+    issues_created: int = 0
+    issues_updated: int = 0
+    issues_skipped: int = 0
+    comments_created: int = 0
+    comments_skipped: int = 0
+    rejected: int = 0
+    errors: list[ImportRowError] = []
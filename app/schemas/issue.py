@@ -1,6 +1,11 @@
-from pydantic import BaseModel, ConfigDict
+from typing import Literal
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 from datetime import datetime
 from app.models.issue import IssuePriority, IssueStatus
+from app.schemas.user import UserRead
+from app.schemas.comment import CommentRead
+
+IssueInclude = Literal["reporter", "assignee", "comment_count", "latest_comment"]
 
 class IssueCreate(BaseModel):
     title: str
@@ -26,3 +31,43 @@ class IssueRead(IssueCreate):
 
     model_config = ConfigDict(from_attributes=True)
 
+class IssueExpanded(IssueRead):
+    """``IssueRead`` plus the relations and aggregates asked for with ``include``."""
+    reporter: UserRead | None = None
+    assignee: UserRead | None = None
+    comment_count: int | None = None
+    latest_comment: CommentRead | None = None
+
+class IssueBatchResult(BaseModel):
+    index: int
+    status: Literal["created", "conflict", "invalid_assignee"]
+    issue: IssueRead | None = None
+    detail: str | None = None
+
+
+class IssueFilter(BaseModel):
+    project_id: int | None = None
+    status: IssueStatus | None = None
+    priority: IssuePriority | None = None
+    assignee_id: int | None = None
+
+class IssueBulkUpdate(BaseModel):
+    ids: list[int] | None = Field(None, min_length=1, max_length=1000)
+    filter: IssueFilter | None = None
+    changes: IssueUpdate
+
+    @model_validator(mode="after")
+    def _check_target_and_changes(self) -> "IssueBulkUpdate":
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Provide exactly one of ids or filter")
+        if self.filter is not None and not self.filter.model_dump(exclude_none=True):
+            raise ValueError("Filter needs at least one field")
+        if self.changes.title is not None:
+            raise ValueError("Titles are unique per project and can't be bulk updated")
+        if not self.changes.model_dump(exclude_none=True):
+            raise ValueError("No changes given")
+        return self
+
+class IssueBulkResult(BaseModel):
+    id: int
+    status: Literal["updated", "not_found", "forbidden"]
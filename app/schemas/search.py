@@ -0,0 +1,11 @@
+from typing import Literal
+from pydantic import BaseModel
+
+class SearchHit(BaseModel):
+    type: Literal["issue", "comment"]
+    id: int
+    project_id: int
+    issue_id: int
+    title: str
+    snippet: str
+    rank: float
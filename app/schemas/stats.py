@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from app.models.issue import IssueStatus, IssuePriority
+
+class AssigneeStats(BaseModel):
+    assignee_id: int | None
+    open: int
+    total: int
+
+class ProjectStats(BaseModel):
+    project_id: int
+    total: int
+    by_status: dict[IssueStatus, int]
+    by_priority: dict[IssuePriority, int]
+    open_by_priority: dict[IssuePriority, int]
+    by_assignee: list[AssigneeStats]
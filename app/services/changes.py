@@ -0,0 +1,135 @@
+"""Issues and comments of a project changed after a cursor, with tombstones for deletes.
+
+Each source (issues, comments, tombstones) is read in ``(updated_at, id)`` order from its own
+position in the cursor, so a sync reads only what changed since the previous one. Rows are
+stamped when written (``change_stamp()``), and stamps from transactions that may still be in
+flight are held back until those transactions have ended, otherwise a row committed after a page
+was served could carry a timestamp before its cursor.
+
+Tombstones are kept for ``CHANGES_RETENTION_DAYS``. The cursor records how far its client is
+complete, and a cursor older than the retention is refused: deletes it has not seen may be gone.
+"""
+import base64
+import binascii
+import heapq
+import json
+from datetime import datetime, timedelta, timezone
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, select, text, tuple_
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.pagination import invalid_cursor_exception
+from app.core.responses import schema_columns
+from app.models.comment import Comment
+from app.models.issue import Issue
+from app.models.tombstone import Tombstone
+from app.schemas.comment import CommentRead
+from app.schemas.issue import IssueRead
+
+SOURCES = ("issue", "comment", "tombstone")
+Position = tuple[datetime, int] | None
+
+# change_stamp() takes its transaction's xid before reading the clock, so a transaction that has not
+# written yet stamps its rows after now(), and one that has (holds an xid) after its start: nothing
+# stamped before the oldest writer can still appear. Read-only transactions, such as exports, don't
+# hold the feed back; a writer left open does, until it ends. Other backends are not visible to
+# roles without pg_read_all_stats, so the app's writers should share its role.
+SETTLED_BEFORE = text("""
+    SELECT least(min(xact_start), now())
+    FROM pg_stat_activity
+    WHERE datname = current_database() AND backend_type = 'client backend' AND backend_xid IS NOT NULL
+""")
+
+cursor_expired_exception = HTTPException(
+    status_code=status.HTTP_410_GONE,
+    detail="Cursor is older than the changes retention; sync again without since",
+)
+
+
+def encode_changes_cursor(positions: dict[str, Position], as_of: datetime) -> str:
+    raw = json.dumps([None if p is None else [p[0].isoformat(), p[1]] for p in map(positions.get, SOURCES)]
+                     + [as_of.isoformat()], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_changes_cursor(cursor: str | None) -> tuple[dict[str, Position], datetime | None]:
+    """Positions to continue from and how far their client is complete (None for a full sync);
+    410 when the cursor predates the tombstones still kept."""
+    if not cursor:
+        return dict.fromkeys(SOURCES), None
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        # cursors issued before the retention was recorded in them can't be vouched for
+        if len(raw) == len(SOURCES):
+            raise cursor_expired_exception
+        if len(raw) != len(SOURCES) + 1:
+            raise ValueError("cursor does not match the feed")
+        positions = {source: None if p is None else (datetime.fromisoformat(p[0]), int(p[1]))
+                     for source, p in zip(SOURCES, raw)}
+        as_of = datetime.fromisoformat(raw[-1])
+        if as_of.tzinfo is None:
+            # SQLite hands back naive UTC timestamps
+            as_of = as_of.replace(tzinfo=timezone.utc)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError, IndexError):
+        raise invalid_cursor_exception
+    if as_of < retention_cutoff():
+        raise cursor_expired_exception
+    return positions, as_of
+
+
+def retention_cutoff() -> datetime:
+    return datetime.now(timezone.utc) - timedelta(days=settings.CHANGES_RETENTION_DAYS)
+
+
+def prune_tombstones(bind: Engine) -> int:
+    """Delete the tombstones past the retention; returns how many."""
+    with bind.begin() as conn:
+        return conn.execute(delete(Tombstone).where(Tombstone.deleted_at < retention_cutoff())).rowcount
+
+
+def change_queries(project_id: int, positions: dict[str, Position], settled_before: datetime | None,
+                   limit: int) -> dict:
+    """One ordered, ``limit + 1`` range scan per source, past its position and before ``settled_before``."""
+    def page(stmt, stamp, id_col, position):
+        if position is not None:
+            stmt = stmt.where(tuple_(stamp, id_col) > tuple_(*position))
+        if settled_before is not None:
+            stmt = stmt.where(stamp < settled_before)
+        return stmt.order_by(stamp, id_col).limit(limit + 1)
+
+    return {
+        "issue": page(select(*schema_columns(Issue, IssueRead)).where(Issue.project_id == project_id),
+                      Issue.updated_at, Issue.id, positions["issue"]),
+        "comment": page(select(*schema_columns(Comment, CommentRead)).where(Comment.project_id == project_id),
+                        Comment.updated_at, Comment.id, positions["comment"]),
+        "tombstone": page(select(Tombstone.id, Tombstone.kind, Tombstone.entity_id, Tombstone.issue_id,
+                                 Tombstone.deleted_at).where(Tombstone.project_id == project_id),
+                          Tombstone.deleted_at, Tombstone.id, positions["tombstone"]),
+    }
+
+
+def _change(source: str, row) -> tuple[datetime, int, str, dict]:
+    if source == "tombstone":
+        return row.deleted_at, row.id, source, {"kind": row.kind, "id": row.entity_id, "deleted": True,
+                                                "changed_at": row.deleted_at, "issue_id": row.issue_id}
+    return row.updated_at, row.id, source, {"kind": source, "id": row.id, "deleted": False,
+                                            "changed_at": row.updated_at, source: row._asdict()}
+
+
+def merge_changes(positions: dict[str, Position], results: dict[str, list], limit: int,
+                  settled_before: datetime | None, as_of: datetime | None) -> dict:
+    """The first ``limit`` changes of all sources in time order, and the cursor just past them."""
+    streams = [[_change(source, row) for row in rows] for source, rows in results.items()]
+    merged = list(heapq.merge(*streams, key=lambda c: (c[0], SOURCES.index(c[2]), c[1])))
+    positions = dict(positions)
+    for stamp, row_id, source, _ in merged[:limit]:
+        positions[source] = (stamp, row_id)
+    # until it has caught up, the client is only as complete as when this sync started: rows it is
+    # yet to page through may have been deleted since. A full sync starts at this page's horizon.
+    has_more = len(merged) > limit
+    horizon = settled_before or datetime.now(timezone.utc)
+    as_of = as_of or horizon if has_more else horizon
+    return {"changes": [change for *_, change in merged[:limit]], "cursor": encode_changes_cursor(positions, as_of),
+            "has_more": has_more}
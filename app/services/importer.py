@@ -0,0 +1,229 @@
+"""Bulk import of issues and comments into a project.
+
+Input uses the export format (NDJSON records or CSV with a ``type`` column). Records are
+streamed into a temporary staging table with ``COPY``, validated there with set-based
+UPDATEs and merged into ``issues`` and ``comments`` in line-number chunks, one
+transaction per chunk.
+"""
+import csv
+import io
+import json
+import logging
+from typing import Callable, Iterable, Iterator, Literal
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.models.issue import IssuePriority, IssueStatus
+from app.schemas.imports import ImportReport, ImportRowError
+
+logger = logging.getLogger(__name__)
+
+STAGING_COLUMNS = ["line", "type", "id", "issue_id", "title", "desc", "status", "priority",
+                   "reporter_id", "assignee_id", "author_id", "content", "error"]
+PARSE_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+
+Progress = Callable[[str, int, int | None], None]
+
+
+class ProjectNotFound(LookupError):
+    pass
+
+
+class _ChunkReader:
+    """File-like adapter that feeds an iterator of CSV text chunks to ``copy_expert``."""
+
+    def __init__(self, chunks: Iterator[str]):
+        self._chunks = chunks
+        self._buf = ""
+
+    def read(self, size: int = -1) -> str:
+        while size < 0 or len(self._buf) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buf += chunk
+        if size < 0:
+            out, self._buf = self._buf, ""
+        else:
+            out, self._buf = self._buf[:size], self._buf[size:]
+        return out
+
+
+def _records(lines: Iterable[str], format: Literal["ndjson", "csv"]) -> Iterator[tuple[int, dict | None]]:
+    if format == "csv":
+        reader = csv.DictReader(lines)
+        for record in reader:
+            yield reader.line_num, record
+        return
+    for n, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        yield n, record if isinstance(record, dict) else None
+
+
+def _staging_rows(lines: Iterable[str], format: Literal["ndjson", "csv"], progress: Progress | None) -> Iterator[str]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    staged = 0
+    for line, record in _records(lines, format):
+        if record is None:
+            writer.writerow([line] + [None] * (len(STAGING_COLUMNS) - 2) + ["invalid record"])
+        else:
+            if isinstance(record.get("content"), str):
+                # stored the way CommentCreate normalizes it, so reads can skip re-validation
+                record["content"] = record["content"].strip()
+            values = [record.get(c) for c in STAGING_COLUMNS[2:-1]]
+            writer.writerow([line, record.get("type") or "issue"]
+                            + [None if v is None else str(v) for v in values] + [None])
+        staged += 1
+        if staged % PARSE_BATCH_SIZE == 0:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+            if progress:
+                progress("staged", staged, None)
+    yield buf.getvalue()
+    if progress:
+        progress("staged", staged, staged)
+
+
+def _reject(conn: Connection, reason: str, where: str, **params) -> None:
+    stmt = text(f"UPDATE import_staging s SET error = :reason WHERE s.error IS NULL AND {where}")
+    for name, value in params.items():
+        if isinstance(value, (list, tuple)):
+            stmt = stmt.bindparams(bindparam(name, expanding=True))
+    conn.execute(stmt, {"reason": reason, **params})
+
+
+def _user_missing(column: str) -> str:
+    return (f"s.{column} IS NOT NULL AND CASE WHEN s.{column} ~ '^[0-9]{{1,9}}$' "
+            f"THEN NOT EXISTS (SELECT 1 FROM users u WHERE u.id = s.{column}::int) ELSE true END")
+
+
+def _validate(conn: Connection) -> None:
+    _reject(conn, "unknown record type", "s.type NOT IN ('issue', 'comment')")
+    _reject(conn, "missing title", "s.type = 'issue' AND coalesce(s.title, '') = ''")
+    _reject(conn, "title longer than 100 characters", "s.type = 'issue' AND length(s.title) > 100")
+    _reject(conn, "invalid status", "s.type = 'issue' AND s.status NOT IN :statuses",
+            statuses=[v.value for v in IssueStatus])
+    _reject(conn, "invalid priority", "s.type = 'issue' AND s.priority NOT IN :priorities",
+            priorities=[v.value for v in IssuePriority])
+    _reject(conn, "unknown reporter_id", f"s.type = 'issue' AND {_user_missing('reporter_id')}")
+    _reject(conn, "unknown assignee_id", f"s.type = 'issue' AND {_user_missing('assignee_id')}")
+    for column, reason in (("title", "duplicate title in import"), ("id", "duplicate id in import")):
+        _reject(conn, reason, f"""s.line IN (
+            SELECT line FROM (
+                SELECT line, row_number() OVER (PARTITION BY {column} ORDER BY line) AS n
+                FROM import_staging WHERE type = 'issue' AND error IS NULL AND {column} IS NOT NULL
+            ) d WHERE d.n > 1)""")
+    _reject(conn, "missing content", "s.type = 'comment' AND coalesce(s.content, '') = ''")
+    _reject(conn, "unknown author_id", f"s.type = 'comment' AND {_user_missing('author_id')}")
+    _reject(conn, "unknown issue_id", """s.type = 'comment' AND NOT EXISTS (
+        SELECT 1 FROM import_staging i WHERE i.type = 'issue' AND i.error IS NULL AND i.id = s.issue_id)""")
+
+
+def _merge_issues(conn: Connection, project_id: int, user_id: int, start: int, end: int,
+                  on_conflict: Literal["skip", "update"]) -> tuple[int, int]:
+    if on_conflict == "update":
+        conflict = """DO UPDATE SET "desc" = EXCLUDED."desc", status = EXCLUDED.status, priority = EXCLUDED.priority,
+                      assignee_id = EXCLUDED.assignee_id, updated_at = change_stamp()"""
+    else:
+        conflict = "DO NOTHING"
+    rows = conn.execute(text(f"""
+        WITH merged AS (
+            INSERT INTO issues (title, "desc", status, priority, project_id, reporter_id, assignee_id)
+            SELECT s.title, coalesce(s."desc", ''), coalesce(s.status, 'open')::status,
+                   coalesce(s.priority, 'medium')::priority, :project_id,
+                   coalesce(s.reporter_id::int, :user_id), s.assignee_id::int
+            FROM import_staging s
+            WHERE s.type = 'issue' AND s.error IS NULL AND s.line BETWEEN :start AND :end
+            ON CONFLICT ON CONSTRAINT uq_title_name_project_id {conflict}
+            RETURNING id, title, xmax = 0 AS inserted
+        )
+        UPDATE import_staging s SET target_id = merged.id
+        FROM merged
+        WHERE s.type = 'issue' AND s.error IS NULL AND s.line BETWEEN :start AND :end AND s.title = merged.title
+        RETURNING merged.inserted
+    """), {"project_id": project_id, "user_id": user_id, "start": start, "end": end}).scalars().all()
+    created = sum(1 for inserted in rows if inserted)
+    return created, len(rows) - created
+
+
+def _merge_comments(conn: Connection, project_id: int, user_id: int, start: int, end: int) -> int:
+    return conn.execute(text("""
+        INSERT INTO comments (content, issue_id, author_id, project_id)
+        SELECT s.content, i.target_id, coalesce(s.author_id::int, :user_id), :project_id
+        FROM import_staging s
+        JOIN import_staging i ON i.type = 'issue' AND i.error IS NULL AND i.id = s.issue_id
+        WHERE s.type = 'comment' AND s.error IS NULL AND i.target_id IS NOT NULL
+          AND s.line BETWEEN :start AND :end
+    """), {"project_id": project_id, "user_id": user_id, "start": start, "end": end}).rowcount
+
+
+def import_issues(bind: Engine, project_id: int, user_id: int, lines: Iterable[str],
+                  format: Literal["ndjson", "csv"] = "ndjson",
+                  on_conflict: Literal["skip", "update"] = "skip",
+                  chunk_size: int = 10_000, progress: Progress | None = None) -> ImportReport:
+    """Load ``lines`` into ``project_id``; missing reporter/author ids default to ``user_id``."""
+    report = ImportReport()
+    with bind.connect() as conn:
+        if conn.execute(text("SELECT 1 FROM projects WHERE id = :id"), {"id": project_id}).first() is None:
+            raise ProjectNotFound(project_id)
+        columns = ", ".join(f'"{c}" text' for c in STAGING_COLUMNS[1:])
+        conn.execute(text("DROP TABLE IF EXISTS import_staging"))
+        conn.execute(text(f"CREATE TEMP TABLE import_staging (line bigint, {columns}, target_id int)"))
+        try:
+            cursor = conn.connection.cursor()
+            copy_columns = ", ".join(f'"{c}"' for c in STAGING_COLUMNS)
+            cursor.copy_expert(f"COPY import_staging ({copy_columns}) FROM STDIN WITH (FORMAT csv)",
+                               _ChunkReader(_staging_rows(lines, format, progress)))
+            conn.execute(text("CREATE INDEX ON import_staging (line)"))
+            conn.execute(text("CREATE INDEX ON import_staging (id) WHERE type = 'issue'"))
+            conn.execute(text("ANALYZE import_staging"))
+            _validate(conn)
+            conn.commit()
+
+            last_line = conn.execute(text("SELECT coalesce(max(line), 0) FROM import_staging")).scalar()
+            for stage in ("issues", "comments"):
+                for start in range(1, last_line + 1, chunk_size):
+                    end = start + chunk_size - 1
+                    if stage == "issues":
+                        created, updated = _merge_issues(conn, project_id, user_id, start, end, on_conflict)
+                        report.issues_created += created
+                        report.issues_updated += updated
+                    else:
+                        report.comments_created += _merge_comments(conn, project_id, user_id, start, end)
+                    conn.commit()
+                    if progress:
+                        progress(stage, min(end, last_line), last_line)
+                    logger.info("import into project %s: %s merged up to line %s of %s",
+                                project_id, stage, min(end, last_line), last_line)
+
+            counts = conn.execute(text("""
+                SELECT count(*) FILTER (WHERE type = 'issue' AND error IS NULL AND target_id IS NULL),
+                       count(*) FILTER (WHERE error IS NOT NULL)
+                FROM import_staging
+            """)).one()
+            report.issues_skipped, report.rejected = counts
+            report.comments_skipped = conn.execute(text("""
+                SELECT count(*) FROM import_staging s
+                JOIN import_staging i ON i.type = 'issue' AND i.error IS NULL AND i.id = s.issue_id
+                WHERE s.type = 'comment' AND s.error IS NULL AND i.target_id IS NULL
+            """)).scalar()
+            report.errors = [
+                ImportRowError(line=line, error=error) for line, error in conn.execute(
+                    text("SELECT line, error FROM import_staging WHERE error IS NOT NULL ORDER BY line LIMIT :n"),
+                    {"n": MAX_REPORTED_ERRORS},
+                )
+            ]
+        finally:
+            conn.rollback()
+            conn.execute(text("DROP TABLE IF EXISTS import_staging"))
+            conn.commit()
+    return report
@@ -0,0 +1,89 @@
+"""Per-project issue counters kept in ``project_issue_stats``.
+
+The table is maintained by statement-level triggers on ``issues`` (see ``app.models.stats``);
+``rebuild_project_stats`` recomputes it from ``issues`` to repair drift, e.g. after
+the triggers were disabled for a bulk load.
+"""
+import logging
+
+from sqlalchemy import func, select, text
+from sqlalchemy.engine import Engine
+
+from app.models.issue import IssuePriority, IssueStatus
+from app.models.stats import ProjectIssueStats
+from app.schemas.stats import AssigneeStats, ProjectStats
+
+logger = logging.getLogger(__name__)
+
+STATS_ROWS = text("""
+    SELECT status, priority, assignee_id, issue_count FROM project_issue_stats
+    WHERE project_id = :project_id AND issue_count <> 0
+""")
+
+
+def project_issue_total(project_id: int, status: list[IssueStatus] | None = None,
+                        priority: list[IssuePriority] | None = None, assignee_id: int | None = None):
+    """Exact issue count of a project (optionally filtered), summed from its buckets instead of counting ``issues``."""
+    stmt = (select(func.coalesce(func.sum(ProjectIssueStats.issue_count), 0))
+            .where(ProjectIssueStats.project_id == project_id))
+    if status:
+        stmt = stmt.where(ProjectIssueStats.status.in_(status))
+    if priority:
+        stmt = stmt.where(ProjectIssueStats.priority.in_(priority))
+    if assignee_id is not None:
+        stmt = stmt.where(ProjectIssueStats.assignee_id == assignee_id)
+    return stmt
+
+
+def summarize_stats(project_id: int, rows) -> ProjectStats:
+    """Fold ``(status, priority, assignee_id, issue_count)`` buckets into the API shape."""
+    by_status = {s: 0 for s in IssueStatus}
+    by_priority = {p: 0 for p in IssuePriority}
+    open_by_priority = {p: 0 for p in IssuePriority}
+    by_assignee: dict[int, AssigneeStats] = {}
+    for status, priority, assignee_id, n in rows:
+        status, priority = IssueStatus(status), IssuePriority(priority)
+        by_status[status] += n
+        by_priority[priority] += n
+        a = by_assignee.setdefault(assignee_id, AssigneeStats(assignee_id=assignee_id or None, open=0, total=0))
+        a.total += n
+        if status is IssueStatus.open:
+            open_by_priority[priority] += n
+            a.open += n
+    return ProjectStats(
+        project_id=project_id,
+        total=sum(by_status.values()),
+        by_status=by_status,
+        by_priority=by_priority,
+        open_by_priority=open_by_priority,
+        by_assignee=sorted(by_assignee.values(), key=lambda a: (-a.total, a.assignee_id or 0)),
+    )
+
+
+def rebuild_project_stats(bind: Engine, project_id: int | None = None) -> int:
+    """Recompute the counters of one project (or all) and return the number of buckets that had drifted."""
+    scope = "WHERE project_id = :project_id" if project_id is not None else ""
+    params = {"project_id": project_id}
+    with bind.begin() as conn:
+        # blocks issue writes (their triggers would race the rebuild) but not reads
+        conn.execute(text("LOCK TABLE issues IN SHARE MODE"))
+        conn.execute(text(f"""
+            CREATE TEMP TABLE stats_actual ON COMMIT DROP AS
+            SELECT project_id, status, priority, coalesce(assignee_id, 0) AS assignee_id, count(*)::int AS issue_count
+            FROM issues {scope} GROUP BY 1, 2, 3, 4
+        """), params)
+        drifted = conn.execute(text(f"""
+            SELECT count(*) FROM (SELECT * FROM project_issue_stats {scope}) s
+            FULL JOIN stats_actual a USING (project_id, status, priority, assignee_id)
+            WHERE coalesce(s.issue_count, 0) <> coalesce(a.issue_count, 0)
+        """), params).scalar()
+        if drifted:
+            conn.execute(text(f"DELETE FROM project_issue_stats {scope}"), params)
+            conn.execute(text("""
+                INSERT INTO project_issue_stats (project_id, status, priority, assignee_id, issue_count)
+                SELECT project_id, status, priority, assignee_id, issue_count FROM stats_actual
+            """))
+    if drifted:
+        logger.warning("issue stats drifted in %s buckets%s; rebuilt", drifted,
+                       f" of project {project_id}" if project_id is not None else "")
+    return drifted
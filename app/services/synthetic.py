@@ -0,0 +1,184 @@
+"""Deterministic synthetic users, projects, issues and comments at production scale.
+
+The same ``seed`` on the same starting database always yields the same rows. Volumes are skewed
+the way real trackers are: a few hot projects hold most issues, a few prolific users report,
+own and comment most, and comment threads are heavy-tailed. Rows get explicit ids following
+the current maximum, so foreign keys are known without round trips. They are written in
+batches, with ``COPY`` on PostgreSQL and multi-row INSERTs elsewhere.
+"""
+import csv
+import io
+import logging
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+from typing import Callable, Iterator
+
+from faker import Faker
+from sqlalchemy import Table, func, insert, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.security import hash_pw
+from app.models.comment import Comment
+from app.models.issue import Issue, IssuePriority, IssueStatus
+from app.models.project import Project
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# fixed by default so a seed reproduces the same timestamps too
+DEFAULT_UNTIL = datetime(2026, 1, 1, tzinfo=timezone.utc)
+DEFAULT_PASSWORD = "password"
+TEXT_POOL_SIZE = 2000
+PRIORITY_WEIGHTS = {IssuePriority.low: 3, IssuePriority.medium: 5, IssuePriority.high: 2}
+
+Progress = Callable[[str, int, int | None], None]
+
+
+@dataclass
+class SyntheticReport:
+    users: range
+    projects: range
+    issues: range
+    comments: range
+
+
+def _zipf(n: int, s: float) -> list[float]:
+    """Cumulative weights giving rank ``k`` a share proportional to ``1 / k**s``."""
+    return list(accumulate(1 / (k + 1) ** s for k in range(n)))
+
+
+def _next_id(conn: Connection, table: Table) -> int:
+    return (conn.execute(select(func.max(table.c.id))).scalar() or 0) + 1
+
+
+def _write(conn: Connection, table: Table, rows: list[dict]) -> None:
+    if not rows:
+        return
+    if conn.dialect.name != "postgresql":
+        conn.execute(insert(table), rows)
+        return
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    columns = list(rows[0])
+    for row in rows:
+        writer.writerow([v.isoformat() if isinstance(v, datetime) else getattr(v, "value", v) for v in row.values()])
+    buf.seek(0)
+    copy_columns = ", ".join(f'"{c}"' for c in columns)
+    conn.connection.cursor().copy_expert(f"COPY {table.name} ({copy_columns}) FROM STDIN WITH (FORMAT csv)", buf)
+
+
+def _batched(rows: Iterator[dict], size: int) -> Iterator[list[dict]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def generate(bind: Engine, users: int = 1_000, projects: int = 100, issues: int = 200_000,
+             comments: int = 1_000_000, seed: int = 0, until: datetime = DEFAULT_UNTIL, days: int = 730,
+             password: str = DEFAULT_PASSWORD, batch_size: int = 50_000,
+             progress: Progress | None = None) -> SyntheticReport:
+    """Append the dataset to ``bind``; every user logs in with ``password``."""
+    rng = random.Random(seed)
+    fake = Faker()
+    fake.seed_instance(seed)
+    start = until - timedelta(days=days)
+    password_hash = hash_pw(password)
+    # Faker is the slow part at millions of rows, so long texts come from a pool
+    paragraphs = [fake.paragraph(nb_sentences=rng.randint(1, 6)) for _ in range(TEXT_POOL_SIZE)]
+
+    with bind.connect() as conn:
+        first = {t: _next_id(conn, t.__table__) for t in (User, Project, Issue, Comment)}
+    user_ids = range(first[User], first[User] + users)
+    project_ids = range(first[Project], first[Project] + projects)
+    issue_ids = range(first[Issue], first[Issue] + issues)
+    comment_ids = range(first[Comment], first[Comment] + comments)
+    # prolific users and hot projects are the low ids
+    user_weights = _zipf(users, 1.1)
+    project_weights = _zipf(projects, 1.2)
+
+    def user_rows():
+        for user_id in user_ids:
+            yield {"id": user_id, "username": f"{fake.user_name()}{user_id}", "password_hash": password_hash,
+                   "created_at": start + (until - start) * rng.random() ** 3 / 2}
+
+    project_created = {}
+
+    def project_rows():
+        owners = rng.choices(user_ids, cum_weights=user_weights, k=projects)
+        for project_id, owner_id in zip(project_ids, owners):
+            project_created[project_id] = start + (until - start) * rng.random() / 2
+            yield {"id": project_id, "name": f"{fake.catch_phrase()} {project_id}"[:100],
+                   "desc": rng.choice(paragraphs), "created_at": project_created[project_id], "owner_id": owner_id}
+
+    issue_created: list[datetime] = []
+    issue_reporter: list[int] = []
+    issue_project: list[int] = []
+
+    def issue_rows():
+        seen: set[tuple[int, str]] = set()
+        for issue_id in issue_ids:
+            project_id = rng.choices(project_ids, cum_weights=project_weights)[0]
+            title = fake.sentence(nb_words=rng.randint(3, 8)).rstrip(".")[:100]
+            while (project_id, title) in seen:
+                title = fake.sentence(nb_words=rng.randint(3, 8)).rstrip(".")[:100]
+            seen.add((project_id, title))
+            # activity grows towards ``until``
+            created = until - (until - project_created[project_id]) * rng.random() ** 2
+            reporter_id = rng.choices(user_ids, cum_weights=user_weights)[0]
+            issue_created.append(created)
+            issue_reporter.append(reporter_id)
+            issue_project.append(project_id)
+            yield {
+                "id": issue_id,
+                "title": title,
+                "desc": rng.choice(paragraphs),
+                "status": IssueStatus.closed if rng.random() < (0.7 if until - created > timedelta(days=90) else 0.3)
+                          else IssueStatus.open,
+                "priority": rng.choices(list(PRIORITY_WEIGHTS), weights=list(PRIORITY_WEIGHTS.values()))[0],
+                "created_at": created,
+                "updated_at": created + (until - created) * rng.random() ** 3,
+                "project_id": project_id,
+                "reporter_id": reporter_id,
+                "assignee_id": None if rng.random() < 0.25 else rng.choices(user_ids, cum_weights=user_weights)[0],
+            }
+
+    def comment_rows():
+        # Pareto thread lengths: most issues get a handful of comments, a few get thousands
+        thread_weights = list(accumulate(rng.paretovariate(1.16) for _ in range(issues)))
+        for comment_id in comment_ids:
+            n = rng.choices(range(issues), cum_weights=thread_weights)[0]
+            created = issue_created[n] + (until - issue_created[n]) * rng.random()
+            yield {
+                "id": comment_id,
+                "content": rng.choice(paragraphs),
+                "created_at": created,
+                "updated_at": created,
+                "issue_id": issue_ids[n],
+                "project_id": issue_project[n],
+                "author_id": issue_reporter[n] if rng.random() < 0.3 else rng.choices(user_ids, cum_weights=user_weights)[0],
+            }
+
+    with bind.connect() as conn:
+        for stage, model, rows, total in (("users", User, user_rows(), users), ("projects", Project, project_rows(), projects),
+                                          ("issues", Issue, issue_rows(), issues), ("comments", Comment, comment_rows(), comments)):
+            done = 0
+            for batch in _batched(rows, batch_size):
+                _write(conn, model.__table__, batch)
+                conn.commit()
+                done += len(batch)
+                if progress:
+                    progress(stage, done, total)
+            logger.info("synthetic data: %s %s written", done, stage)
+            if conn.dialect.name == "postgresql":
+                conn.execute(text(f"SELECT setval(pg_get_serial_sequence('{model.__tablename__}', 'id'), "
+                                  f"(SELECT max(id) FROM {model.__tablename__}))"))
+        conn.execute(text("ANALYZE"))
+        conn.commit()
+    return SyntheticReport(users=user_ids, projects=project_ids, issues=issue_ids, comments=comment_ids)
@@ -0,0 +1,191 @@
+"""Seed a throwaway database, drive the API scenarios and compare latencies with a stored baseline.
+
+    python -m benchmarks.run                                   # in-process app on a temporary SQLite file
+    python -m benchmarks.run --database-url postgresql://...   # in-process app on a throwaway Postgres
+    python -m benchmarks.run --database-url postgresql://... --url http://127.0.0.1:8000   # running uvicorn
+
+All tables in ``--database-url`` are dropped and recreated so every run starts from the same dataset.
+With ``--url`` the server must use the same database, which is where the data is seeded.
+Exits with status 1 when a scenario's p95 or throughput is worse than the baseline by more than ``--tolerance``.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+
+
+def summarize(latencies: list[float], errors: int, elapsed: float) -> dict:
+    """Latency percentiles in milliseconds and requests per second for one scenario."""
+    ms = sorted(x * 1000 for x in latencies)
+    if len(ms) > 1:
+        cuts = statistics.quantiles(ms, n=100, method="inclusive")
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = ms[0] if ms else 0.0
+    return {
+        "requests": len(ms),
+        "errors": errors,
+        "p50_ms": round(p50, 2),
+        "p95_ms": round(p95, 2),
+        "p99_ms": round(p99, 2),
+        "rps": round(len(ms) / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], tolerance: float) -> list[str]:
+    """Regressions of ``results`` against ``baseline``: slower p95 or lower throughput beyond ``tolerance``."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result["errors"]:
+            regressions.append(f"{name}: {result['errors']} failed requests")
+        if result["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {result['p95_ms']}ms vs baseline {base['p95_ms']}ms")
+        if result["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: {result['rps']} req/s vs baseline {base['rps']} req/s")
+    return regressions
+
+
+async def run_scenario(client: httpx.AsyncClient, scenario, ds, requests: int, concurrency: int,
+                       warmup: int, sequence: itertools.count) -> dict:
+    for _ in range(warmup):
+        await scenario.call(client, ds, next(sequence))
+
+    latencies: list[float] = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            n = next(sequence)
+            start = time.perf_counter()
+            res = await scenario.call(client, ds, n)
+            latencies.append(time.perf_counter() - start)
+            if res.status_code >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+
+async def run(client: httpx.AsyncClient, ds, scenarios, requests: int, concurrency: int, warmup: int,
+              rounds: int = 1) -> dict[str, dict]:
+    """Run every scenario ``rounds`` times and keep, per scenario, the round with the median p95."""
+    for username in ds.usernames[:concurrency]:
+        res = await client.post("/auth/login", json={"username": username, "password": ds.password})
+        res.raise_for_status()
+        ds.tokens.append(res.json()["access_token"])
+
+    sequence = itertools.count()
+    rounds_by_scenario: dict[str, list[dict]] = {s.name: [] for s in scenarios}
+    for _ in range(rounds):
+        for scenario in scenarios:
+            n = max(1, int(requests * scenario.weight))
+            result = await run_scenario(client, scenario, ds, n, concurrency,
+                                        max(1, int(warmup * scenario.weight)), sequence)
+            rounds_by_scenario[scenario.name].append(result)
+            print(f"{scenario.name:<20} " + "  ".join(f"{k}={v}" for k, v in result.items()), file=sys.stderr)
+    return {name: sorted(results, key=lambda r: r["p95_ms"])[len(results) // 2]
+            for name, results in rounds_by_scenario.items()}
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="throwaway database to seed (default: a temporary SQLite file)")
+    parser.add_argument("--url", help="benchmark a running server instead of the in-process app")
+    parser.add_argument("--async-db", action="store_true", help="in-process: serve from the async handlers")
+    parser.add_argument("--no-reset", dest="reset", action="store_false", help="seed on top of the existing tables")
+    parser.add_argument("--scenario", action="append", help="only these scenarios (repeatable)")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--projects", type=int, default=20)
+    parser.add_argument("--issues", type=int, default=20_000)
+    parser.add_argument("--comments", type=int, default=60_000)
+    parser.add_argument("--requests", type=int, default=500, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=3, help="repeat the scenarios and report the median round")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown (default 0.25)")
+    parser.add_argument("--save-baseline", action="store_true", help="record this run as the baseline")
+    args = parser.parse_args(argv)
+
+    if args.url and not args.database_url:
+        parser.error("--url needs the --database-url the server is using, to seed it")
+    database_url = args.database_url or f"sqlite:///{tempfile.mkdtemp(prefix='bench-')}/bench.db"
+    # the app reads its settings on import
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.setdefault("TEST_DATABASE_URL", database_url)
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+
+    from sqlalchemy import make_url
+
+    from app.db.base import Base
+    from app.db.session import engine
+    from app.main import create_app
+    from benchmarks.scenarios import SCENARIOS
+    from benchmarks.seed import seed
+
+    scenarios = [s for s in SCENARIOS if not args.scenario or s.name in args.scenario]
+    if args.reset:
+        Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    started = time.perf_counter()
+    ds = seed(engine, users=max(args.users, args.concurrency), projects=args.projects, issues=args.issues,
+              comments=args.comments, seed=args.seed)
+    print(f"seeded in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+    if args.url:
+        target = "http"
+        client = httpx.AsyncClient(base_url=args.url, timeout=60)
+    else:
+        target = "async" if args.async_db else "sync"
+        # server errors are counted, not raised
+        transport = httpx.ASGITransport(app=create_app(async_db=args.async_db), raise_app_exceptions=False)
+        client = httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60)
+
+    async def go():
+        async with client:
+            return await run(client, ds, scenarios, args.requests, args.concurrency, args.warmup, args.rounds)
+
+    results = asyncio.run(go())
+
+    params = {k: getattr(args, k) for k in ("users", "projects", "issues", "comments", "requests", "concurrency",
+                                            "rounds", "seed")}
+    key = f"{make_url(database_url).get_backend_name()}-{target}"
+    baselines = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    print(json.dumps({"baseline": key, "params": params, "results": results}, indent=2))
+
+    if args.save_baseline:
+        baselines[key] = {"params": params, "results": {**baselines.get(key, {}).get("results", {}), **results}}
+        args.baseline.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        print(f"saved baseline {key} to {args.baseline}", file=sys.stderr)
+        return
+    baseline = baselines.get(key)
+    if baseline is None or baseline["params"] != params:
+        print(f"no baseline for {key} with these parameters, nothing to compare", file=sys.stderr)
+        return
+    regressions = compare(results, baseline["results"], args.tolerance)
+    for line in regressions:
+        print(f"REGRESSION {line}", file=sys.stderr)
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
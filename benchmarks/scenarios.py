@@ -0,0 +1,64 @@
+"""Request mixes driven against the seeded dataset; ``n`` is the request's sequence number."""
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+import httpx
+
+from app.models.issue import IssuePriority
+from benchmarks.seed import Dataset
+
+
+def _auth(ds: Dataset, n: int = 0) -> dict:
+    return {"Authorization": f"Bearer {ds.tokens[n % len(ds.tokens)]}"}
+
+
+def login(client: httpx.AsyncClient, ds: Dataset, n: int):
+    return client.post("/auth/login", json={"username": ds.usernames[n % len(ds.usernames)], "password": ds.password})
+
+
+def create_issue(client: httpx.AsyncClient, ds: Dataset, n: int):
+    project_id = ds.project_ids[n % len(ds.project_ids)]
+    return client.post(f"/projects/{project_id}/issues", headers=_auth(ds),
+                       json={"title": f"{ds.run_id} new {n}", "priority": "high"})
+
+
+def list_issues_sorted(client: httpx.AsyncClient, ds: Dataset, n: int):
+    project_id = ds.project_ids[n % len(ds.project_ids)]
+    return client.get(f"/projects/{project_id}/issues", headers=_auth(ds, n),
+                      params={"sort_by": "updated_at", "sort_dir": "desc", "limit": 50})
+
+
+def list_issues_search(client: httpx.AsyncClient, ds: Dataset, n: int):
+    project_id = ds.project_ids[n % len(ds.project_ids)]
+    return client.get(f"/projects/{project_id}/issues", headers=_auth(ds, n),
+                      params={"q": ds.search_terms[n % len(ds.search_terms)], "limit": 50})
+
+
+def list_comments(client: httpx.AsyncClient, ds: Dataset, n: int):
+    return client.get(f"/issues/{ds.hot_issue_id}/comments", headers=_auth(ds, n),
+                      params={"sort_by": "created_at", "limit": 50})
+
+
+def patch_issue(client: httpx.AsyncClient, ds: Dataset, n: int):
+    issue_id = ds.patch_issue_ids[n % len(ds.patch_issue_ids)]
+    priorities = list(IssuePriority)
+    return client.patch(f"/issues/{issue_id}", headers=_auth(ds),
+                        json={"priority": priorities[n % len(priorities)].value})
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    call: Callable[[httpx.AsyncClient, Dataset, int], Awaitable[httpx.Response]]
+    # bcrypt makes logins two orders of magnitude slower than everything else
+    weight: float = 1.0
+
+
+SCENARIOS = [
+    Scenario("login", login, weight=0.1),
+    Scenario("create_issue", create_issue),
+    Scenario("list_issues_sorted", list_issues_sorted),
+    Scenario("list_issues_search", list_issues_search),
+    Scenario("list_comments", list_comments),
+    Scenario("patch_issue", patch_issue),
+]
@@ -0,0 +1,56 @@
+"""Seed the benchmark dataset with the synthetic generator and pick the rows the scenarios use."""
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import Engine
+
+from app.models.comment import Comment
+from app.models.issue import Issue
+from app.models.user import User
+from app.services.synthetic import DEFAULT_PASSWORD, generate
+
+HOT_PROJECTS = 5
+SEARCH_TERMS = 10
+
+
+@dataclass
+class Dataset:
+    run_id: str
+    password: str
+    # most prolific first; the write scenarios authenticate as usernames[0]
+    usernames: list[str]
+    # the projects with the most issues
+    project_ids: list[int]
+    # issues reported by usernames[0]
+    patch_issue_ids: list[int]
+    # the issue with the longest comment thread
+    hot_issue_id: int
+    search_terms: list[str]
+    tokens: list[str] = field(default_factory=list)
+
+
+def seed(bind: Engine, users: int = 200, projects: int = 20, issues: int = 20_000, comments: int = 60_000,
+         seed: int = 0) -> Dataset:
+    report = generate(bind, users=users, projects=projects, issues=issues, comments=comments, seed=seed,
+                      batch_size=10_000)
+    first_issue, last_issue = report.issues[0], report.issues[-1]
+    with bind.connect() as conn:
+        usernames = conn.execute(select(User.username).where(User.id.between(report.users[0], report.users[-1]))
+                                 .order_by(User.id)).scalars().all()
+        project_ids = conn.execute(select(Issue.project_id).where(Issue.id.between(first_issue, last_issue))
+                                   .group_by(Issue.project_id).order_by(func.count().desc(), Issue.project_id)
+                                   .limit(HOT_PROJECTS)).scalars().all()
+        patch_issue_ids = conn.execute(select(Issue.id).where(Issue.id.between(first_issue, last_issue),
+                                                              Issue.reporter_id == report.users[0])
+                                       .order_by(Issue.id).limit(1000)).scalars().all()
+        hot_issue_id = conn.execute(select(Comment.issue_id).where(Comment.issue_id.between(first_issue, last_issue))
+                                    .group_by(Comment.issue_id).order_by(func.count().desc(), Comment.issue_id)
+                                    .limit(1)).scalar()
+        titles = conn.execute(select(Issue.title).where(Issue.project_id.in_(project_ids))
+                              .order_by(Issue.id).limit(2000)).scalars().all()
+    words = Counter(w.lower() for title in titles for w in title.split() if len(w) > 3)
+    return Dataset(run_id=f"bench-{uuid.uuid4().hex[:8]}", password=DEFAULT_PASSWORD, usernames=list(usernames),
+                   project_ids=list(project_ids), patch_issue_ids=list(patch_issue_ids), hot_issue_id=hot_issue_id,
+                   search_terms=[w for w, _ in words.most_common(SEARCH_TERMS)])
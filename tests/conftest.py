@@ -3,6 +3,8 @@ import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -10,7 +12,10 @@ load_dotenv()
 TEST_DATABASE_URL = os.environ["TEST_DATABASE_URL"]
 
 from app.db.base import Base
-from app.db.session import get_db
+from app.db.session import get_db, get_async_db, get_read_db, get_async_read_db, async_url
+from app.deps import principal_cache
+from app.core.counting import count_cache
+from app.core.response_cache import response_cache
 
 engine = create_engine(TEST_DATABASE_URL, pool_pre_ping=True)
 TestingSessionLocal = sessionmaker(
@@ -19,15 +24,26 @@ TestingSessionLocal = sessionmaker(
     bind=engine,
     expire_on_commit=False,
 )
+# every TestClient request runs on a fresh event loop, so async connections can't be pooled
+async_engine = create_async_engine(async_url(TEST_DATABASE_URL), poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(
+    autoflush=False,
+    bind=async_engine,
+    expire_on_commit=False,
+)
 
 @pytest.fixture(autouse=True, scope="function")
 def setup_and_teardown_db():
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
+    # ids are reused once the tables are recreated
+    principal_cache.clear()
+    count_cache.clear()
+    response_cache.clear()
     yield
     Base.metadata.drop_all(bind=engine)
 
-from app.main import app
+from app.main import create_app
 
 def override_get_db():
     db = TestingSessionLocal()
@@ -36,11 +52,20 @@ def override_get_db():
     finally:
         db.close()
 
-app.dependency_overrides[get_db] = override_get_db
+async def override_get_async_db():
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+
+apps = {"sync": create_app(async_db=False), "async": create_app(async_db=True)}
+for _app in apps.values():
+    _app.dependency_overrides[get_db] = override_get_db
+    _app.dependency_overrides[get_async_db] = override_get_async_db
+    _app.dependency_overrides[get_read_db] = override_get_db
+    _app.dependency_overrides[get_async_read_db] = override_get_async_db
 
-@pytest.fixture(scope="session")
-def client():
-    return TestClient(app)
+@pytest.fixture(scope="session", params=["sync", "async"])
+def client(request):
+    return TestClient(apps[request.param])
 
 def register_user(client, username: str, password: str):
     return client.post("/auth/register", json={"username": username, "password": password})
@@ -28,3 +28,21 @@ def test_change_password_and_relogin(client):
     t2 = login_token(client, "osimhen", "1905gala")
     assert isinstance(t2, str) and len(t2) > 10
 
+
+def test_password_hashing_sheds_load_when_queue_is_full(client, monkeypatch):
+    import threading
+    from app.core import security
+
+    register_user(client, username="osimhen", password="gala1905")
+    full = threading.BoundedSemaphore(1)
+    full.acquire()
+    monkeypatch.setattr(security, "_hash_slots", full)
+
+    r = client.post("/auth/login", json={"username": "osimhen", "password": "gala1905"})
+    assert r.status_code == 503
+    assert r.headers["Retry-After"] == "1"
+    assert security.password_hash_rejected_total.value(op="verify") >= 1
+
+    full.release()
+    assert login_token(client, "osimhen", "gala1905")
+    assert security.password_hash_seconds.count(op="verify") >= 1
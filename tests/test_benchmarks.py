@@ -0,0 +1,22 @@
+from benchmarks.run import compare, summarize
+
+def test_summarize_percentiles_and_throughput():
+    result = summarize([n / 1000 for n in range(1, 101)], errors=2, elapsed=2.0)
+    assert result["requests"] == 100
+    assert result["errors"] == 2
+    assert 50 <= result["p50_ms"] <= 51
+    assert 95 <= result["p95_ms"] <= 96
+    assert 99 <= result["p99_ms"] <= 100
+    assert result["rps"] == 50.0
+
+def test_compare_flags_regressions_beyond_tolerance():
+    baseline = {"list": {"p95_ms": 10.0, "rps": 100.0}, "patch": {"p95_ms": 10.0, "rps": 100.0}}
+    results = {
+        "list": {"errors": 0, "p95_ms": 12.0, "rps": 90.0},
+        "patch": {"errors": 1, "p95_ms": 20.0, "rps": 50.0},
+        "new": {"errors": 0, "p95_ms": 999.0, "rps": 1.0},
+    }
+    regressions = compare(results, baseline, tolerance=0.25)
+    assert not any(r.startswith("list") for r in regressions)
+    assert not any(r.startswith("new") for r in regressions)
+    assert len([r for r in regressions if r.startswith("patch")]) == 3
@@ -0,0 +1,115 @@
+import base64
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from app.services.changes import SOURCES, decode_changes_cursor, encode_changes_cursor, prune_tombstones
+from .conftest import engine, register_user, login_token, auth_headers
+
+def _sync(client, t, pid, since=None, limit=2):
+    changes = []
+    while True:
+        r = client.get(f"/projects/{pid}/changes", headers=auth_headers(t), params={"since": since, "limit": limit})
+        assert r.status_code == 200, r.text
+        body = r.json()
+        changes += body["changes"]
+        since = body["cursor"]
+        if not body["has_more"]:
+            return changes, since
+
+def test_changes_feed_reports_updates_and_deletes(client):
+    register_user(client, "osimhen", "gala")
+    t = login_token(client, "osimhen", "gala")
+    pid = client.post("/projects", headers=auth_headers(t), json={"name": "Sync"}).json()["id"]
+    other = client.post("/projects", headers=auth_headers(t), json={"name": "Other"}).json()["id"]
+    iids = [x["issue"]["id"] for x in client.post(f"/projects/{pid}/issues:batch", headers=auth_headers(t),
+                                                  json=[{"title": f"S{n}"} for n in range(3)]).json()]
+    cids = [client.post(f"/issues/{iids[n % 2]}/comments", headers=auth_headers(t), json={"content": f"c{n}"}).json()["id"]
+            for n in range(4)]
+    client.post(f"/projects/{other}/issues", headers=auth_headers(t), json={"title": "elsewhere"})
+
+    changes, cursor = _sync(client, t, pid)
+    assert {(c["kind"], c["id"]) for c in changes} == {("issue", i) for i in iids} | {("comment", c) for c in cids}
+    assert [c["changed_at"] for c in changes] == sorted(c["changed_at"] for c in changes)
+    assert all(not c["deleted"] and c[c["kind"]]["id"] == c["id"] for c in changes)
+    # nothing new, but the cursor still moves forward in time
+    changes, polled = _sync(client, t, pid, cursor)
+    assert changes == [] and decode_changes_cursor(polled)[0] == decode_changes_cursor(cursor)[0]
+
+    client.patch(f"/issues/{iids[2]}", headers=auth_headers(t), json={"status": "closed"})
+    client.delete(f"/comments/{cids[0]}", headers=auth_headers(t))
+    # cascades to cids[1] and cids[3]; the issue's tombstone stands for them
+    client.delete(f"/issues/{iids[1]}", headers=auth_headers(t))
+    changes, cursor = _sync(client, t, pid, cursor)
+    assert [(c["kind"], c["id"], c["deleted"]) for c in changes] == [
+        ("issue", iids[2], False), ("comment", cids[0], True), ("issue", iids[1], True)]
+    assert changes[0]["issue"]["status"] == "closed"
+    assert changes[1]["issue_id"] == iids[0]
+
+    # nothing is left behind for a deleted project
+    client.delete(f"/projects/{pid}", headers=auth_headers(t))
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM tombstones")).scalar() == 0
+    assert client.get(f"/projects/{pid}/changes", headers=auth_headers(t)).status_code == 404
+    assert client.get(f"/projects/{other}/changes", headers=auth_headers(t), params={"since": "garbage"}).status_code == 400
+
+def test_changes_wait_for_older_transactions(client):
+    register_user(client, "osimhen", "gala")
+    t = login_token(client, "osimhen", "gala")
+    uid = client.get("/users/me", headers=auth_headers(t)).json()["id"]
+    pid = client.post("/projects", headers=auth_headers(t), json={"name": "Sync"}).json()["id"]
+    _, cursor = _sync(client, t, pid)
+    with engine.connect() as slow:
+        # a transaction that only reads (an export, say) holds nothing back
+        slow.execute(text("SELECT 1"))
+        first = client.post(f"/projects/{pid}/issues", headers=auth_headers(t), json={"title": "read"}).json()["id"]
+        changes, cursor = _sync(client, t, pid, cursor)
+        assert [c["id"] for c in changes] == [first]
+        # when it writes after all, its rows are stamped then, not when it began
+        late = slow.execute(text("INSERT INTO issues (title, status, priority, project_id, reporter_id) "
+                                 "VALUES ('late', 'open', 'high', :pid, :uid) RETURNING id"),
+                            {"pid": pid, "uid": uid}).scalar()
+        # and anything written after it could still be followed by more of its rows
+        iid = client.post(f"/projects/{pid}/issues", headers=auth_headers(t), json={"title": "new"}).json()["id"]
+        changes, held = _sync(client, t, pid, cursor)
+        assert changes == [] and decode_changes_cursor(held)[0] == decode_changes_cursor(cursor)[0]
+        slow.commit()
+    changes, _ = _sync(client, t, pid, cursor)
+    assert [c["id"] for c in changes] == [late, iid]
+
+def test_expired_cursors_and_tombstone_retention(client):
+    register_user(client, "osimhen", "gala")
+    t = login_token(client, "osimhen", "gala")
+    pid = client.post("/projects", headers=auth_headers(t), json={"name": "Sync"}).json()["id"]
+    iids = [client.post(f"/projects/{pid}/issues", headers=auth_headers(t), json={"title": n}).json()["id"]
+            for n in ("old", "recent")]
+    _, cursor = _sync(client, t, pid)
+    for iid in iids:
+        client.delete(f"/issues/{iid}", headers=auth_headers(t))
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE tombstones SET deleted_at = now() - interval '40 days' WHERE entity_id = :id"),
+                     {"id": iids[0]})
+    assert prune_tombstones(engine) == 1
+    assert [c["id"] for c in _sync(client, t, pid, cursor)[0]] == [iids[1]]
+
+    positions, _ = decode_changes_cursor(cursor)
+    stale = encode_changes_cursor(positions, datetime.now(timezone.utc) - timedelta(days=31))
+    legacy = base64.urlsafe_b64encode(b"[null,null,null]").decode()
+    for since in (stale, legacy):
+        r = client.get(f"/projects/{pid}/changes", headers=auth_headers(t), params={"since": since})
+        assert r.status_code == 410, since
+
+def test_full_sync_pages_through_rows_older_than_the_retention(client):
+    register_user(client, "osimhen", "gala")
+    t = login_token(client, "osimhen", "gala")
+    pid = client.post("/projects", headers=auth_headers(t), json={"name": "Sync"}).json()["id"]
+    client.post(f"/projects/{pid}/issues:batch", headers=auth_headers(t), json=[{"title": f"S{n}"} for n in range(5)])
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE issues SET updated_at = now() - interval '90 days'"))
+    changes, cursor = _sync(client, t, pid)
+    assert len(changes) == 5 and decode_changes_cursor(cursor)[1] > datetime.now(timezone.utc) - timedelta(minutes=1)
+    # an incremental sync is only as complete as where it started until it has caught up
+    started = datetime.now(timezone.utc) - timedelta(days=29)
+    since = encode_changes_cursor(dict.fromkeys(SOURCES), started)
+    body = client.get(f"/projects/{pid}/changes", headers=auth_headers(t), params={"since": since, "limit": 2}).json()
+    assert body["has_more"] and decode_changes_cursor(body["cursor"])[1] == started
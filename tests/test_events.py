@@ -0,0 +1,153 @@
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.core.events import (EventBroker, Subscription, event_stream, events_overflows_total, get_event_broker,
+                             listen_url, sse_frame)
+from app.db.base import Base
+from app.db.session import async_url, get_async_db, get_async_read_db, get_db, get_read_db
+from app.main import create_app
+from .conftest import TEST_DATABASE_URL, register_user, login_token, auth_headers
+
+def _parse(frame: bytes) -> tuple[str, dict]:
+    event, data = frame.decode().strip().split("\n")
+    return event.removeprefix("event: "), json.loads(data.removeprefix("data: "))
+
+def test_write_paths_publish_project_events(client):
+    register_user(client, "osimhen", "gala")
+    t = login_token(client, "osimhen", "gala")
+    pid, other = (client.post("/projects", headers=auth_headers(t), json={"name": n}).json()["id"] for n in ("Live", "Quiet"))
+
+    def writes():
+        iid = client.post(f"/projects/{pid}/issues", headers=auth_headers(t), json={"title": "A"}).json()["id"]
+        # a rejected write announces nothing
+        assert client.post(f"/projects/{pid}/issues", headers=auth_headers(t), json={"title": "A"}).status_code == 409
+        client.post(f"/projects/{other}/issues", headers=auth_headers(t), json={"title": "elsewhere"})
+        batch = [x["issue"]["id"] for x in client.post(f"/projects/{pid}/issues:batch", headers=auth_headers(t),
+                                                       json=[{"title": "B"}, {"title": "C"}]).json()]
+        client.patch(f"/issues/{iid}", headers=auth_headers(t), json={"status": "closed"})
+        client.patch("/issues:bulk", headers=auth_headers(t), json={"ids": batch, "changes": {"priority": "high"}})
+        cid = client.post(f"/issues/{iid}/comments", headers=auth_headers(t), json={"content": "hi"}).json()["id"]
+        client.patch(f"/comments/{cid}", headers=auth_headers(t), json={"content": "hello"})
+        client.delete(f"/comments/{cid}", headers=auth_headers(t))
+        client.delete(f"/issues/{iid}", headers=auth_headers(t))
+        return iid, batch, cid
+
+    async def scenario():
+        broker = EventBroker(listen_url(TEST_DATABASE_URL), queue_size=16)
+        async with broker.subscribe(pid) as sub:
+            ids = await asyncio.to_thread(writes)
+            frames = [await asyncio.wait_for(sub.get(), 5) for _ in range(8)]
+            await asyncio.sleep(0.2)
+            assert sub.queue.empty()
+        await broker.close()
+        return ids, [_parse(f) for f in frames]
+
+    (iid, batch, cid), events = asyncio.run(scenario())
+    assert [(e, d["ids"]) for e, d in events] == [
+        ("issue.created", [iid]), ("issue.created", batch), ("issue.updated", [iid]), ("issue.updated", batch),
+        ("comment.created", [cid]), ("comment.updated", [cid]), ("comment.deleted", [cid]), ("issue.deleted", [iid])]
+    assert all(d["project_id"] == pid for _, d in events)
+    assert events[4][1]["issue_id"] == iid
+
+def test_slow_subscriber_gets_resync_instead_of_backlog():
+    sub = Subscription(queue_size=2)
+    before = events_overflows_total.value()
+    for n in range(3):
+        sub.push(sse_frame("issue.updated", json.dumps({"ids": [n]})))
+    assert sub.queue.qsize() == 1
+    assert _parse(sub.queue.get_nowait())[0] == "resync"
+    assert events_overflows_total.value() == before + 1
+
+def test_event_stream_frames_heartbeats_and_unsubscribes():
+    async def scenario():
+        broker = EventBroker(listen_url(TEST_DATABASE_URL), queue_size=4)
+        stream = event_stream(broker, 7, heartbeat=0.05)
+        assert await anext(stream) == b": connected\n\n"
+        broker.dispatch(json.dumps({"type": "issue.created", "project_id": 7, "ids": [1]}))
+        broker.dispatch(json.dumps({"type": "issue.created", "project_id": 8, "ids": [2]}))
+        assert _parse(await anext(stream)) == ("issue.created", {"type": "issue.created", "project_id": 7, "ids": [1]})
+        assert await anext(stream) == b": keepalive\n\n"
+        await stream.aclose()
+        assert not broker.subscribers
+        await broker.close()
+
+    asyncio.run(scenario())
+
+def test_events_endpoint_checks_project(client):
+    register_user(client, "osimhen", "gala")
+    t = login_token(client, "osimhen", "gala")
+    assert client.get("/projects/999/events", headers=auth_headers(t)).status_code == 404
+    assert client.get("/projects/999/events").status_code == 401
+
+def test_events_endpoint_fails_fast_without_a_listener(client):
+    register_user(client, "osimhen", "gala")
+    t = login_token(client, "osimhen", "gala")
+    pid = client.post("/projects", headers=auth_headers(t), json={"name": "Live"}).json()["id"]
+    # a malformed DSN fails inside the listener task, not in the request
+    broker = EventBroker("postgresql://postgres@localhost:notaport/mit", queue_size=4, connect_timeout=0.2)
+    client.app.dependency_overrides[get_event_broker] = lambda: broker
+    try:
+        res = client.get(f"/projects/{pid}/events", headers=auth_headers(t))
+    finally:
+        del client.app.dependency_overrides[get_event_broker]
+    assert res.status_code == 503
+
+@pytest.mark.parametrize("async_db", [False, True])
+def test_write_paths_work_without_notify_on_sqlite(tmp_path, async_db):
+    url = f"sqlite:///{tmp_path}/events.db"
+    sqlite_engine = create_engine(url)
+    Base.metadata.create_all(bind=sqlite_engine)
+    Local = sessionmaker(bind=sqlite_engine, autoflush=False, expire_on_commit=False)
+    async_sqlite_engine = create_async_engine(async_url(url), poolclass=NullPool)
+    AsyncLocal = async_sessionmaker(bind=async_sqlite_engine, autoflush=False, expire_on_commit=False)
+
+    def sqlite_db():
+        with Local() as db:
+            yield db
+
+    async def async_sqlite_db():
+        async with AsyncLocal() as db:
+            yield db
+
+    app = create_app(async_db=async_db)
+    for dep in (get_db, get_read_db):
+        app.dependency_overrides[dep] = sqlite_db
+    for dep in (get_async_db, get_async_read_db):
+        app.dependency_overrides[dep] = async_sqlite_db
+    client = TestClient(app)
+
+    register_user(client, "lite", "secret12")
+    t = login_token(client, "lite", "secret12")
+    pid = client.post("/projects", headers=auth_headers(t), json={"name": "Lite"}).json()["id"]
+    res = client.post(f"/projects/{pid}/issues", headers=auth_headers(t), json={"title": "A"})
+    assert res.status_code == 201, res.text
+    iid = res.json()["id"]
+    assert client.post(f"/projects/{pid}/issues:batch", headers=auth_headers(t), json=[{"title": "B"}]).status_code == 200
+    assert client.patch(f"/issues/{iid}", headers=auth_headers(t), json={"status": "closed"}).status_code == 200
+    assert client.patch("/issues:bulk", headers=auth_headers(t),
+                        json={"ids": [iid], "changes": {"priority": "high"}}).status_code == 200
+    cid = client.post(f"/issues/{iid}/comments", headers=auth_headers(t), json={"content": "hi"}).json()["id"]
+    assert client.patch(f"/comments/{cid}", headers=auth_headers(t), json={"content": "yo"}).status_code == 200
+    assert client.delete(f"/comments/{cid}", headers=auth_headers(t)).status_code == 204
+    assert client.delete(f"/issues/{iid}", headers=auth_headers(t)).status_code == 204
+    assert client.delete(f"/projects/{pid}", headers=auth_headers(t)).status_code == 204
+    sqlite_engine.dispose()
+
+def test_events_listen_where_the_stack_writes(monkeypatch):
+    from app.core import events
+    monkeypatch.setattr(events.settings, "DATABASE_URL", "postgresql+psycopg2://u@sync/db")
+    monkeypatch.setattr(events.settings, "ASYNC_DATABASE_URL", "postgresql+asyncpg://u@async/db")
+    monkeypatch.setattr(events.settings, "EVENTS_DATABASE_URL", None)
+    monkeypatch.setattr(events.settings, "ASYNC_DB", False)
+    assert events.events_url() == "postgresql+psycopg2://u@sync/db"
+    monkeypatch.setattr(events.settings, "ASYNC_DB", True)
+    assert listen_url(events.events_url()) == "postgresql://u@async/db"
+    monkeypatch.setattr(events.settings, "EVENTS_DATABASE_URL", "postgresql://u@direct/db")
+    assert events.events_url() == "postgresql://u@direct/db"
@@ -1,4 +1,6 @@
+from datetime import datetime
 from sqlalchemy.exc import IntegrityError
+from app.schemas.issue import IssueRead
 from .conftest import register_user, login_token, auth_headers
 
 def _create_project(client, token, name="P", desc=""):
@@ -76,3 +78,409 @@ def test_only_osimhenorter_can_modify_or_delete_issue(client):
 
     del_bad = client.delete(f"/issues/{iid}", headers=auth_headers(to))
     assert del_bad.status_code in (403, 404)
+
+def test_single_statement_writes_map_conflicts_and_missing_rows(client):
+    register_user(client, "osimhen", "gala")
+    t = login_token(client, "osimhen", "gala")
+    register_user(client, "icardi", "mauro")
+    to = login_token(client, "icardi", "mauro")
+    assert register_user(client, "osimhen", "other").status_code == 409
+    pid = _create_project(client, t, "P-Write")
+
+    assert client.post("/projects/9999/issues", headers=auth_headers(t), json={"title": "X"}).status_code == 404
+    assert client.post(f"/projects/{pid}/issues", headers=auth_headers(t),
+                       json={"title": "X", "assignee_id": 9999}).status_code == 422
+    a = client.post(f"/projects/{pid}/issues", headers=auth_headers(t), json={"title": "A"}).json()
+    b = client.post(f"/projects/{pid}/issues", headers=auth_headers(t), json={"title": "B"}).json()
+    assert a["created_at"] and a["updated_at"] and a["status"] == "open"
+
+    assert client.patch(f"/issues/{b['id']}", headers=auth_headers(t), json={"title": "A"}).status_code == 409
+    assert client.patch(f"/issues/{b['id']}", headers=auth_headers(t), json={"assignee_id": 9999}).status_code == 422
+    assert client.patch(f"/issues/{b['id']}", headers=auth_headers(to), json={"desc": "x"}).status_code == 403
+    assert client.patch(f"/issues/{b['id']}", headers=auth_headers(to), json={}).status_code == 403
+    assert client.patch("/issues/9999", headers=auth_headers(t), json={"desc": "x"}).status_code == 404
+    r = client.patch(f"/issues/{b['id']}", headers=auth_headers(t), json={})
+    assert r.status_code == 200 and r.json() == client.get(f"/issues/{b['id']}").json()
+    r = client.patch(f"/issues/{b['id']}", headers=auth_headers(t), json={"title": "B2", "priority": "high"})
+    assert r.json()["title"] == "B2" and r.json()["priority"] == "high"
+    assert datetime.fromisoformat(r.json()["updated_at"]) > datetime.fromisoformat(b["updated_at"])
+
+    cid = client.post(f"/issues/{a['id']}/comments", headers=auth_headers(t), json={"content": "c"}).json()["id"]
+    assert client.patch(f"/comments/{cid}", headers=auth_headers(to), json={"content": "x"}).status_code == 403
+    assert client.patch("/comments/9999", headers=auth_headers(t), json={"content": "x"}).status_code == 404
+    assert client.patch(f"/comments/{cid}", headers=auth_headers(t), json={"content": "d"}).json()["content"] == "d"
+
+def test_list_issues_cursor_pagination(client):
+    register_user(client, "osimhen", "gala")
+    t = login_token(client, "osimhen", "gala")
+    uid = client.get("/users/me", headers=auth_headers(t)).json()["id"]
+    pid = _create_project(client, t, "P-Pages")
+    created = []
+    for n in range(7):
+        body = {"title": f"Page {n}", "priority": ["low", "medium", "high"][n % 3],
+                "assignee_id": uid if n % 2 else None}
+        r = client.post(f"/projects/{pid}/issues", headers=auth_headers(t), json=body)
+        assert r.status_code == 201, r.text
+        created.append(r.json()["id"])
+
+    for sort_by in ("id", "priority", "assignee_id"):
+        for sort_dir in ("asc", "desc"):
+            params = {"sort_by": sort_by, "sort_dir": sort_dir}
+            full = client.get(f"/projects/{pid}/issues", headers=auth_headers(t), params={**params, "limit": 50})
+            assert "X-Next-Cursor" not in full.headers
+            seen, cursor = [], None
+            while True:
+                page_params = {**params, "limit": 3}
+                if cursor:
+                    page_params["cursor"] = cursor
+                r = client.get(f"/projects/{pid}/issues", headers=auth_headers(t), params=page_params)
+                assert r.status_code == 200, r.text
+                seen += [i["id"] for i in r.json()]
+                cursor = r.headers.get("X-Next-Cursor")
+                if not cursor:
+                    break
+            assert seen == [i["id"] for i in full.json()]
+            assert sorted(seen) == sorted(created)
+
+    bad = client.get(f"/projects/{pid}/issues", headers=auth_headers(t), params={"cursor": "nope"})
+    assert bad.status_code == 400
+    r = client.get(f"/projects/{pid}/issues", headers=auth_headers(t), params={"limit": 3})
+    mismatched = client.get(f"/projects/{pid}/issues", headers=auth_headers(t),
+                            params={"cursor": r.headers["X-Next-Cursor"], "sort_by": "title"})
+    assert mismatched.status_code == 400
+
+def test_list_issues_filters(client):
+    register_user(client, "osimhen", "gala")
+    t = login_token(client, "osimhen", "gala")
+    register_user(client, "icardi", "mauro")
+    to = login_token(client, "icardi", "mauro")
+    me = client.get("/users/me", headers=auth_headers(t)).json()["id"]
+    other = client.get("/users/me", headers=auth_headers(to)).json()["id"]
+    pid = _create_project(client, t, "P-Filter")
+    items = [{"title": f"F{n}", "priority": ["low", "medium", "high"][n % 3], "assignee_id": me if n % 2 else None}
+             for n in range(6)]
+    ids = [x["issue"]["id"] for x in client.post(f"/projects/{pid}/issues:batch", headers=auth_headers(t), json=items).json()]
+    theirs = client.post(f"/projects/{pid}/issues", headers=auth_headers(to), json={"title": "T", "priority": "high"}).json()["id"]
+    client.patch("/issues:bulk", headers=auth_headers(t), json={"ids": ids[:2], "changes": {"status": "closed"}})
+
+    def listed(**params):
+        r = client.get(f"/projects/{pid}/issues", headers=auth_headers(t), params={**params, "count": "estimate"})
+        assert r.status_code == 200, r.text
+        found = [i["id"] for i in r.json()]
+        assert r.headers["X-Total-Count"] == str(len(found))
+        return found
+
+    assert listed(status="closed") == ids[:2]
+    assert listed(status="open", priority="high") == [ids[2], ids[5], theirs]
+    assert listed(priority=["low", "medium"], status="open") == ids[3:5]
+    assert listed(assignee_id=me) == ids[1::2]
+    assert listed(assignee_id=me, status="open") == [ids[3], ids[5]]
+    assert listed(reporter_id=other) == [theirs]
+    assert listed(reporter_id=me, q="F5") == [ids[5]]
+    assert client.get(f"/projects/{pid}/issues", headers=auth_headers(t), params={"status": "wontfix"}).status_code == 422
+
+def test_list_bodies_match_schema_encoding(client):
+    register_user(client, "osimhen", "gala")
+    t = login_token(client, "osimhen", "gala")
+    uid = client.get("/users/me", headers=auth_headers(t)).json()["id"]
+    pid = _create_project(client, t, "P-Encode")
+    items = [{"title": "Çok önemli \"bug\" 🐛", "desc": "line\nbreak\ttab \u2028", "assignee_id": uid},
+             {"title": "Plain", "priority": "high"}]
+    ids = [x["issue"]["id"] for x in client.post(f"/projects/{pid}/issues:batch", headers=auth_headers(t), json=items).json()]
+    client.post(f"/issues/{ids[0]}/comments", headers=auth_headers(t), json={"content": "  naïve </script> \\ "})
+    client.post(f"/issues/{ids[0]}/comments", headers=auth_headers(t), json={"content": "second"})
+
+    listed = client.get(f"/projects/{pid}/issues", headers=auth_headers(t))
+    assert listed.headers["content-type"] == "application/json"
+    assert listed.content == b"[" + b",".join(client.get(f"/issues/{i}").content for i in ids) + b"]"
+    comments = client.get(f"/issues/{ids[0]}/comments", headers=auth_headers(t))
+    assert comments.content == b"[" + b",".join(client.get(f"/comments/{c['id']}").content for c in comments.json()) + b"]"
+    assert comments.json()[0]["content"] == "naïve </script> \\"
+
+def test_list_issues_total_count_modes(client):
+    register_user(client, "osimhen", "gala")
+    t = login_token(client, "osimhen", "gala")
+    pid = _create_project(client, t, "P-Count")
+    client.post(f"/projects/{pid}/issues:batch", headers=auth_headers(t), json=[{"title": f"Count {n}"} for n in range(5)])
+    url = f"/projects/{pid}/issues"
+
+    r = client.get(url, headers=auth_headers(t), params={"limit": 2})
+    assert "X-Total-Count" not in r.headers
+    for mode in ("exact", "cached", "estimate"):
+        for params in ({}, {"q": "Count"}):
+            r = client.get(url, headers=auth_headers(t), params={**params, "count": mode, "limit": 2})
+            assert r.headers["X-Total-Count"] == "5", (mode, params)
+    assert client.get(url, headers=auth_headers(t), params={"count": "exact", "q": "Count 1"}).headers["X-Total-Count"] == "1"
+
+    client.post(url, headers=auth_headers(t), json={"title": "Count 5"})
+    cached = client.get(url, headers=auth_headers(t), params={"count": "cached", "q": "Count"})
+    assert cached.headers["X-Total-Count"] == "5"
+    assert client.get(url, headers=auth_headers(t), params={"count": "exact", "q": "Count"}).headers["X-Total-Count"] == "6"
+    assert client.get(url, headers=auth_headers(t), params={"count": "exact"}).headers["X-Total-Count"] == "6"
+    assert client.get("/projects", headers=auth_headers(t), params={"count": "exact"}).headers["X-Total-Count"] == "1"
+    assert client.get(url, headers=auth_headers(t), params={"count": "bogus"}).status_code == 422
+
+def test_estimated_count_is_never_below_a_capped_exact_count():
+    import asyncio
+    from sqlalchemy import func, select
+    from app.core.counting import ESTIMATE_EXACT_BELOW, _planned_rows, explain, total_count, total_count_async
+    from .conftest import TestingAsyncSessionLocal, TestingSessionLocal
+    # the planner guesses a handful of rows for an expression filter; 2500 match
+    g = func.generate_series(1, 5000).table_valued("g").render_derived()
+    stmt = select(g.c.g).where(g.c.g % 2 == 0)
+    with TestingSessionLocal() as db:
+        assert _planned_rows(db.execute(explain(stmt)).scalar()) < ESTIMATE_EXACT_BELOW
+        assert total_count(db, stmt, "estimate") == ESTIMATE_EXACT_BELOW
+        assert total_count(db, stmt, "exact") == 2500
+
+    async def estimate():
+        async with TestingAsyncSessionLocal() as db:
+            return await total_count_async(db, stmt, "estimate")
+    assert asyncio.run(estimate()) == ESTIMATE_EXACT_BELOW
+
+def test_conditional_get_issue_comment_and_lists(client):
+    register_user(client, "osimhen", "gala")
+    t = login_token(client, "osimhen", "gala")
+    pid = _create_project(client, t, "P-ETag")
+    iid = client.post(f"/projects/{pid}/issues", headers=auth_headers(t), json={"title": "Polled"}).json()["id"]
+    cid = client.post(f"/issues/{iid}/comments", headers=auth_headers(t), json={"content": "first"}).json()["id"]
+
+    for url in (f"/issues/{iid}", f"/comments/{cid}", f"/projects/{pid}",
+                f"/projects/{pid}/issues", f"/issues/{iid}/comments"):
+        r = client.get(url, headers=auth_headers(t))
+        etag = r.headers["ETag"]
+        again = client.get(url, headers={**auth_headers(t), "If-None-Match": etag})
+        assert again.status_code == 304, url
+        assert again.headers["ETag"] == etag and again.content == b""
+        assert client.get(url, headers={**auth_headers(t), "If-None-Match": '"other", W/' + etag}).status_code == 304
+        assert client.get(url, headers={**auth_headers(t), "If-None-Match": '"other"'}).status_code == 200
+
+    issue_tag = client.get(f"/issues/{iid}").headers["ETag"]
+    list_tag = client.get(f"/projects/{pid}/issues", headers=auth_headers(t)).headers["ETag"]
+    page_tag = client.get(f"/projects/{pid}/issues", headers=auth_headers(t), params={"limit": 1}).headers["ETag"]
+    assert len({issue_tag, list_tag, page_tag}) == 3
+    client.patch(f"/issues/{iid}", headers=auth_headers(t), json={"status": "closed"})
+    r = client.get(f"/issues/{iid}", headers={"If-None-Match": issue_tag})
+    assert r.status_code == 200 and r.json()["status"] == "closed" and r.headers["ETag"] != issue_tag
+    r = client.get(f"/projects/{pid}/issues", headers={**auth_headers(t), "If-None-Match": list_tag})
+    assert r.status_code == 200 and r.headers["ETag"] != list_tag
+
+    # the validator covers the page, not the whole filter: a page that did not change still matches
+    client.post(f"/projects/{pid}/issues", headers=auth_headers(t), json={"title": "Second"})
+    first_page = {"limit": 1, "sort_by": "id"}
+    tags = {c: client.get(f"/projects/{pid}/issues", headers=auth_headers(t), params={**first_page, "count": c})
+            .headers["ETag"] for c in ("none", "exact")}
+    client.post(f"/projects/{pid}/issues", headers=auth_headers(t), json={"title": "Third"})
+    for c, tag in tags.items():
+        r = client.get(f"/projects/{pid}/issues", headers={**auth_headers(t), "If-None-Match": tag},
+                       params={**first_page, "count": c})
+        assert r.status_code == (304 if c == "none" else 200), c
+
+    comment_list_tag = client.get(f"/issues/{iid}/comments", headers=auth_headers(t)).headers["ETag"]
+    client.delete(f"/comments/{cid}", headers=auth_headers(t))
+    assert client.get(f"/issues/{iid}/comments",
+                      headers={**auth_headers(t), "If-None-Match": comment_list_tag}).status_code == 200
+    assert client.get(f"/comments/{cid}", headers={"If-None-Match": "*"}).status_code == 404
+
+def test_hot_reads_are_cached_and_invalidated_by_writes(client):
+    from app.core.response_cache import response_cache_requests_total as lookups
+
+    register_user(client, "osimhen", "gala")
+    t = login_token(client, "osimhen", "gala")
+    pid = _create_project(client, t, "P-Cache")
+    iid = client.post(f"/projects/{pid}/issues", headers=auth_headers(t), json={"title": "Hot"}).json()["id"]
+    cid = client.post(f"/issues/{iid}/comments", headers=auth_headers(t), json={"content": "first"}).json()["id"]
+
+    hits = lookups.value(kind="issue", result="hit")
+    first = client.get(f"/issues/{iid}")
+    second = client.get(f"/issues/{iid}")
+    assert second.content == first.content and second.headers["ETag"] == first.headers["ETag"]
+    assert lookups.value(kind="issue", result="hit") == hits + 1
+    assert client.get(f"/issues/{iid}", headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+
+    client.patch(f"/issues/{iid}", headers=auth_headers(t), json={"priority": "high"})
+    assert client.get(f"/issues/{iid}").json()["priority"] == "high"
+    client.patch("/issues:bulk", headers=auth_headers(t), json={"ids": [iid], "changes": {"status": "closed"}})
+    assert client.get(f"/issues/{iid}").json()["status"] == "closed"
+
+    assert client.get(f"/comments/{cid}").json()["content"] == "first"
+    client.patch(f"/comments/{cid}", headers=auth_headers(t), json={"content": "edited"})
+    assert client.get(f"/comments/{cid}").json()["content"] == "edited"
+
+    me = client.get("/users/me", headers=auth_headers(t)).json()
+    assert client.get(f"/users/{me['id']}", headers=auth_headers(t)).json() == me
+    assert client.get(f"/users/{me['id']}", headers=auth_headers(t)).json() == me
+
+    doomed = client.post(f"/projects/{pid}/issues", headers=auth_headers(t), json={"title": "Doomed"}).json()["id"]
+    doomed_cid = client.post(f"/issues/{doomed}/comments", headers=auth_headers(t), json={"content": "gone"}).json()["id"]
+    client.get(f"/comments/{doomed_cid}")
+    client.delete(f"/issues/{doomed}", headers=auth_headers(t))
+    assert client.get(f"/comments/{doomed_cid}").status_code == 404
+
+    client.get(f"/projects/{pid}")
+    client.delete(f"/projects/{pid}", headers=auth_headers(t))
+    for url in (f"/projects/{pid}", f"/issues/{iid}", f"/comments/{cid}"):
+        assert client.get(url).status_code == 404, url
+
+def test_project_generations_expire_with_their_entries():
+    import time
+    from app.core.response_cache import MemoryBackend, ResponseCache, _generation_key
+    from app.schemas.project import ProjectRead
+
+    cache = ResponseCache(MemoryBackend(4, 0.2))
+    model = ProjectRead(id=1, name="P", created_at=datetime.now(), owner_id=1)
+    for pid in range(10):
+        cache.store("issue", pid, '"e"', model, pid)
+    assert len(cache.backend._cache) <= 4
+
+    cache.store("issue", 1, '"e"', model, 1)
+    generation = cache.backend.get(_generation_key(1))
+    time.sleep(0.15)
+    # each store renews the generation its entry was stored under
+    cache.store("issue", 2, '"e"', model, 1)
+    time.sleep(0.15)
+    assert cache.backend.get(_generation_key(1)) == generation
+    time.sleep(0.25)
+    assert cache.backend.get(_generation_key(1)) is None
+
+def test_blocking_cache_backend_stays_off_the_event_loop(monkeypatch):
+    import asyncio
+    from fastapi.testclient import TestClient
+    from app.core.response_cache import MemoryBackend, response_cache
+    from .conftest import apps
+
+    calls = []
+
+    class SlowBackend(MemoryBackend):
+        blocking = True
+
+        def get(self, key):
+            calls.append(_on_event_loop())
+            return super().get(key)
+
+        def set(self, key, value):
+            calls.append(_on_event_loop())
+            super().set(key, value)
+
+    def _on_event_loop():
+        try:
+            asyncio.get_running_loop()
+            return True
+        except RuntimeError:
+            return False
+
+    monkeypatch.setattr(response_cache, "backend", SlowBackend(100, 30))
+    client = TestClient(apps["async"])
+    register_user(client, "osimhen", "gala")
+    t = login_token(client, "osimhen", "gala")
+    pid = _create_project(client, t, "P-Slow")
+    iid = client.post(f"/projects/{pid}/issues", headers=auth_headers(t), json={"title": "Hot"}).json()["id"]
+    assert client.get(f"/issues/{iid}").content == client.get(f"/issues/{iid}").content
+    assert calls and not any(calls)
+
+def test_issue_batch_create_reports_per_item_results(client):
+    register_user(client, "osimhen", "gala")
+    t = login_token(client, "osimhen", "gala")
+    uid = client.get("/users/me", headers=auth_headers(t)).json()["id"]
+    pid = _create_project(client, t, "P-Batch")
+    client.post(f"/projects/{pid}/issues", headers=auth_headers(t), json={"title": "Existing"})
+
+    items = [{"title": f"Alert {n}", "priority": "high", "assignee_id": uid} for n in range(300)]
+    items += [{"title": "Existing"}, {"title": "Alert 0"}, {"title": "Ghost", "assignee_id": 9999}]
+    r = client.post(f"/projects/{pid}/issues:batch", headers=auth_headers(t), json=items)
+    assert r.status_code == 200, r.text
+    results = r.json()
+    assert [x["index"] for x in results] == list(range(len(items)))
+    assert all(x["status"] == "created" for x in results[:300])
+    assert results[0]["issue"]["title"] == "Alert 0" and results[0]["issue"]["reporter_id"] == uid
+    assert [x["status"] for x in results[300:]] == ["conflict", "conflict", "invalid_assignee"]
+
+    lst = client.get(f"/projects/{pid}/issues", headers=auth_headers(t), params={"limit": 200, "q": "Alert"})
+    assert len(lst.json()) == 200
+
+    assert client.post(f"/projects/{pid}/issues:batch", headers=auth_headers(t), json=[]).status_code == 422
+    assert client.post("/projects/9999/issues:batch", headers=auth_headers(t), json=items[:1]).status_code == 404
+
+def test_issue_bulk_update_by_ids_and_filter(client):
+    register_user(client, "osimhen", "gala")
+    t = login_token(client, "osimhen", "gala")
+    register_user(client, "icardi", "mauro")
+    to = login_token(client, "icardi", "mauro")
+    pid = _create_project(client, t, "P-Bulk")
+
+    mine = [client.post(f"/projects/{pid}/issues", headers=auth_headers(t), json={"title": f"Mine {n}"}).json()["id"]
+            for n in range(4)]
+    theirs = client.post(f"/projects/{pid}/issues", headers=auth_headers(to), json={"title": "Theirs"}).json()["id"]
+
+    r = client.patch("/issues:bulk", headers=auth_headers(t),
+                     json={"ids": mine[:2] + [theirs, 9999], "changes": {"status": "closed", "priority": "high"}})
+    assert r.status_code == 200, r.text
+    assert r.json() == [{"id": mine[0], "status": "updated"}, {"id": mine[1], "status": "updated"},
+                        {"id": theirs, "status": "forbidden"}, {"id": 9999, "status": "not_found"}]
+    assert client.get(f"/issues/{mine[0]}").json()["status"] == "closed"
+    assert client.get(f"/issues/{mine[0]}").json()["priority"] == "high"
+    assert client.get(f"/issues/{theirs}").json()["status"] == "open"
+
+    r = client.patch("/issues:bulk", headers=auth_headers(t),
+                     json={"filter": {"project_id": pid, "status": "open"}, "changes": {"priority": "low"}})
+    assert [x["id"] for x in r.json()] == sorted(mine[2:])
+    assert client.get(f"/issues/{theirs}").json()["priority"] == "medium"
+
+    bad = [{"ids": mine, "filter": {"project_id": pid}, "changes": {"status": "open"}},
+           {"ids": mine, "changes": {}},
+           {"ids": mine, "changes": {"title": "Same"}},
+           {"filter": {}, "changes": {"status": "open"}}]
+    for body in bad:
+        assert client.patch("/issues:bulk", headers=auth_headers(t), json=body).status_code == 422
+
+def test_include_embeds_relations_and_aggregates_set_based(client):
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    register_user(client, "osimhen", "gala")
+    t = login_token(client, "osimhen", "gala")
+    icardi = register_user(client, "icardi", "mauro").json()
+    pid = _create_project(client, t, "P-Include")
+    ids = [client.post(f"/projects/{pid}/issues", headers=auth_headers(t),
+                       json={"title": f"Board {n}", "assignee_id": icardi["id"] if n % 2 else None}).json()["id"]
+           for n in range(3)]
+    for n in range(3):
+        client.post(f"/issues/{ids[0]}/comments", headers=auth_headers(t), json={"content": f"c{n}"})
+
+    url = f"/projects/{pid}/issues"
+    include = {"include": ["reporter", "assignee", "comment_count", "latest_comment"]}
+    r = client.get(url, headers=auth_headers(t), params=include)
+    assert r.status_code == 200, r.text
+    first, second, third = r.json()
+    assert first["reporter"]["username"] == "osimhen" and "password_hash" not in first["reporter"]
+    assert first["assignee"] is None and second["assignee"] == icardi
+    assert (first["comment_count"], second["comment_count"]) == (3, 0)
+    assert first["latest_comment"]["content"] == "c2" and second["latest_comment"] is None
+    assert set(client.get(url, headers=auth_headers(t)).json()[0]) == set(IssueRead.model_fields)
+    assert set(client.get(url, headers=auth_headers(t), params={"include": "comment_count"}).json()[0]) \
+        == set(IssueRead.model_fields) | {"comment_count"}
+
+    one = client.get(f"/issues/{ids[0]}", params=include)
+    assert one.json() == first
+    assert client.get(f"/issues/{ids[0]}", params={"include": "bogus"}).status_code == 422
+
+    # a new comment doesn't touch the issue, but must still change the expanded ETag
+    etag = r.headers["ETag"]
+    assert client.get(url, headers={**auth_headers(t), "If-None-Match": etag}, params=include).status_code == 304
+    client.post(f"/issues/{ids[2]}/comments", headers=auth_headers(t), json={"content": "late"})
+    r = client.get(url, headers={**auth_headers(t), "If-None-Match": etag}, params=include)
+    assert r.status_code == 200 and r.json()[2]["comment_count"] == 1
+
+    statements = []
+    def count(*args):
+        statements.append(1)
+    event.listen(Engine, "before_cursor_execute", count)
+    try:
+        for limit in (1, 3):
+            statements.clear()
+            client.get(url, headers=auth_headers(t), params={**include, "limit": limit})
+            if limit == 1:
+                small = len(statements)
+    finally:
+        event.remove(Engine, "before_cursor_execute", count)
+    assert len(statements) == small
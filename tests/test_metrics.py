@@ -0,0 +1,43 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import create_app
+from .conftest import apps, register_user, login_token, auth_headers
+
+def _setup(client):
+    register_user(client, "osimhen", "gala1905")
+    token = login_token(client, "osimhen", "gala1905")
+    pid = client.post("/projects", json={"name": "P", "desc": ""}, headers=auth_headers(token)).json()["id"]
+    for n in range(3):
+        client.post(f"/projects/{pid}/issues", json={"title": f"t{n}"}, headers=auth_headers(token))
+    return token, pid
+
+def test_metrics_endpoint_reports_routes_and_sql(client):
+    token, pid = _setup(client)
+    assert client.get(f"/projects/{pid}/issues", headers=auth_headers(token)).status_code == 200
+    client.get("/no/such/path")
+
+    res = client.get("/metrics")
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/plain")
+    body = res.text
+    assert '# TYPE http_request_duration_seconds histogram' in body
+    assert 'http_request_duration_seconds_count{method="GET",route="/projects/{project_id}/issues",status="200"}' in body
+    assert 'route="unmatched"' in body
+    assert 'db_statements_per_request_sum{route="/projects/{project_id}/issues"}' in body
+    assert 'db_pool_connections{pool="sync",state="size"}' in body
+
+def test_debug_headers_count_statements(client, monkeypatch):
+    monkeypatch.setattr(settings, "DEBUG", True)
+    kind = "async" if client.app is apps["async"] else "sync"
+    app = create_app(async_db=kind == "async")
+    app.dependency_overrides = apps[kind].dependency_overrides
+    debug_client = TestClient(app)
+
+    token, pid = _setup(debug_client)
+    res = debug_client.get(f"/projects/{pid}/issues", headers=auth_headers(token))
+    assert res.status_code == 200
+    assert int(res.headers["X-DB-Queries"]) >= 1
+    assert res.headers["X-DB-Time"].endswith("ms")
+    assert res.headers["X-Response-Time"].endswith("ms")
+    assert "X-DB-Queries" not in client.get("/health").headers
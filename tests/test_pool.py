@@ -0,0 +1,44 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError
+
+from app.db.pool import InstrumentedQueuePool, ping_when_idle, pool_stats, db_pool_stale_total, db_pool_timeouts_total
+from .conftest import TEST_DATABASE_URL
+
+
+def make_engine(**kw):
+    return create_engine(TEST_DATABASE_URL, poolclass=InstrumentedQueuePool, **kw)
+
+def test_pool_timeout_is_counted():
+    eng = make_engine(pool_size=1, max_overflow=0, pool_timeout=0.1)
+    before = db_pool_timeouts_total.value(pool="sync")
+    with eng.connect():
+        with pytest.raises(TimeoutError):
+            eng.connect()
+        stats = pool_stats(eng.pool)
+        assert stats["checked_out"] == 1
+        assert stats["size"] == 1
+    assert db_pool_timeouts_total.value(pool="sync") == before + 1
+    eng.dispose()
+
+def test_idle_ping_replaces_dead_connection():
+    eng = make_engine(pool_size=1, max_overflow=0)
+    ping_when_idle(eng.pool, 0)
+    with eng.connect() as conn:
+        pid = conn.execute(text("SELECT pg_backend_pid()")).scalar()
+    with make_engine().connect() as admin:
+        admin.execute(text("SELECT pg_terminate_backend(:pid)"), {"pid": pid})
+
+    before = db_pool_stale_total.value(pool="sync")
+    with eng.connect() as conn:
+        assert conn.execute(text("SELECT pg_backend_pid()")).scalar() != pid
+    assert db_pool_stale_total.value(pool="sync") == before + 1
+    eng.dispose()
+
+def test_health_pool(client):
+    res = client.get("/health/pool")
+    assert res.status_code == 200
+    pools = {p["pool"]: p for p in res.json()["pools"]}
+    assert set(pools) == {"sync", "async"}
+    for key in ("size", "checked_out", "overflow", "checkouts", "wait_seconds_total", "timeouts", "stale"):
+        assert key in pools["sync"]
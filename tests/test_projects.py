@@ -47,3 +47,111 @@ def test_only_owner_can_delete_project(client):
 
     d_bad = client.delete(f"/projects/{pid}", headers=auth_headers(tx))
     assert d_bad.status_code == 403
+
+def test_export_project_streams_ndjson_and_csv(client):
+    import csv
+    import io
+    import json
+
+    register_user(client, "osimhen", "gala")
+    tok = login_token(client, "osimhen", "gala")
+    pid = client.post("/projects", headers=auth_headers(tok), json={"name": "Exp", "desc": ""}).json()["id"]
+    items = [{"title": f"Issue {n}", "desc": "line one\nline \"two\""} for n in range(5)]
+    ids = [x["issue"]["id"] for x in client.post(f"/projects/{pid}/issues:batch", headers=auth_headers(tok), json=items).json()]
+    client.post(f"/issues/{ids[0]}/comments", headers=auth_headers(tok), json={"content": "ünïcode, comma"})
+
+    r = client.get(f"/projects/{pid}/export", headers=auth_headers(tok))
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in r.text.splitlines()]
+    assert [x["id"] for x in records] == ids
+    assert records[0]["type"] == "issue" and records[0]["desc"] == "line one\nline \"two\""
+    assert records[0] == {"type": "issue", **client.get(f"/issues/{ids[0]}").json()}
+
+    r = client.get(f"/projects/{pid}/export", headers=auth_headers(tok), params={"format": "csv", "include_comments": True})
+    assert r.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(r.text)))
+    assert [x["type"] for x in rows] == ["issue"] * 5 + ["comment"]
+    assert rows[-1]["content"] == "ünïcode, comma" and rows[-1]["issue_id"] == str(ids[0])
+
+    assert client.get("/projects/9999/export", headers=auth_headers(tok)).status_code == 404
+
+def test_import_round_trips_export_and_reports_rejects(client):
+    import json
+
+    register_user(client, "osimhen", "gala")
+    tok = login_token(client, "osimhen", "gala")
+    register_user(client, "icardi", "mauro")
+    other = login_token(client, "icardi", "mauro")
+    src = client.post("/projects", headers=auth_headers(tok), json={"name": "Src", "desc": ""}).json()["id"]
+    dst = client.post("/projects", headers=auth_headers(tok), json={"name": "Dst", "desc": ""}).json()["id"]
+    items = [{"title": f"Issue {n}", "priority": "high", "status": "closed"} for n in range(4)]
+    ids = [x["issue"]["id"] for x in client.post(f"/projects/{src}/issues:batch", headers=auth_headers(tok), json=items).json()]
+    client.post(f"/issues/{ids[1]}/comments", headers=auth_headers(tok), json={"content": "keep me"})
+    kept = client.post(f"/projects/{dst}/issues", headers=auth_headers(tok), json={"title": "Issue 0", "priority": "low"}).json()
+
+    dump = client.get(f"/projects/{src}/export", headers=auth_headers(tok), params={"include_comments": True}).text
+    extra = [{"title": "Bad", "status": "wontfix"}, {"title": "Issue 1"}, {"type": "comment", "issue_id": 424242, "content": "x"}]
+    body = dump + "\n".join(json.dumps(x) for x in extra) + "\nnot json\n"
+
+    r = client.post(f"/projects/{dst}/import", headers=auth_headers(tok), content=body.encode())
+    assert r.status_code == 200, r.text
+    report = r.json()
+    assert report["issues_created"] == 3 and report["issues_skipped"] == 1
+    assert report["comments_created"] == 1 and report["rejected"] == 4
+    assert [e["error"] for e in report["errors"]] == ["invalid status", "duplicate title in import",
+                                                     "unknown issue_id", "invalid record"]
+
+    imported = client.get(f"/projects/{dst}/issues", headers=auth_headers(tok), params={"q": "Issue 1"}).json()[0]
+    assert imported["status"] == "closed" and imported["priority"] == "high"
+    comments = client.get(f"/issues/{imported['id']}/comments", headers=auth_headers(tok)).json()
+    assert [c["content"] for c in comments] == ["keep me"]
+
+    # cached before the import, dropped with the project's generation
+    assert client.get(f"/issues/{kept['id']}").json()["priority"] == "low"
+    r = client.post(f"/projects/{dst}/import", headers=auth_headers(tok), params={"on_conflict": "update"},
+                    content=dump.encode())
+    assert r.json()["issues_updated"] == 4
+    assert client.get(f"/issues/{kept['id']}").json()["priority"] == "high"
+    existing = client.get(f"/projects/{dst}/issues", headers=auth_headers(tok), params={"q": "Issue 0"}).json()[0]
+    assert existing["priority"] == "high"
+
+    csv_dump = client.get(f"/projects/{src}/export", headers=auth_headers(tok), params={"format": "csv"}).text
+    r = client.post(f"/projects/{dst}/import", headers=auth_headers(tok), params={"format": "csv"},
+                    content=csv_dump.encode())
+    assert r.json()["issues_skipped"] == 4
+
+    assert client.post(f"/projects/{dst}/import", headers=auth_headers(other), content=dump.encode()).status_code == 403
+
+def test_project_stats_follow_issue_writes_and_rebuild(client):
+    from sqlalchemy import text
+    from app.services.stats import rebuild_project_stats
+    from .conftest import engine
+
+    register_user(client, "osimhen", "gala")
+    tok = login_token(client, "osimhen", "gala")
+    me = client.get("/users/me", headers=auth_headers(tok)).json()["id"]
+    pid = client.post("/projects", headers=auth_headers(tok), json={"name": "Stats", "desc": ""}).json()["id"]
+    items = [{"title": f"Issue {n}", "priority": "high" if n < 2 else "low"} for n in range(5)]
+    ids = [x["issue"]["id"] for x in client.post(f"/projects/{pid}/issues:batch", headers=auth_headers(tok), json=items).json()]
+    client.patch(f"/issues/{ids[0]}", headers=auth_headers(tok), json={"status": "closed", "assignee_id": me})
+    client.patch("/issues:bulk", headers=auth_headers(tok), json={"ids": ids[3:], "changes": {"priority": "medium"}})
+    client.delete(f"/issues/{ids[2]}", headers=auth_headers(tok))
+
+    expected = {
+        "project_id": pid, "total": 4,
+        "by_status": {"open": 3, "closed": 1},
+        "by_priority": {"low": 0, "medium": 2, "high": 2},
+        "open_by_priority": {"low": 0, "medium": 2, "high": 1},
+        "by_assignee": [{"assignee_id": None, "open": 3, "total": 3}, {"assignee_id": me, "open": 0, "total": 1}],
+    }
+    r = client.get(f"/projects/{pid}/stats")
+    assert r.status_code == 200, r.text
+    assert r.json() == expected
+    assert client.get("/projects/9999/stats").status_code == 404
+
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE project_issue_stats SET issue_count = issue_count + 7 WHERE project_id = :p"), {"p": pid})
+    assert rebuild_project_stats(engine, pid) > 0
+    assert client.get(f"/projects/{pid}/stats").json() == expected
+    assert rebuild_project_stats(engine) == 0
@@ -0,0 +1,113 @@
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from starlette.requests import Request
+
+from app.core.cache import MemoryBackend
+from app.core.security import create_token
+from app.db import replicas, session
+from app.db.pool import InstrumentedQueuePool, labelled, pool_stats
+from app.db.replicas import ReadYourWritesMiddleware, RecentWriters, ReplicaSet, reads_own_writes
+from .conftest import (TEST_DATABASE_URL, TestingAsyncSessionLocal, TestingSessionLocal, async_engine, auth_headers,
+                       login_token, register_user)
+
+
+def make_replica(label):
+    return create_engine(TEST_DATABASE_URL, poolclass=labelled(InstrumentedQueuePool, label))
+
+def request_as(user_id: int | None = None) -> Request:
+    headers = [(b"authorization", f"Bearer {create_token(user_id)}".encode())] if user_id else []
+    return Request({"type": "http", "headers": headers})
+
+@pytest.fixture
+def writers(monkeypatch):
+    writers = RecentWriters(MemoryBackend(100, 5), enabled=True)
+    monkeypatch.setattr(replicas, "recent_writers", writers)
+    return writers
+
+def test_replica_set_routing():
+    a, b = make_replica("replica0"), make_replica("replica1")
+    assert not ReplicaSet([])
+    turns = ReplicaSet([a, b])
+    assert [turns.pick() for _ in range(4)] == [a, b, a, b]
+
+    least = ReplicaSet([a, b], "least_connections")
+    with a.connect():
+        assert least.pick() is b
+        with b.connect(), b.connect():
+            assert least.pick() is a
+    assert pool_stats(a.pool)["pool"] == "replica0"
+    a.dispose()
+    b.dispose()
+
+def test_read_sessions_stay_on_primary_after_a_write(monkeypatch, writers):
+    replica = make_replica("replica0")
+    monkeypatch.setattr(session, "replicas", ReplicaSet([replica]))
+
+    writers.mark(7)
+    for user_id, bind in ((None, replica), (8, replica), (7, session.engine)):
+        gen = session.get_read_db(request_as(user_id))
+        assert next(gen).get_bind() is bind, user_id
+        gen.close()
+
+    assert reads_own_writes(request_as(7)) and not reads_own_writes(request_as(8))
+    monkeypatch.setattr(writers, "enabled", False)
+    assert not reads_own_writes(request_as(7))
+    replica.dispose()
+
+def test_successful_writes_mark_the_user(writers):
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware)
+
+    @app.get("/thing")
+    @app.post("/thing", status_code=201)
+    def thing():
+        return {}
+
+    @app.delete("/thing")
+    def refuse():
+        raise HTTPException(403)
+
+    client = TestClient(app)
+    token = {"Authorization": f"Bearer {create_token(1)}"}
+    client.get("/thing", headers=token)
+    client.delete("/thing", headers=token)
+    client.post("/thing")
+    assert 1 not in writers
+    client.post("/thing", headers=token)
+    assert 1 in writers
+
+def test_token_only_client_reads_its_own_write(client, monkeypatch, writers):
+    # a replica that serves reads whenever the user has not just written; its queries are counted
+    replica = make_replica("replica0")
+    async_replica = create_async_engine(session.async_url(TEST_DATABASE_URL), poolclass=NullPool)
+    replica_queries = []
+    for eng in (replica, async_replica.sync_engine):
+        event.listen(eng, "before_cursor_execute", lambda *args: replica_queries.append(args[2]))
+    monkeypatch.setattr(session, "SessionLocal", TestingSessionLocal)
+    monkeypatch.setattr(session, "AsyncSessionLocal", TestingAsyncSessionLocal)
+    monkeypatch.setattr(session, "async_engine", async_engine)
+    monkeypatch.setattr(session, "replicas", ReplicaSet([replica]))
+    monkeypatch.setattr(session, "async_replicas", ReplicaSet([async_replica]))
+    for dep in (session.get_read_db, session.get_async_read_db):
+        monkeypatch.delitem(client.app.dependency_overrides, dep)
+
+    register_user(client, "icardi", "gala")
+    register_user(client, "mertens", "gala")
+    t, other = login_token(client, "icardi", "gala"), login_token(client, "mertens", "gala")
+    pid = client.post("/projects", headers=auth_headers(t), json={"name": "P-Sticky"}).json()["id"]
+    iid = client.post(f"/projects/{pid}/issues", headers=auth_headers(t), json={"title": "Fresh"}).json()["id"]
+    assert client.get(f"/issues/{iid}", headers=auth_headers(other)).status_code == 200
+    assert replica_queries
+
+    del replica_queries[:]
+    assert client.patch(f"/issues/{iid}", headers=auth_headers(t), json={"status": "closed"}).status_code == 200
+    assert client.get(f"/issues/{iid}", headers=auth_headers(t)).json()["status"] == "closed"
+    assert not client.cookies
+    assert not replica_queries
+    assert client.get(f"/projects/{pid}/issues", headers=auth_headers(other)).status_code == 200
+    assert replica_queries
+    replica.dispose()
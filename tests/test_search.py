@@ -0,0 +1,39 @@
+from .conftest import register_user, login_token, auth_headers
+
+def _create_project(client, token, name="P", desc=""):
+    r = client.post("/projects", headers=auth_headers(token), json={"name": name, "desc": desc})
+    assert r.status_code == 201, r.text
+    return r.json()["id"]
+
+def _create_issue(client, token, pid, title, desc=""):
+    r = client.post(f"/projects/{pid}/issues", headers=auth_headers(token), json={"title": title, "desc": desc})
+    assert r.status_code == 201, r.text
+    return r.json()["id"]
+
+def test_search_ranks_issues_and_comments(client):
+    register_user(client, "osimhen", "gala")
+    t = login_token(client, "osimhen", "gala")
+    p1 = _create_project(client, t, "Search1")
+    p2 = _create_project(client, t, "Search2")
+
+    login_bug = _create_issue(client, t, p1, "Login page crashes", "Crash when login form is submitted twice")
+    _create_issue(client, t, p1, "Dark mode", "Colors are wrong")
+    other = _create_issue(client, t, p2, "Export", "Timeout while exporting")
+    c = client.post(f"/issues/{other}/comments", headers=auth_headers(t), json={"content": "Also crashes after login"})
+    cid = c.json()["id"]
+
+    r = client.get("/search", headers=auth_headers(t), params={"q": "crash login"})
+    assert r.status_code == 200, r.text
+    hits = r.json()
+    assert [(h["type"], h["id"]) for h in hits] == [("issue", login_bug), ("comment", cid)]
+    assert hits[0]["rank"] >= hits[1]["rank"]
+    assert hits[1]["issue_id"] == other and hits[1]["project_id"] == p2
+    assert "<b>" in hits[0]["snippet"]
+
+    only_p1 = client.get("/search", headers=auth_headers(t), params={"q": "crash", "project_id": p1})
+    assert [h["id"] for h in only_p1.json()] == [login_bug]
+
+    only_comments = client.get("/search", headers=auth_headers(t), params={"q": "crash", "types": "comment"})
+    assert [h["type"] for h in only_comments.json()] == ["comment"]
+
+    assert client.get("/search", params={"q": "crash"}).status_code == 401
@@ -0,0 +1,46 @@
+from sqlalchemy import func, select, text
+
+from app.db.base import Base
+from app.models.comment import Comment
+from app.models.issue import Issue
+from app.services.stats import rebuild_project_stats
+from app.services.synthetic import generate
+from .conftest import engine, register_user, login_token
+
+def _snapshot():
+    with engine.connect() as conn:
+        issues = conn.execute(select(Issue.id, Issue.title, Issue.project_id, Issue.reporter_id, Issue.status,
+                                     Issue.updated_at).order_by(Issue.id)).all()
+        comments = conn.execute(select(Comment.id, Comment.issue_id, Comment.author_id).order_by(Comment.id)).all()
+    return issues, comments
+
+def test_generate_is_deterministic_and_skewed():
+    report = generate(engine, users=20, projects=8, issues=600, comments=2000, seed=7, batch_size=250)
+    assert len(report.issues) == 600 and len(report.comments) == 2000
+    first = _snapshot()
+
+    with engine.connect() as conn:
+        per_project = conn.execute(select(Issue.project_id, func.count()).group_by(Issue.project_id)
+                                   .order_by(func.count().desc())).all()
+        longest_thread = conn.execute(select(func.count()).select_from(Comment).group_by(Comment.issue_id)
+                                      .order_by(func.count().desc()).limit(1)).scalar()
+    assert per_project[0].project_id == report.projects[0]
+    assert per_project[0][1] > 3 * per_project[-1][1]
+    assert longest_thread > 20
+    # statement-level triggers kept the counters current through COPY
+    assert rebuild_project_stats(engine) == 0
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    generate(engine, users=20, projects=8, issues=600, comments=2000, seed=7, batch_size=250)
+    assert _snapshot() == first
+
+def test_generated_rows_work_with_the_api(client):
+    report = generate(engine, users=5, projects=2, issues=50, comments=100, seed=1)
+    with engine.connect() as conn:
+        username = conn.execute(text("SELECT username FROM users WHERE id = :id"), {"id": report.users[0]}).scalar()
+    token = login_token(client, username, "password")
+    # sequences were moved past the explicit ids
+    assert register_user(client, "newcomer", "secret12").json()["id"] == report.users[-1] + 1
+    res = client.get(f"/projects/{report.projects[0]}/issues", headers={"Authorization": f"Bearer {token}"})
+    assert res.status_code == 200 and res.json()
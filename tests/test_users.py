@@ -36,3 +36,65 @@ def test_get_user_by_id(client):
 
     g2 = client.get("/users/9999", headers=auth_headers(token))
     assert g2.status_code == 404
+
+def test_principal_cache_and_password_change_invalidation(client):
+    from sqlalchemy import update
+    from app.models.user import User
+    from .conftest import TestingSessionLocal
+
+    r = register_user(client, "muslera", "uru")
+    uid = r.json()["id"]
+    token = login_token(client, "muslera", "uru")
+    assert client.get("/users/me", headers=auth_headers(token)).json()["username"] == "muslera"
+
+    with TestingSessionLocal() as db:
+        db.execute(update(User).where(User.id == uid).values(username="nando"))
+        db.commit()
+    assert client.get("/users/me", headers=auth_headers(token)).json()["username"] == "muslera"
+
+    res = client.post("/users/me/change-password", headers=auth_headers(token),
+                      json={"old_password": "uru", "new_password": "gala"})
+    assert res.status_code == 204
+    assert client.get("/users/me", headers=auth_headers(token)).json()["username"] == "nando"
+
+    assert client.get("/users", headers=auth_headers("not-a-token")).status_code == 401
+
+def test_my_issues_across_projects(client):
+    register_user(client, "osimhen", "gala")
+    t = login_token(client, "osimhen", "gala")
+    register_user(client, "icardi", "mauro")
+    to = login_token(client, "icardi", "mauro")
+    me = client.get("/users/me", headers=auth_headers(t)).json()["id"]
+    pids = [client.post("/projects", headers=auth_headers(token), json={"name": name}).json()["id"]
+            for token, name in ((t, "Mine"), (to, "Theirs"))]
+    mine = [x["issue"]["id"] for x in client.post(f"/projects/{pids[0]}/issues:batch", headers=auth_headers(t),
+                                                  json=[{"title": f"M{n}", "priority": "high" if n else "low",
+                                                         "assignee_id": me if n == 2 else None}
+                                                        for n in range(3)]).json()]
+    assigned = [x["issue"]["id"] for x in client.post(f"/projects/{pids[1]}/issues:batch", headers=auth_headers(to),
+                                                      json=[{"title": f"A{n}", "assignee_id": me} for n in range(3)]).json()]
+    client.post(f"/projects/{pids[1]}/issues", headers=auth_headers(to), json={"title": "Not mine"})
+    client.patch("/issues:bulk", headers=auth_headers(to), json={"ids": assigned[:1], "changes": {"status": "closed"}})
+    client.patch(f"/issues/{mine[0]}", headers=auth_headers(t), json={"desc": "touched"})
+
+    def listed(**params):
+        found, cursor = [], None
+        while True:
+            r = client.get("/users/me/issues", headers=auth_headers(t), params={**params, "limit": 2, "cursor": cursor})
+            assert r.status_code == 200, r.text
+            found += [i["id"] for i in r.json()]
+            if not (cursor := r.headers.get("X-Next-Cursor")):
+                return found
+
+    everything = listed()
+    # reported and assigned to me at once is listed once
+    assert sorted(everything) == sorted(mine + assigned)
+    # most recently updated first
+    assert everything[0] == mine[0]
+    assert sorted(listed(role="reporter")) == sorted(mine)
+    assert sorted(listed(role="assignee")) == sorted(assigned + mine[2:])
+    assert sorted(listed(role="assignee", status="open")) == sorted(assigned[1:] + mine[2:])
+    assert listed(role="reporter", priority="low") == [mine[0]]
+    assert listed(sort_dir="asc") == everything[::-1]
+    assert client.get("/users/me/issues", headers=auth_headers(t), params={"role": "owner"}).status_code == 422
+    assert client.get("/users/me/issues").status_code == 401